@@ -0,0 +1,220 @@
+"""
+Persistent JSON-RPC backend for the Electron UI
+Reads one JSON-RPC 2.0 request per line on stdin and writes one response per
+line on stdout, keeping the scanner and its scan index warm between requests.
+Progress events are sent as 'event' notifications while a request runs.
+"""
+
+import inspect
+import io
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+
+from backup_manager import BackupManager
+from backup_cli import run_backup, run_scan
+from game_scanner import GameScanner
+from log_store import LogStore
+from progress_events import EventStream
+from restore_manager import RestoreManager
+from snapshot_pruner import SnapshotPruner
+
+# Standard JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class BackendService:
+    def __init__(self, config, verbose=False, jobs=None):
+        self.config = config
+        self.verbose = verbose
+        self.output_stream = None
+        
+        # Progress is sent as 'event' notifications while a request runs
+        self.events = EventStream(self._notify)
+        self.scanner = GameScanner(config, verbose=verbose, jobs=jobs, events=self.events)
+        self.log_store = LogStore(config.logs_dir, verbose=verbose)
+        self.running = False
+
+        self.methods = {
+            'ping': self.ping,
+            'scan': self.scan,
+            'backup': self.backup,
+            'list_backups': self.list_backups,
+            'restore': self.restore,
+            'prune': self.prune,
+            'list_logs': self.list_logs,
+            'get_log': self.get_log,
+            'shutdown': self.shutdown,
+        }
+
+    def serve(self, input_stream=None, output_stream=None):
+        """Answer requests until shutdown is called or input closes"""
+        if input_stream is None:
+            input_stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+        if output_stream is None:
+            output_stream = sys.stdout
+        self.output_stream = output_stream
+
+        self.running = True
+        for line in input_stream:
+            if not line.strip():
+                continue
+
+            response = self.handle_line(line)
+            if response is not None:
+                self._send(response)
+
+            if not self.running:
+                break
+
+        return 0
+
+    def handle_line(self, line):
+        """Handle one request line, returning the response or None for notifications"""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return self._error(None, PARSE_ERROR, f"Invalid JSON: {e}")
+
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return self._error(None, INVALID_REQUEST, "Request must be an object with a method")
+
+        request_id = request.get('id')
+        method = self.methods.get(request['method'])
+        if method is None:
+            return self._error(request_id, METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+
+        params = request.get('params') or {}
+        if not isinstance(params, dict):
+            return self._error(request_id, INVALID_PARAMS, "params must be an object")
+        try:
+            inspect.signature(method).bind(**params)
+        except TypeError as e:
+            return self._error(request_id, INVALID_PARAMS, str(e))
+
+        # Whatever the CLI would have printed is returned as the output field
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output):
+                result = method(**params)
+        except Exception as e:
+            return self._error(request_id, INTERNAL_ERROR, str(e), output.getvalue())
+
+        if request_id is None:
+            return None
+
+        result['output'] = output.getvalue()
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    def ping(self):
+        """Report that the backend is alive"""
+        return {'pid': os.getpid()}
+
+    def scan(self, game=None, rescan=False):
+        """Scan for saves, reusing the warm scanner"""
+        found_saves = run_scan(self.scanner, game_filter=game, rescan=rescan)
+        return {
+            'games': {game_name: len(saves) for game_name, saves in found_saves.items()},
+            'stats': self.scanner.stats.as_dict()
+        }
+
+    def backup(self, game=None, rescan=False, full=False, storage=None):
+        """Back up saves, reusing the warm scanner"""
+        backup_manager = BackupManager(self.config, verbose=self.verbose,
+                                       incremental=False if full else None,
+                                       storage=storage, events=self.events)
+        backup_log = run_backup(self.scanner, backup_manager, game_filter=game, rescan=rescan)
+        return {
+            'timestamp': backup_log['timestamp'],
+            'games': {game_name: game_log['count']
+                      for game_name, game_log in backup_log['games_backed_up'].items()},
+            'unchanged': backup_log['games_unchanged'],
+            'errors': len(backup_log['errors']),
+            'stats': backup_log['stats']
+        }
+
+    def list_backups(self, game=None):
+        """List existing backups from the snapshot catalog, in the shape the UI renders"""
+        backup_manager = BackupManager(self.config, verbose=self.verbose)
+        backups = {}
+
+        for game_name, entries in backup_manager.list_backups(game).items():
+            backups[game_name] = [
+                {
+                    'timestamp': entry['timestamp'],
+                    'path': entry['path'],
+                    'fileCount': entry['file_count'],
+                    'totalBytes': entry['total_bytes'],
+                    'storage': entry['storage'],
+                    'created': entry['created']
+                }
+                for entry in entries
+            ]
+
+        return {'backups': backups}
+
+    def restore(self, game, timestamp=None, target=None):
+        """Put a game's newest snapshot, or the given one, back in place"""
+        restore_manager = RestoreManager(self.config, verbose=self.verbose, events=self.events)
+        result = restore_manager.restore(game, timestamp=timestamp, target_dir=target)
+        return {
+            'timestamp': result['timestamp'],
+            'restored': len(result['restored']),
+            'skipped': len(result['skipped']),
+            'errors': result['errors'],
+            'bytesRestored': result['bytes_restored']
+        }
+
+    def prune(self, game=None, dry_run=False):
+        """Delete the snapshots the retention policy does not keep"""
+        result = SnapshotPruner(self.config, verbose=self.verbose).prune(game_filter=game,
+                                                                         dry_run=dry_run)
+        return {
+            'deleted': [{'game': entry['game'], 'timestamp': entry['timestamp'],
+                         'storage': entry['storage']} for entry in result['deleted']],
+            'bytesReclaimed': result['bytes_reclaimed'],
+            'errors': result['errors'],
+            'dryRun': dry_run
+        }
+
+    def list_logs(self, offset=0, limit=50, game=None, errors_only=False):
+        """Page through backup run summaries, newest first"""
+        runs, total = self.log_store.list_runs(offset=offset, limit=limit, game=game,
+                                               errors_only=errors_only)
+        return {'runs': runs, 'total': total}
+
+    def get_log(self, timestamp):
+        """Full per-file log of one backup run"""
+        backup_log = self.log_store.read_run(timestamp)
+        if backup_log is None:
+            raise ValueError(f"No backup run at {timestamp}")
+        return {'log': backup_log}
+
+    def shutdown(self):
+        """Stop serving after this response"""
+        self.running = False
+        return {}
+
+    def _notify(self, record):
+        """Send a progress event as a JSON-RPC notification, once serving"""
+        if self.output_stream is not None:
+            self._send({'jsonrpc': '2.0', 'method': 'event', 'params': record})
+
+    def _send(self, message):
+        """Write one message line to the client"""
+        self.output_stream.write(json.dumps(message) + '\n')
+        self.output_stream.flush()
+
+    @staticmethod
+    def _error(request_id, code, message, output=''):
+        """Build a JSON-RPC error response"""
+        return {
+            'jsonrpc': '2.0',
+            'id': request_id,
+            'error': {'code': code, 'message': message, 'data': {'output': output}}
+        }
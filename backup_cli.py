@@ -0,0 +1,414 @@
+"""
+Command line of the Game Save Backup Utility, started through backup_saves.py
+Commands (scan, backup, list, logs, restore) import only the modules they
+use, so quick ones such as list start without loading the scanner or the
+copier. The flag form (--scan-only, --list, --restore GAME, ...) still works.
+"""
+
+import argparse
+import os
+import sys
+from config import Config
+
+# Subcommands; the flag form is used when the first argument is none of these
+COMMANDS = ('scan', 'backup', 'list', 'logs', 'restore')
+
+# Runs shown by the logs command unless --limit says otherwise
+LOG_LIMIT = 20
+
+def add_common_options(parser):
+    """Options every command takes"""
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='Enable verbose output')
+    parser.add_argument('--profile', nargs='?', const='', metavar='FILE',
+                       help='Run under cProfile and print the hottest functions, optionally saving the profile to FILE')
+    parser.add_argument('--json-events', action='store_true',
+                       help='Write progress events to stdout as JSON Lines; other output goes to stderr')
+
+def add_scan_options(parser):
+    """Options of commands that scan for saves"""
+    parser.add_argument('--game', type=str,
+                       help='Backup saves for specific game only')
+    parser.add_argument('--rescan', action='store_true',
+                       help='Ignore the scan index and walk every directory again')
+    parser.add_argument('--jobs', '-j', type=int,
+                       help='Number of threads used to walk folders while scanning')
+    parser.add_argument('--user-profiles', nargs='+', metavar='ROOT',
+                       help='Scan and back up these user profile folders (local or on mounted images) '
+                            'instead of the current user, each under its own [profile] game names')
+    parser.add_argument('--processes', type=int,
+                       help='Number of profiles scanned at once with --user-profiles')
+    parser.add_argument('--stats', action='store_true',
+                       help='Print time and counters for each scan root, the slowest folders and the copy')
+
+def add_copy_options(parser):
+    """Options of commands that write backups"""
+    parser.add_argument('--full', action='store_true',
+                       help='Copy every file instead of reusing unchanged files from the last backup')
+    parser.add_argument('--storage', choices=['directory', 'store', 'archive'],
+                       help='Write plain snapshot folders, deduplicated object-store snapshots or compressed archives')
+    parser.add_argument('--copy-workers', type=int,
+                       help='Number of files to copy in parallel')
+    parser.add_argument('--max-rate', type=float,
+                       help='Limit backup copy throughput in MB per second')
+
+def add_restore_options(parser):
+    """Options of the restore command besides the game"""
+    parser.add_argument('--snapshot', type=str, metavar='TIMESTAMP',
+                       help='Snapshot to restore with --restore, as shown by --list')
+    parser.add_argument('--restore-to', type=str, metavar='DIR',
+                       help='Restore into this directory instead of the original save locations')
+
+def build_parser():
+    """Parser for the flag form of the command line"""
+    parser = argparse.ArgumentParser(
+        description='Game Save Backup Utility',
+        epilog=f"Commands: backup_saves.py {{{','.join(COMMANDS)}}} [options] runs one task "
+               f"and loads only what it needs; see backup_saves.py COMMAND --help.")
+    add_common_options(parser)
+    parser.add_argument('--scan-only', action='store_true',
+                       help='Scan for saves without backing up')
+    add_scan_options(parser)
+    add_copy_options(parser)
+    parser.add_argument('--gc', action='store_true',
+                       help='Remove object-store data no snapshot references, then exit')
+    parser.add_argument('--list', action='store_true',
+                       help='List existing backups with their file counts and sizes, then exit')
+    parser.add_argument('--logs', action='store_true',
+                       help=f'List the newest {LOG_LIMIT} backup runs from the run log, then exit')
+    parser.add_argument('--prune', action='store_true',
+                       help='Delete snapshots the retention policy in config.py does not keep, then exit')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='With --prune, only list the snapshots that would be deleted')
+    parser.add_argument('--rebuild-catalog', action='store_true',
+                       help='Re-create the backup catalog from the snapshots on disk, then exit')
+    parser.add_argument('--restore', type=str, metavar='GAME',
+                       help='Put a game\'s newest backup (or --snapshot) back where its saves came from, then exit')
+    add_restore_options(parser)
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and back up each game shortly after its saves change')
+    parser.add_argument('--serve', action='store_true',
+                       help='Run as a persistent JSON-RPC backend on stdin/stdout (used by the UI)')
+    parser.set_defaults(limit=LOG_LIMIT, errors_only=False)
+    return parser
+
+def build_command_parser():
+    """Parser for the subcommand form, each command with only its own options"""
+    parser = argparse.ArgumentParser(prog='backup_saves.py', description='Game Save Backup Utility')
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+    
+    scan = commands.add_parser('scan', help='Scan for saves without backing up')
+    add_common_options(scan)
+    add_scan_options(scan)
+    scan.set_defaults(scan_only=True)
+    
+    backup = commands.add_parser('backup', help='Scan for saves and back them up')
+    add_common_options(backup)
+    add_scan_options(backup)
+    add_copy_options(backup)
+    
+    listing = commands.add_parser('list', help='List existing backups with their file counts and sizes')
+    add_common_options(listing)
+    listing.add_argument('--game', type=str, help='Only list games whose name contains this')
+    listing.set_defaults(list=True)
+    
+    logs = commands.add_parser('logs', help='List the newest backup runs from the run log')
+    add_common_options(logs)
+    logs.add_argument('--game', type=str, help='Only list runs that backed up a game whose name contains this')
+    logs.add_argument('--errors', dest='errors_only', action='store_true',
+                      help='Only list runs that had errors')
+    logs.add_argument('--limit', type=int, default=LOG_LIMIT,
+                      help=f'Number of runs to list, 0 for all (default {LOG_LIMIT})')
+    logs.set_defaults(logs=True)
+    
+    restore = commands.add_parser('restore', help='Put a game\'s newest backup (or --snapshot) back')
+    add_common_options(restore)
+    restore.add_argument('restore', metavar='GAME', help='Game to restore, as shown by list')
+    add_restore_options(restore)
+    restore.add_argument('--copy-workers', type=int, help='Number of files to restore in parallel')
+    return parser
+
+def parse_args(argv):
+    """Parse either form of the command line into the flag form's options"""
+    parser = build_parser()
+    if not argv or argv[0] not in COMMANDS:
+        args = parser.parse_args(argv)
+    else:
+        args = parser.parse_args([])
+        vars(args).update(vars(build_command_parser().parse_args(argv)))
+    
+    # Caught before the run, not when the profile is saved at its end
+    if args.profile and os.path.isdir(args.profile):
+        parser.error(f"--profile FILE is a folder: {args.profile} (did you mean --user-profiles?)")
+    return args
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    
+    command = run_profiled if args.profile is not None else run
+    if not args.json_events or args.serve:
+        return command(args)
+    
+    # stdout carries the events, so everything else printed goes to stderr
+    from contextlib import redirect_stdout
+    from progress_events import EventStream, json_lines
+    events = EventStream(json_lines(sys.stdout))
+    with redirect_stdout(sys.stderr):
+        return command(args, events)
+
+def run(args, events=None):
+    """Carry out the command selected by the parsed arguments
+    
+    Each branch imports and builds only the components it uses.
+    """
+    config = Config()
+    
+    if args.serve:
+        # stdout carries the protocol, so nothing else may be printed first
+        from backend_service import BackendService
+        return BackendService(config, verbose=args.verbose, jobs=args.jobs).serve()
+    
+    print("Game Save Backup Utility")
+    print("=" * 40)
+    
+    if args.gc:
+        removed, reclaimed = build_backup_manager(config, args, events).collect_garbage()
+        print(f"Removed {removed} unreferenced objects, reclaimed {reclaimed} bytes.")
+        return 0
+    
+    if args.prune:
+        from snapshot_pruner import SnapshotPruner
+        run_prune(SnapshotPruner(config, verbose=args.verbose, workers=args.copy_workers,
+                                 backup_manager=build_backup_manager(config, args, events)),
+                  game_filter=args.game, dry_run=args.dry_run)
+        return 0
+    
+    if args.rebuild_catalog:
+        count = build_backup_manager(config, args, events).rebuild_catalog()
+        print(f"Catalogued {count} snapshots.")
+        return 0
+    
+    if args.list:
+        run_list(config, game_filter=args.game, verbose=args.verbose)
+        return 0
+    
+    if args.logs:
+        from log_store import LogStore
+        run_logs(LogStore(config.logs_dir, verbose=args.verbose), game_filter=args.game,
+                 errors_only=args.errors_only, limit=args.limit)
+        return 0
+    
+    if args.restore:
+        from restore_manager import RestoreManager
+        return run_restore(RestoreManager(config, verbose=args.verbose, workers=args.copy_workers,
+                                          events=events),
+                           args.restore, timestamp=args.snapshot, target_dir=args.restore_to)
+    
+    if args.watch:
+        from game_scanner import GameScanner
+        from save_watcher import SaveWatcher
+        SaveWatcher(config, GameScanner(config, verbose=args.verbose, jobs=args.jobs, events=events),
+                    build_backup_manager(config, args, events), verbose=args.verbose,
+                    game_filter=args.game).run()
+        return 0
+    
+    if args.user_profiles:
+        from profile_batch import ProfileBatch
+        batch = ProfileBatch(config, args.user_profiles, verbose=args.verbose, processes=args.processes)
+        if args.scan_only:
+            run_scan(batch, game_filter=args.game, rescan=args.rescan, hint=scan_hint(args))
+            for error in batch.errors:
+                print(f"  Error: {error}")
+            return 0
+        backup_log = run_batch_backup(batch, build_backup_manager(config, args, events),
+                                      game_filter=args.game, rescan=args.rescan)
+    else:
+        from game_scanner import GameScanner
+        scanner = GameScanner(config, verbose=args.verbose, jobs=args.jobs, events=events)
+        if args.scan_only:
+            run_scan(scanner, game_filter=args.game, rescan=args.rescan, hint=scan_hint(args))
+            if args.stats:
+                print_stats({'scan': scanner.stats.as_dict()})
+            return 0
+    
+        backup_log = run_backup(scanner, build_backup_manager(config, args, events),
+                                game_filter=args.game, rescan=args.rescan)
+    
+    if config.auto_prune:
+        from snapshot_pruner import SnapshotPruner
+        run_prune(SnapshotPruner(config, verbose=args.verbose, workers=args.copy_workers,
+                                 backup_manager=build_backup_manager(config, args, events)),
+                  game_filter=args.game)
+    if args.stats:
+        print_stats(backup_log['stats'])
+    return 0
+
+def build_backup_manager(config, args, events=None):
+    """BackupManager set up from the command-line options"""
+    from backup_manager import BackupManager
+    return BackupManager(config, verbose=args.verbose,
+                         incremental=False if args.full else None,
+                         storage=args.storage,
+                         workers=args.copy_workers,
+                         max_rate=args.max_rate * 1024 * 1024 if args.max_rate else None,
+                         events=events)
+
+def run_profiled(args, events=None):
+    """Run under cProfile, then print the functions with the most cumulative time"""
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(run, args, events)
+    finally:
+        # In --serve mode stdout carries the protocol
+        stream = sys.stderr if args.serve else sys.stdout
+        print("\nProfile (top 25 functions by cumulative time):", file=stream)
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(25)
+        if args.profile:
+            profiler.dump_stats(args.profile)
+            print(f"Profile saved to {args.profile}", file=stream)
+
+def print_stats(stats):
+    """Print a scan/copy stats report"""
+    from scan_stats import format_stats
+    print()
+    for line in format_stats(stats):
+        print(line)
+
+def scan_hint(args):
+    """How to back up what a scan found, in the form the scan was asked for"""
+    if getattr(args, 'command', None) == 'scan':
+        return "Run `backup_saves.py backup` with the same options to backup saves."
+    return "Use without --scan-only to backup saves."
+
+def run_scan(scanner, game_filter=None, rescan=False, hint=None):
+    """Scan for saves and print a summary, returning the found saves"""
+    print("Scanning for game saves...")
+    found_saves = scanner.scan_for_saves(game_filter=game_filter, rescan=rescan)
+    
+    if not found_saves:
+        print("No game saves found.")
+        return found_saves
+    
+    print(f"Found saves for {len(found_saves)} games:")
+    for game_name, saves in found_saves.items():
+        print(f"  {game_name}: {len(saves)} save files")
+    
+    print("\nScan complete." + (f" {hint}" if hint else ""))
+    return found_saves
+
+def run_backup(scanner, backup_manager, game_filter=None, rescan=False):
+    """Back up saves as the scanner finds them and print a summary, returning the log"""
+    from scan_stats import ScanStats
+    # Back up saves as the scanner finds them, so copying overlaps scanning
+    print("Scanning for game saves and backing them up...")
+    stats = ScanStats()
+    backup_log = backup_manager.backup_stream(
+        scanner.iter_saves(game_filter=game_filter, rescan=rescan, stats=stats),
+        scan_stats=stats)
+    return report_backup(backup_log)
+
+def run_batch_backup(batch, backup_manager, game_filter=None, rescan=False):
+    """Back up several profiles in one run and print a summary, returning the log"""
+    print(f"Scanning {len(batch.profiles)} profiles for game saves and backing them up...")
+    backup_log = batch.backup(backup_manager, game_filter=game_filter, rescan=rescan)
+    for name, result in backup_log['profiles'].items():
+        print(f"  {name}: {result['games']} games, {result['files']} save files ({result['root']})")
+    for error in batch.errors:
+        print(f"  Error: {error}")
+    return report_backup(backup_log)
+
+def report_backup(backup_log):
+    """Print what a backup run saved, returning its log"""
+    unchanged = backup_log['games_unchanged']
+    if not backup_log['games_backed_up'] and not backup_log['errors']:
+        if unchanged:
+            print(f"No changes since the last backup ({len(unchanged)} games checked in "
+                  f"{backup_log['stats']['copy']['wall_seconds']:.3f}s).")
+        else:
+            print("No game saves found.")
+        return backup_log
+    
+    print(f"\nBacked up saves for {len(backup_log['games_backed_up'])} games:")
+    for game_name, game_log in backup_log['games_backed_up'].items():
+        print(f"  {game_name}: {game_log['count']} save files")
+    if unchanged:
+        print(f"No changes for {len(unchanged)} other games.")
+    print("Backup complete!")
+    
+    return backup_log
+
+def run_list(config, game_filter=None, verbose=False):
+    """Print existing backups with their file counts and sizes, returning them
+    
+    Only the snapshot catalog is read; the snapshots on disk are catalogued
+    (through the BackupManager) just once, when there is no catalog yet.
+    """
+    from snapshot_catalog import SnapshotCatalog
+    catalog = SnapshotCatalog(config.catalog_path, verbose=verbose)
+    if catalog.exists():
+        backups = catalog.list(game_filter)
+    elif config.backup_dir.is_dir():
+        from backup_manager import BackupManager
+        backups = BackupManager(config, verbose=verbose).list_backups(game_filter)
+    else:
+        backups = {}
+    
+    if not backups:
+        print("No backups found.")
+    for game_name, entries in backups.items():
+        print(f"{game_name}:")
+        for entry in entries:
+            print(f"  {entry['timestamp']}  {entry['file_count']} files, "
+                  f"{entry['total_bytes']} bytes ({entry['storage']})")
+    return backups
+
+def run_logs(log_store, game_filter=None, errors_only=False, limit=LOG_LIMIT):
+    """Print the newest backup runs from the run log, returning (runs, total)"""
+    runs, total = log_store.list_runs(limit=limit or None, game=game_filter, errors_only=errors_only)
+    
+    if not runs:
+        print("No backup runs found.")
+        return runs, total
+    
+    for summary in runs:
+        print(f"  {summary['timestamp']}  {len(summary['games'])} games, "
+              f"{summary['total_files']} files ({summary['files_copied']} copied, "
+              f"{summary['files_reused']} reused), {summary['bytes_copied']} bytes copied, "
+              f"{summary['error_count']} errors")
+    if total > len(runs):
+        print(f"Showing the newest {len(runs)} of {total} runs.")
+    return runs, total
+
+def run_prune(pruner, game_filter=None, dry_run=False):
+    """Apply the retention policy and print a summary, returning the result"""
+    result = pruner.prune(game_filter=game_filter, dry_run=dry_run)
+    
+    if dry_run:
+        for entry in result['deleted']:
+            print(f"  Would delete {entry['game']} {entry['timestamp']}  "
+                  f"{entry['file_count']} files, {entry['total_bytes']} bytes ({entry['storage']})")
+        print(f"{len(result['deleted'])} snapshots would be deleted, "
+              f"up to {result['bytes_reclaimed']} bytes.")
+        return result
+    
+    print(f"Pruned {len(result['deleted'])} snapshots, reclaimed {result['bytes_reclaimed']} bytes.")
+    for error in result['errors']:
+        print(f"  Error: {error}")
+    return result
+
+def run_restore(restore_manager, game_name, timestamp=None, target_dir=None):
+    """Restore one snapshot and print a summary, returning the exit code"""
+    try:
+        result = restore_manager.restore(game_name, timestamp=timestamp, target_dir=target_dir)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    print(f"Restored {game_name} from {result['timestamp']} ({result['storage']}): "
+          f"{len(result['restored'])} files restored, {len(result['skipped'])} already up to date, "
+          f"{result['bytes_restored']} bytes written")
+    for error in result['errors']:
+        print(f"  Error: {error}")
+    return 1 if result['errors'] else 0
@@ -2,78 +2,706 @@
 Handles copying and organizing backups to the "loaded saves" directory
 """
 
+import hashlib
+import os
 import shutil
+import time
+import zipfile
 from pathlib import Path
 from datetime import datetime
 import json
+from object_store import ObjectStore, copy_file_hashed, save_manifest, temp_path_for
+from fingerprint import SnapshotFingerprints, hash_file
+from copy_engine import CopyEngine
+from snapshot_catalog import SnapshotCatalog
+from log_store import LogStore
+from snapshot_archive import ArchiveWriter, ARCHIVE_SUFFIX, restore_archive
+from save_set import BackedUpFiles, BackupRecords
+from progress_events import EventStream
+
+# Linux FICLONE ioctl, used for copy-on-write clones on btrfs/xfs
+FICLONE = 0x40049409
 
 class BackupManager:
-    def __init__(self, config, verbose=False):
+    def __init__(self, config, verbose=False, incremental=None, storage=None,
+                 workers=None, max_rate=None, events=None):
         self.config = config
         self.verbose = verbose
+        self.events = events or EventStream()
+        self.incremental = config.incremental_backups if incremental is None else incremental
+        self.storage = storage or config.backup_storage
+        self.store = ObjectStore(config.store_dir, verbose=verbose)
+        self.catalog = SnapshotCatalog(config.catalog_path, verbose=verbose)
+        self.log_store = LogStore(config.logs_dir, verbose=verbose)
+        self.copy_engine = CopyEngine(
+            workers=workers or config.copy_workers,
+            bytes_per_second=max_rate if max_rate is not None else config.copy_rate_limit)
     
     def backup_saves(self, found_saves):
         """Backup all found saves to the loaded saves directory"""
+        return self.backup_stream(
+            (game_name, save_file)
+            for game_name, save_files in found_saves.items()
+            for save_file in save_files)
+    
+    def backup_stream(self, save_events, scan_stats=None, profiles=None, errors=None):
+        """Backup (game_name, save_file) pairs as they arrive
+        
+        Accepts the scanner's iter_saves() stream so copying overlaps
+        scanning. Results are handled in arrival order, so the log does not
+        depend on how many copy workers ran. The log's stats record the copy
+        phase, plus the scan's ScanStats when given. A batch over several
+        profiles passes its per-profile results and scan errors, which are
+        read once the stream is exhausted.
+        
+        In incremental mode a game's saves are held back while they match the
+        size and mtime recorded in its last snapshot; a game whose saves all
+        match gets no new snapshot and is listed under games_unchanged.
+        
+        Each game's files in the returned log is a list of
+        {'original', 'backup', 'size', 'reused'} dicts, so the log can be
+        passed to json.dumps as it is.
+        """
+        started = time.perf_counter()
+        busy_before = self.copy_engine.busy_seconds
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         backup_log = {
             'timestamp': timestamp,
             'games_backed_up': {},
             'total_files': 0,
+            'files_copied': 0,
+            'files_reused': 0,
+            'bytes_copied': 0,
+            'bytes_reused': 0,
+            'games_unchanged': [],
             'errors': []
         }
         
-        for game_name, save_files in found_saves.items():
+        plans = {}
+        held = {}
+        latest = self._latest_snapshots() if self.incremental else {}
+        queue = {'files': 0, 'complete': False}
+        self.events.emit('backup_started', timestamp=timestamp)
+        
+        def start(game_name):
             if self.verbose:
                 print(f"\nBacking up {game_name}...")
+            plan = plans[game_name] = self._start_game(game_name, timestamp)
+            fingerprints = held.get(game_name)
+            return plan, fingerprints.release() if fingerprints is not None else []
+        
+        def jobs():
+            for game_name, save_file in save_events:
+                plan = plans.get(game_name)
+                if plan is None:
+                    if game_name not in held:
+                        held[game_name] = self._snapshot_fingerprints(latest.get(game_name))
+                    if held[game_name] is not None and held[game_name].hold(save_file):
+                        continue
+                    plan, released = start(game_name)
+                    for held_file in released:
+                        queue['files'] += 1
+                        yield self._plan_job(plan, held_file)
+                queue['files'] += 1
+                yield self._plan_job(plan, save_file)
             
-            # Create game directory in loaded saves
-            game_backup_dir = self.config.backup_dir / game_name / timestamp
-            game_backup_dir.mkdir(parents=True, exist_ok=True)
-            
-            backed_up_files = []
-            
-            for save_file in save_files:
-                try:
-                    # Preserve relative path structure within the game folder
-                    relative_path = self._get_relative_save_path(save_file)
-                    backup_path = game_backup_dir / relative_path
-                    
-                    # Ensure parent directory exists
-                    backup_path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Copy the file
-                    shutil.copy2(save_file, backup_path)
-                    backed_up_files.append({
-                        'original': str(save_file),
-                        'backup': str(backup_path),
-                        'size': save_file.stat().st_size
-                    })
-                    
+            # Games with every save held back are unchanged unless a file of
+            # their last snapshot has disappeared
+            for game_name, fingerprints in held.items():
+                if game_name in plans or fingerprints is None:
+                    continue
+                if fingerprints.unchanged():
+                    backup_log['games_unchanged'].append(game_name)
                     if self.verbose:
-                        print(f"  Copied: {save_file.name}")
-                
-                except Exception as e:
-                    error_msg = f"Failed to backup {save_file}: {e}"
-                    backup_log['errors'].append(error_msg)
-                    if self.verbose:
-                        print(f"  Error: {error_msg}")
-            
-            if backed_up_files:
-                backup_log['games_backed_up'][game_name] = {
-                    'files': backed_up_files,
-                    'count': len(backed_up_files),
-                    'backup_dir': str(game_backup_dir)
-                }
-                backup_log['total_files'] += len(backed_up_files)
-                
-                if self.verbose:
-                    print(f"  Successfully backed up {len(backed_up_files)} files")
+                        print(f"\nNo changes for {game_name}")
+                    continue
+                plan, released = start(game_name)
+                for held_file in released:
+                    queue['files'] += 1
+                    yield self._plan_job(plan, held_file)
+            queue['complete'] = True
+        
+        for job, record, error in self.copy_engine.map(self._run_job, jobs()):
+            self._record_result(plans[job[1]], job, record, error, backup_log)
+            if self.events.due('copy_progress'):
+                # files_queued is final once queue_complete, which allows an ETA
+                self.events.emit('copy_progress', file=str(job[2]),
+                                 files_done=(backup_log['files_copied'] + backup_log['files_reused']
+                                             + len(backup_log['errors'])),
+                                 files_queued=queue['files'], queue_complete=queue['complete'],
+                                 bytes_copied=backup_log['bytes_copied'],
+                                 bytes_reused=backup_log['bytes_reused'])
+        
+        if profiles is not None:
+            backup_log['profiles'] = profiles
+        if errors:
+            backup_log['errors'][:0] = errors
+        
+        for plan in plans.values():
+            self._finish_game(plan, backup_log)
+            game_log = backup_log['games_backed_up'].get(plan['game'])
+            if game_log is not None:
+                self.events.emit('game_backed_up', game=plan['game'], files=game_log['count'])
+        
+        backup_log['stats'] = {
+            'scan': scan_stats.as_dict() if scan_stats is not None else None,
+            'copy': {
+                'seconds': round(self.copy_engine.busy_seconds - busy_before, 4),
+                'wall_seconds': round(time.perf_counter() - started, 4),
+                'files': backup_log['files_copied'] + backup_log['files_reused'],
+                'bytes_copied': backup_log['bytes_copied'],
+                'bytes_reused': backup_log['bytes_reused'],
+                'errors': len(backup_log['errors'])
+            }
+        }
+        
+        if self.verbose and self.incremental:
+            print(f"\nCopied {backup_log['files_copied']} files ({backup_log['bytes_copied']} bytes), "
+                  f"reused {backup_log['files_reused']} unchanged files ({backup_log['bytes_reused']} bytes)")
         
         # Save backup log
         self._save_backup_log(backup_log, timestamp)
         
+        # The log was written straight from the record columns; callers get
+        # plain lists of dicts, so the returned log is ordinary JSON data
+        for game_log in backup_log['games_backed_up'].values():
+            game_log['files'] = list(game_log['files'])
+        self.events.emit('backup_finished', timestamp=timestamp,
+                         games=len(backup_log['games_backed_up']),
+                         files=backup_log['files_copied'] + backup_log['files_reused'],
+                         bytes_copied=backup_log['bytes_copied'],
+                         bytes_reused=backup_log['bytes_reused'],
+                         unchanged=len(backup_log['games_unchanged']),
+                         errors=len(backup_log['errors']),
+                         seconds=backup_log['stats']['copy']['wall_seconds'])
+        
         return backup_log
     
+    def write_snapshot(self, game_name, save_files, timestamp=None, backup_log=None):
+        """Store one game's saves in the object store and write its manifest
+        
+        Files already present in the store are referenced rather than copied,
+        so disk usage grows with unique content only. Returns the manifest.
+        """
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        if backup_log is None:
+            backup_log = {'files_copied': 0, 'files_reused': 0,
+                          'bytes_copied': 0, 'bytes_reused': 0, 'errors': []}
+        
+        plan = self._start_game(game_name, timestamp, storage='store')
+        jobs = [self._plan_job(plan, save_file) for save_file in save_files]
+        for job, record, error in self.copy_engine.map(self._run_job, jobs):
+            self._record_result(plan, job, record, error, backup_log)
+        
+        manifest = self.store.write_manifest(game_name, plan['timestamp'], plan['records'])
+        manifest_path = self.store.manifest_path(game_name, plan['timestamp'])
+        self._catalog_snapshot(manifest, 'store', manifest_path, manifest_path)
+        return manifest
+    
+    def _start_game(self, game_name, timestamp, storage=None):
+        """Prepare a game's snapshot before its first file is copied"""
+        storage = storage or self.storage
+        timestamp = self._claim_snapshot(game_name, timestamp, storage)
+        plan = {
+            'game': game_name,
+            'timestamp': timestamp,
+            'storage': storage,
+            'backup_dir': None,
+            'previous_dir': None,
+            'previous_entries': {},
+            'paths': set(),
+            'records': BackupRecords()
+        }
+        
+        if plan['storage'] == 'store':
+            # Previous manifest lets unchanged files skip hashing entirely
+            if self.incremental:
+                previous = self.store.latest_manifest(game_name, before=timestamp)
+                if previous:
+                    plan['previous_entries'] = {entry['original']: entry
+                                                for entry in previous['files']}
+            return plan
+        
+        if plan['storage'] == 'archive':
+            # One compressed container per snapshot, written as files arrive
+            plan['backup_dir'] = self.config.backup_dir / game_name / f"{timestamp}{ARCHIVE_SUFFIX}"
+            plan['archive'] = ArchiveWriter(plan['backup_dir'],
+                                            compression=self.config.archive_compression,
+                                            level=self.config.archive_level,
+                                            verbose=self.verbose)
+            return plan
+        
+        # Unchanged files are reused from the most recent snapshot, and their
+        # hashes carried over from its manifest
+        if self.incremental:
+            plan['previous_dir'] = self._latest_snapshot(game_name, before=timestamp)
+            if plan['previous_dir'] is not None:
+                previous = self._read_manifest(game_name, plan['previous_dir'].name)
+                if previous:
+                    plan['previous_entries'] = {entry['path']: entry
+                                                for entry in previous['files']}
+        
+        # The game's folder in loaded saves, created by _claim_snapshot
+        plan['backup_dir'] = self.config.backup_dir / game_name / timestamp
+        
+        return plan
+    
+    def _claim_snapshot(self, game_name, timestamp, storage):
+        """A snapshot name for this run that no existing snapshot of the game uses
+        
+        Timestamps have one-second resolution, so a second run within the same
+        second gets "<timestamp>-02" and so on instead of writing into the
+        earlier snapshot, whose files may be hardlinked from older ones.
+        Directory snapshots are claimed by creating their folder.
+        """
+        suffix = 1
+        while True:
+            name = timestamp if suffix == 1 else f"{timestamp}-{suffix:02d}"
+            suffix += 1
+            if storage == 'store':
+                if not self.store.manifest_path(game_name, name).exists():
+                    return name
+                continue
+            
+            # Directory and archive snapshots share the manifests folder
+            if self._manifest_path(game_name, name).exists():
+                continue
+            if storage == 'archive':
+                archive_path = self.config.backup_dir / game_name / f"{name}{ARCHIVE_SUFFIX}"
+                if not archive_path.exists() and not (self.config.backup_dir / game_name / name).exists():
+                    return name
+                continue
+            if (self.config.backup_dir / game_name / f"{name}{ARCHIVE_SUFFIX}").exists():
+                continue
+            try:
+                (self.config.backup_dir / game_name / name).mkdir(parents=True)
+                return name
+            except FileExistsError:
+                continue
+    
+    def _latest_snapshots(self):
+        """Each game's newest catalogued snapshot in the current storage mode"""
+        latest = {}
+        for game_name, entries in self.catalog.list().items():
+            for entry in entries:
+                if entry['storage'] == self.storage:
+                    latest[game_name] = entry
+                    break
+        return latest
+    
+    def _snapshot_fingerprints(self, entry):
+        """Fingerprints from a snapshot's manifest, or None if it cannot be trusted"""
+        if entry is None or not os.path.exists(entry['path']):
+            return None
+        try:
+            with open(entry['manifest']) as f:
+                return SnapshotFingerprints(json.load(f)['files'])
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _plan_job(self, plan, save_file):
+        """Describe the copy job for one file without touching its contents"""
+        # Preserve relative path structure within the game folder
+        relative_path = self._unique_relative_path(plan, self._get_relative_save_path(save_file))
+        manifest_path = relative_path.as_posix()
+        if plan['storage'] == 'store':
+            return ('store', plan['game'], save_file, manifest_path,
+                    plan['previous_entries'].get(str(save_file)))
+        
+        if plan['storage'] == 'archive':
+            return ('archive', plan['game'], save_file, manifest_path, plan['archive'])
+        
+        previous_path = None
+        previous_entry = plan['previous_entries'].get(manifest_path)
+        if previous_entry and previous_entry.get('original', str(save_file)) != str(save_file):
+            # The name belonged to another save last time, so nothing can be reused
+            previous_entry = None
+        elif plan['previous_dir'] is not None:
+            previous_path = plan['previous_dir'] / relative_path
+        
+        return ('directory', plan['game'], save_file, manifest_path,
+                plan['backup_dir'] / relative_path, previous_path, previous_entry)
+    
+    def _unique_relative_path(self, plan, relative_path):
+        """A relative path no other file of the snapshot uses
+        
+        Saves in different folders can share a relative path, e.g.
+        A/saves/slot.sav and B/saves/slot.sav; later ones become
+        "slot (2).sav" and so on, so two copy workers never write one file.
+        """
+        relative_path = Path(relative_path)
+        candidate = relative_path
+        number = 1
+        # Windows paths are case-insensitive
+        while candidate.as_posix().casefold() in plan['paths']:
+            number += 1
+            candidate = relative_path.with_name(f"{relative_path.stem} ({number}){relative_path.suffix}")
+        plan['paths'].add(candidate.as_posix().casefold())
+        return candidate
+    
+    def _record_result(self, plan, job, record, error, backup_log):
+        """Fold one finished job into its game's records and the run totals"""
+        save_file = job[2]
+        
+        if error is not None:
+            error_msg = f"Failed to backup {save_file}: {error}"
+            backup_log['errors'].append(error_msg)
+            if self.verbose:
+                print(f"  Error: {error_msg}")
+            return
+        
+        plan['records'].append(record)
+        self._count_file(backup_log, record['size'], record['reused'])
+        
+        if self.verbose:
+            action = 'Stored' if job[0] == 'store' else 'Copied'
+            print(f"  {'Unchanged' if record['reused'] else action}: {save_file.name}")
+    
+    def _finish_game(self, plan, backup_log):
+        """Write a game's manifest and catalog entry and add it to the backup log"""
+        game_name = plan['game']
+        timestamp = plan['timestamp']
+        
+        if plan['storage'] == 'store':
+            manifest = self.store.write_manifest(game_name, timestamp, plan['records'])
+            game_backup_dir = self.store.manifest_path(game_name, timestamp)
+            backed_up_files = BackedUpFiles(plan['records'], object_path=self.store.object_path)
+            self._catalog_snapshot(manifest, 'store', game_backup_dir, game_backup_dir)
+        else:
+            if plan['storage'] == 'archive':
+                plan['archive'].close(keep=bool(plan['records']))
+                if self.verbose and plan['records']:
+                    total = plan['records'].total_bytes()
+                    print(f"  Compressed {total} bytes to {plan['archive'].compressed_bytes} bytes")
+            
+            game_backup_dir = plan['backup_dir']
+            # A view over the records, so the log holds no second copy of every path
+            backed_up_files = BackedUpFiles(plan['records'], backup_dir=game_backup_dir)
+            if plan['records']:
+                manifest_path = self._manifest_path(game_name, timestamp)
+                manifest = save_manifest(manifest_path, game_name, timestamp, plan['records'])
+                self._catalog_snapshot(manifest, plan['storage'], game_backup_dir, manifest_path)
+        
+        if backed_up_files:
+            backup_log['games_backed_up'][game_name] = {
+                'files': backed_up_files,
+                'count': len(backed_up_files),
+                'backup_dir': str(game_backup_dir),
+                'storage': plan['storage']
+            }
+            backup_log['total_files'] += len(backed_up_files)
+            
+            if self.verbose:
+                print(f"  Successfully backed up {len(backed_up_files)} files for {game_name}")
+    
+    def _run_job(self, job):
+        """Back up a single file; runs on a copy worker"""
+        if job[0] == 'store':
+            return self._store_file(*job[2:])
+        if job[0] == 'archive':
+            return self._archive_file(*job[2:])
+        return self._copy_file(*job[2:])
+    
+    def _copy_file(self, save_file, manifest_path, backup_path, previous_path, previous_entry):
+        """Copy or reuse one file into a snapshot directory, returning its manifest entry"""
+        # Parent directories are created once per snapshot, not once per file
+        self.copy_engine.ensure_dir(backup_path.parent)
+        
+        # A single stat serves the change check and the log
+        source_stat = save_file.stat()
+        
+        if previous_path and self._is_unchanged(save_file, source_stat, previous_path):
+            # Link or copy the previous backup instead of reading the source
+            self._reuse_file(previous_path, backup_path)
+            if previous_entry and previous_entry.get('hash'):
+                file_hash = previous_entry['hash']
+            else:
+                file_hash = hash_file(backup_path)
+            reused = True
+        else:
+            # Copy the file, hashing it on the way through
+            self.copy_engine.throttle(source_stat.st_size)
+            file_hash = copy_file_hashed(save_file, backup_path)
+            reused = False
+        
+        return {
+            'path': manifest_path,
+            'original': str(save_file),
+            'size': source_stat.st_size,
+            'mtime_ns': source_stat.st_mtime_ns,
+            'hash': file_hash,
+            'reused': reused
+        }
+    
+    def _archive_file(self, save_file, manifest_path, archive):
+        """Compress one file into the snapshot archive, returning its manifest entry"""
+        source_stat = save_file.stat()
+        self.copy_engine.throttle(source_stat.st_size)
+        file_hash, size = archive.add_file(save_file, manifest_path)
+        
+        return {
+            'path': manifest_path,
+            'original': str(save_file),
+            'size': size,
+            'mtime_ns': source_stat.st_mtime_ns,
+            'hash': file_hash,
+            'reused': False
+        }
+    
+    def _store_file(self, save_file, manifest_path, previous_entry):
+        """Add one file to the object store, returning its manifest entry"""
+        source_stat = save_file.stat()
+        
+        if (previous_entry and not self.config.incremental_verify_hash and
+                previous_entry['size'] == source_stat.st_size and
+                previous_entry['mtime_ns'] == source_stat.st_mtime_ns and
+                self.store.has_object(previous_entry['hash'])):
+            object_hash, reused = previous_entry['hash'], True
+        else:
+            self.copy_engine.throttle(source_stat.st_size)
+            object_hash, _, stored = self.store.put_file(save_file)
+            reused = not stored
+        
+        return {
+            'path': manifest_path,
+            'original': str(save_file),
+            'size': source_stat.st_size,
+            'mtime_ns': source_stat.st_mtime_ns,
+            'hash': object_hash,
+            'reused': reused
+        }
+    
+    def restore_snapshot(self, game_name, timestamp, target_dir):
+        """Materialize a stored snapshot as a directory tree"""
+        return self.store.restore(game_name, timestamp, target_dir)
+    
+    def restore_archive(self, game_name, timestamp, target_dir, files=None):
+        """Extract an archived snapshot, or only the given relative paths from it"""
+        archive_path = self.config.backup_dir / game_name / f"{timestamp}{ARCHIVE_SUFFIX}"
+        manifest = self._read_manifest(game_name, timestamp)
+        mtimes = {entry['path']: entry['mtime_ns'] for entry in manifest['files']} if manifest else None
+        return restore_archive(archive_path, target_dir, members=files, mtimes=mtimes)
+    
+    def delete_snapshot(self, game_name, timestamp):
+        """Delete a stored snapshot manifest"""
+        self.store.delete_snapshot(game_name, timestamp)
+        self.catalog.remove(game_name, timestamp, 'store')
+    
+    def collect_garbage(self):
+        """Remove stored blobs no snapshot references"""
+        removed, reclaimed = self.store.gc()
+        if self.verbose:
+            print(f"Removed {removed} unreferenced objects ({reclaimed} bytes)")
+        return removed, reclaimed
+    
+    def rebuild_catalog(self):
+        """Re-create the snapshot catalog from the snapshots on disk
+        
+        Directory snapshots made before manifests existed get one written,
+        hashing their files once; later listings never touch them again.
+        Their original locations come from the run's backup log. Returns the
+        number of snapshots catalogued.
+        """
+        entries = []
+        backup_dir = self.config.backup_dir
+        
+        if backup_dir.is_dir():
+            for game_dir in sorted(os.scandir(backup_dir), key=lambda entry: entry.name):
+                # Dot-directories hold the object store and manifests, not games
+                if not game_dir.is_dir() or game_dir.name.startswith('.'):
+                    continue
+                for snapshot_dir in sorted(os.scandir(game_dir.path), key=lambda entry: entry.name):
+                    if snapshot_dir.is_dir():
+                        storage, timestamp = 'directory', snapshot_dir.name
+                    elif snapshot_dir.name.endswith(ARCHIVE_SUFFIX):
+                        storage, timestamp = 'archive', snapshot_dir.name[:-len(ARCHIVE_SUFFIX)]
+                    else:
+                        continue
+                    
+                    manifest_path = self._manifest_path(game_dir.name, timestamp)
+                    manifest = self._read_manifest(game_dir.name, timestamp)
+                    if manifest is None:
+                        if self.verbose:
+                            print(f"  Writing manifest for {game_dir.name} {timestamp}")
+                        originals = self.log_store.originals(game_dir.name, timestamp)
+                        manifest = save_manifest(manifest_path, game_dir.name, timestamp,
+                                                 self._describe_snapshot(Path(snapshot_dir.path), originals))
+                    entries.append(self._catalog_entry(manifest, storage,
+                                                       snapshot_dir.path, manifest_path))
+        
+        for game_name, timestamps in self.store.list_snapshots().items():
+            for timestamp in timestamps:
+                manifest_path = self.store.manifest_path(game_name, timestamp)
+                manifest = self.store.read_manifest(game_name, timestamp)
+                entries.append(self._catalog_entry(manifest, 'store', manifest_path, manifest_path))
+        
+        self.catalog.replace_all(entries)
+        return len(entries)
+    
+    def _count_file(self, backup_log, size, reused):
+        """Add one file to the copied/reused totals"""
+        if reused:
+            backup_log['files_reused'] += 1
+            backup_log['bytes_reused'] += size
+        else:
+            backup_log['files_copied'] += 1
+            backup_log['bytes_copied'] += size
+    
+    def _manifest_path(self, game_name, timestamp):
+        """Location of a directory snapshot's manifest"""
+        return self.config.manifests_dir / game_name / f"{timestamp}.json"
+    
+    def _read_manifest(self, game_name, timestamp):
+        """Load a directory snapshot's manifest, or None if it has none"""
+        try:
+            with open(self._manifest_path(game_name, timestamp)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _describe_snapshot(self, snapshot_dir, originals=None):
+        """Build manifest entries for an existing snapshot directory or archive
+        
+        originals maps snapshot-relative paths to where the files came from.
+        """
+        originals = originals or {}
+        files = []
+        if snapshot_dir.is_file():
+            with zipfile.ZipFile(snapshot_dir) as archive:
+                for info in archive.infolist():
+                    digest = hashlib.blake2b(digest_size=32)
+                    with archive.open(info) as member:
+                        for chunk in iter(lambda: member.read(1024 * 1024), b''):
+                            digest.update(chunk)
+                    files.append({
+                        'path': info.filename,
+                        'original': originals.get(info.filename),
+                        'size': info.file_size,
+                        'mtime_ns': None,
+                        'hash': digest.hexdigest(),
+                        'reused': False
+                    })
+            return files
+        
+        for dirpath, _, filenames in os.walk(snapshot_dir):
+            for filename in sorted(filenames):
+                file_path = Path(dirpath) / filename
+                stat = file_path.stat()
+                relative_path = file_path.relative_to(snapshot_dir).as_posix()
+                files.append({
+                    'path': relative_path,
+                    'original': originals.get(relative_path),
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'hash': hash_file(file_path),
+                    'reused': False
+                })
+        return files
+    
+    def _catalog_entry(self, manifest, storage, path, manifest_path):
+        """Catalog row describing one snapshot"""
+        try:
+            created = os.stat(manifest_path).st_mtime
+        except OSError:
+            created = time.time()
+        
+        return {
+            'game': manifest['game'],
+            'timestamp': manifest['timestamp'],
+            'storage': storage,
+            'path': str(path),
+            'manifest': str(manifest_path),
+            'file_count': manifest['file_count'],
+            'total_bytes': manifest['total_bytes'],
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(created))
+        }
+    
+    def _catalog_snapshot(self, manifest, storage, path, manifest_path):
+        """Add a freshly written snapshot to the catalog"""
+        try:
+            self.catalog.add(self._catalog_entry(manifest, storage, path, manifest_path))
+        except Exception as e:
+            print(f"Warning: Could not update snapshot catalog: {e}")
+    
+    def _latest_snapshot(self, game_name, before=None):
+        """Find the most recent existing snapshot directory for a game"""
+        game_dir = self.config.backup_dir / game_name
+        if not game_dir.is_dir():
+            return None
+        
+        snapshots = [entry for entry in os.scandir(game_dir)
+                     if entry.is_dir() and (before is None or entry.name < before)]
+        if not snapshots:
+            return None
+        
+        # Timestamped folder names sort chronologically
+        return Path(max(snapshots, key=lambda entry: entry.name).path)
+    
+    def _is_unchanged(self, save_file, source_stat, previous_path):
+        """Check whether a save matches its copy in the previous snapshot"""
+        try:
+            previous_stat = previous_path.stat()
+        except OSError:
+            return False
+        
+        # copy2 preserves mtimes, so size+mtime is a cheap fast path
+        if (previous_stat.st_size != source_stat.st_size or
+                previous_stat.st_mtime_ns != source_stat.st_mtime_ns):
+            return False
+        
+        if self.config.incremental_verify_hash:
+            return hash_file(save_file) == hash_file(previous_path)
+        
+        return True
+    
+    def _reuse_file(self, previous_path, backup_path):
+        """Place an unchanged file in the new snapshot without copying its bytes
+        
+        Like a copy, it is made under a temporary name and renamed into place,
+        so a file already at backup_path is replaced rather than written into.
+        """
+        temp_path = temp_path_for(backup_path)
+        try:
+            self._link_file(previous_path, temp_path)
+            os.replace(temp_path, backup_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def _link_file(self, previous_path, backup_path):
+        """Hardlink, clone or copy a previous backup to a path that does not exist yet"""
+        link_mode = self.config.incremental_link_mode
+        
+        if link_mode == 'hardlink':
+            try:
+                os.link(previous_path, backup_path)
+                return
+            except OSError:
+                pass
+        elif link_mode == 'reflink':
+            try:
+                self._clone_file(previous_path, backup_path)
+                return
+            except (OSError, ImportError):
+                pass
+        
+        # Filesystem cannot link, fall back to a regular copy
+        shutil.copy2(previous_path, backup_path)
+    
+    def _clone_file(self, source, destination):
+        """Create a copy-on-write clone where the filesystem supports it"""
+        import fcntl
+        
+        with open(source, 'rb') as src, open(destination, 'xb') as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except OSError:
+                dst.close()
+                os.remove(destination)
+                raise
+        shutil.copystat(source, destination)
+    
     def _get_relative_save_path(self, save_file):
         """Get a relative path for the save file to preserve structure"""
         save_file = Path(save_file)
@@ -97,47 +725,20 @@ class BackupManager:
             return save_file.name
     
     def _save_backup_log(self, backup_log, timestamp):
-        """Save backup operation log"""
-        log_file = self.config.logs_dir / f"backup_{timestamp}.json"
-        
+        """Append the backup operation log to the run log store"""
         try:
-            with open(log_file, 'w') as f:
-                json.dump(backup_log, f, indent=2)
+            self.log_store.append(backup_log)
             
             if self.verbose:
-                print(f"\nBackup log saved to: {log_file}")
+                print(f"\nBackup log saved to: {self.log_store.runs_path} (run {timestamp})")
         
         except Exception as e:
             print(f"Warning: Could not save backup log: {e}")
     
     def list_backups(self, game_name=None):
-        """List existing backups"""
-        backups = {}
-        
-        if not self.config.backup_dir.exists():
-            return backups
-        
-        for game_dir in self.config.backup_dir.iterdir():
-            if not game_dir.is_dir():
-                continue
-            
-            if game_name and game_name.lower() not in game_dir.name.lower():
-                continue
-            
-            game_backups = []
-            for backup_dir in game_dir.iterdir():
-                if backup_dir.is_dir():
-                    # Count files in backup
-                    file_count = sum(1 for _ in backup_dir.rglob('*') if _.is_file())
-                    game_backups.append({
-                        'timestamp': backup_dir.name,
-                        'path': str(backup_dir),
-                        'file_count': file_count
-                    })
-            
-            if game_backups:
-                backups[game_dir.name] = sorted(game_backups, 
-                                              key=lambda x: x['timestamp'], 
-                                              reverse=True)
+        """List existing backups from the snapshot catalog, newest first"""
+        # Snapshots written before the catalog existed are picked up once
+        if not self.catalog.exists():
+            self.rebuild_catalog()
         
-        return backups
\ No newline at end of file
+        return self.catalog.list(game_name)
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Benchmark for archive snapshots against plain snapshot folders
+Backs up a synthetic set of save files with each storage mode and reports
+bytes on disk, compression ratio, write throughput and the time to restore
+a single save
+
+Usage: python benchmarks/bench_archive.py [--files N] [--size KB]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backup_manager import BackupManager
+from config import Config
+from snapshot_archive import COMPRESSION_METHODS
+
+
+def make_saves(root, count, size_kb, seed=0):
+    """Write a mix of text-like and binary save files, the way real saves vary"""
+    rng = random.Random(seed)
+    words = [b'player', b'level', b'inventory', b'gold', b'"quest": ', b'true', b'0.0, ']
+    saves = []
+    for i in range(count):
+        path = root / "saves" / f"slot{i}.sav"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = size_kb * 1024
+        if i % 3 == 2:
+            data = rng.randbytes(size)
+        else:
+            data = b' '.join(rng.choice(words) for _ in range(size // 6))[:size]
+        path.write_bytes(data)
+        saves.append(path)
+    return saves
+
+
+def disk_bytes(path):
+    """Total size of the files under path"""
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob('*') if p.is_file())
+
+
+def run(work_dir, saves, storage, compression=None):
+    """Back up saves once, returning (seconds, bytes on disk, restore seconds)"""
+    config = Config()
+    config.backup_dir = work_dir / storage / (compression or 'default')
+    config.store_dir = config.backup_dir / ".store"
+    config.manifests_dir = config.backup_dir / ".manifests"
+    config.catalog_path = config.backup_dir / ".catalog.sqlite3"
+    config.logs_dir = work_dir / "logs"
+    config.incremental_backups = False
+    if compression:
+        config.archive_compression = compression
+
+    manager = BackupManager(config, verbose=False, storage=storage)
+    start = time.perf_counter()
+    backup_log = manager.backup_saves({"Bench Game": saves})
+    elapsed = time.perf_counter() - start
+
+    game_log = backup_log['games_backed_up']["Bench Game"]
+    snapshot = Path(game_log['backup_dir'])
+    member = "saves/" + saves[len(saves) // 2].name
+    restore_dir = work_dir / "restored"
+
+    start = time.perf_counter()
+    if storage == 'archive':
+        manager.restore_archive("Bench Game", backup_log['timestamp'], restore_dir, files=[member])
+    else:
+        destination = restore_dir / member
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(snapshot / member, destination)
+    restore = time.perf_counter() - start
+    shutil.rmtree(restore_dir)
+
+    return elapsed, disk_bytes(snapshot), restore
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark archive snapshots')
+    parser.add_argument('--files', type=int, default=200, help='Number of save files')
+    parser.add_argument('--size', type=int, default=256, help='Size of each save file in KB')
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp())
+    try:
+        saves = make_saves(work_dir / "profile", args.files, args.size)
+        source_bytes = sum(save.stat().st_size for save in saves)
+        print(f"{args.files} files, {source_bytes / 1024 / 1024:.1f} MB\n")
+        print(f"{'mode':<18}{'on disk MB':>12}{'ratio':>8}{'write MB/s':>12}{'restore ms':>12}")
+
+        modes = [('directory', None)]
+        modes += [('archive', name) for name in ('stored', 'deflate', 'zstd') if name in COMPRESSION_METHODS]
+        for storage, compression in modes:
+            elapsed, on_disk, restore = run(work_dir, saves, storage, compression)
+            label = storage if compression is None else f"{storage}/{compression}"
+            print(f"{label:<18}{on_disk / 1024 / 1024:>12.1f}{source_bytes / on_disk:>8.2f}"
+                  f"{source_bytes / 1024 / 1024 / elapsed:>12.1f}{restore * 1000:>12.2f}")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""
+Micro-benchmark for the save file classifier
+Checks the compiled classifier against the original per-call rule lists on a
+synthetic set of paths, then reports files per second for both
+
+Usage: python benchmarks/bench_classifier.py [--files N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from save_classifier import SaveClassifier
+
+WORDS = [
+    'save', 'slot', 'player', 'world', 'level', 'data', 'assets', 'shader',
+    'cache', 'log', 'config', 'profile', 'texture', 'sound', 'map', 'user',
+    'backup', 'temp', 'Game', 'Options', 'Checkpoint', 'mod', 'bin', 'x64'
+]
+EXTENSIONS = [
+    '.sav', '.dat', '.json', '.png', '.txt', '.bin', '.ini', '.dll', '.xml',
+    '.pak', '.ess', '.log', '', '.SAV', '.cfg', '.wld', '.zip'
+]
+APP_NAMES = [
+    'Google', 'Discord', 'HollowKnight', 'Stardew Valley', 'war thunder',
+    'Thunder', 'Factorio', 'Overwolf', 'cache', 'RimWorld', 'Terraria', ''
+]
+
+
+def legacy_is_likely_save_file(file_path):
+    """SavePatterns.is_likely_save_file before the rules were precompiled"""
+    file_path = Path(file_path)
+    if legacy_is_excluded_file(file_path):
+        return False
+    save_extensions = {'.sav', '.save', '.dat', '.json', '.xml', '.cfg', '.ini',
+                       '.profile', '.plr', '.wld', '.ess', '.skse', '.fos'}
+    if file_path.suffix.lower() in save_extensions:
+        return True
+    name_lower = file_path.name.lower()
+    save_keywords = ['save', 'profile', 'user', 'player', 'game', 'world',
+                     'character', 'progress', 'slot', 'checkpoint']
+    return any(keyword in name_lower for keyword in save_keywords)
+
+
+def legacy_is_excluded_file(file_path):
+    name_lower = file_path.name.lower()
+    excluded_patterns = [
+        'log', 'cache', 'temp', 'crash', 'error', 'debug', 'config',
+        'settings', 'preferences', 'install', 'uninstall', 'update',
+        'readme', 'license', 'changelog', 'version', 'manifest'
+    ]
+    excluded_extensions = {
+        '.exe', '.dll', '.msi', '.bat', '.cmd', '.ps1', '.sh',
+        '.txt', '.md', '.html', '.css', '.js', '.py', '.cpp', '.h',
+        '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.svg',
+        '.mp3', '.wav', '.ogg', '.mp4', '.avi', '.mkv', '.zip', '.rar'
+    }
+    if file_path.suffix.lower() in excluded_extensions:
+        return True
+    return any(pattern in name_lower for pattern in excluded_patterns)
+
+
+def legacy_has_strong_save_indicators(file_path):
+    """GameScanner._has_strong_save_indicators before the rules were precompiled"""
+    file_path = Path(file_path)
+    name_lower = file_path.name.lower()
+    strong_indicators = [
+        'save', 'profile', 'player', 'character', 'world', 'level',
+        'progress', 'checkpoint', 'slot', 'game'
+    ]
+    for indicator in strong_indicators:
+        if indicator in name_lower:
+            return True
+    for parent in file_path.parents:
+        parent_name = parent.name.lower()
+        if any(indicator in parent_name for indicator in strong_indicators):
+            return True
+    return False
+
+
+def legacy_is_excluded_app(config, app_name):
+    """GameScanner._is_excluded_app before the rules were precompiled"""
+    app_lower = app_name.lower()
+    if app_lower in config.excluded_apps:
+        return True
+    for excluded in config.excluded_apps:
+        if excluded in app_lower or app_lower in excluded:
+            return True
+    if app_lower in config.excluded_online_games:
+        return True
+    for excluded_game in config.excluded_online_games:
+        if excluded_game in app_lower or app_lower in excluded_game:
+            return True
+    return False
+
+
+def make_paths(count, seed=42):
+    """Synthetic save-folder-like paths with many siblings per directory"""
+    rng = random.Random(seed)
+    paths = []
+    while len(paths) < count:
+        depth = rng.randint(2, 6)
+        directory = Path('/profile', *(rng.choice(WORDS) + str(rng.randint(0, 3))
+                                       for _ in range(depth)))
+        for _ in range(rng.randint(5, 40)):
+            name = '_'.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+            paths.append(directory / (name + str(rng.randint(0, 99)) + rng.choice(EXTENSIONS)))
+    return paths[:count]
+
+
+def measure(func, items):
+    """Run func over items and return items per second"""
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark save file classification")
+    parser.add_argument('--files', type=int, default=200000, help='Number of synthetic paths')
+    args = parser.parse_args()
+
+    config = Config()
+    paths = make_paths(args.files)
+    apps = [name for name in APP_NAMES for _ in range(max(1, args.files // 100))]
+
+    classifier = SaveClassifier(config)
+    for path in paths:
+        assert classifier.is_likely_save_file(path) == legacy_is_likely_save_file(path), path
+        assert classifier.has_strong_save_indicators(path) == legacy_has_strong_save_indicators(path), path
+    for app in APP_NAMES:
+        assert classifier.is_excluded_app(app) == legacy_is_excluded_app(config, app), app
+    print(f"Verdicts identical for {len(paths)} paths and {len(APP_NAMES)} app names")
+
+    cases = [
+        ('is_likely_save_file', paths, legacy_is_likely_save_file,
+         lambda: SaveClassifier(config).is_likely_save_file),
+        ('has_strong_save_indicators', paths, legacy_has_strong_save_indicators,
+         lambda: SaveClassifier(config).has_strong_save_indicators),
+        ('is_excluded_app', apps, lambda app: legacy_is_excluded_app(config, app),
+         lambda: SaveClassifier(config).is_excluded_app),
+    ]
+    for label, items, legacy, compiled in cases:
+        before = measure(legacy, items)
+        after = measure(compiled(), items)
+        print(f"{label:28} before {before:>12,.0f}/s   after {after:>12,.0f}/s   "
+              f"({after / before:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+Benchmark for the memory held by scan results, backup records and run logs
+Builds the same synthetic file list (many candidate files spread over app and
+save folders) both ways: the previous design of a Path per file, a manifest
+dict per file and a second log dict per file, and the compact SaveSet,
+BackupRecords and BackedUpFiles columns. Reports memory held and peak memory
+(tracemalloc) for each, plus writing the run's log detail in one string
+against the streamed writer
+
+Usage: python benchmarks/bench_memory.py [--files N ...] [--per-dir N]
+"""
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_store import LogStore
+from save_set import BackedUpFiles, BackupRecords, DirectoryTable, SaveSet
+
+PROFILE = os.path.join(os.sep, "profiles", "bench", "AppData", "Roaming")
+BACKUP_DIR = os.path.join(os.sep, "backups", "loaded saves")
+GAMES = 50
+
+
+def file_list(files, per_dir):
+    """(game, directory, name) for every synthetic file, folder by folder"""
+    for index in range(files):
+        folder = index // per_dir
+        game = f"Game {folder % GAMES}"
+        yield game, os.path.join(PROFILE, game, "saves", f"slot{folder}"), f"save_{index:07d}.sav"
+
+
+def measure(build):
+    """(result, bytes still held by the result, peak bytes while building it)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, held, peak
+
+
+def legacy_scan(files, per_dir):
+    """{game: [Path]}, joining names onto a shared parent Path as the scanner did"""
+    found = {}
+    directories = {}
+    for game, directory, name in file_list(files, per_dir):
+        parent = directories.get(directory)
+        if parent is None:
+            parent = directories[directory] = Path(directory)
+        found.setdefault(game, []).append(parent / name)
+    return found
+
+
+def compact_scan(files, per_dir):
+    """{game: SaveSet} over one directory table"""
+    found = {}
+    table = DirectoryTable()
+    for game, directory, name in file_list(files, per_dir):
+        saves = found.get(game)
+        if saves is None:
+            saves = found[game] = SaveSet(table=table)
+        saves.add_name(table.intern(directory), name)
+    return found
+
+
+def manifest_entry(index, directory, name):
+    """The manifest entry a copy worker returns for one file"""
+    return {
+        'path': f"saves/{os.path.basename(directory)}/{name}",
+        'original': os.path.join(directory, name),
+        'size': 4096 + index,
+        'mtime_ns': 1700000000000000000 + index,
+        'hash': f"{index:064x}",
+        'reused': index % 3 == 0
+    }
+
+
+def legacy_backup(files, per_dir):
+    """Manifest dicts per game plus the backup log's second dict per file"""
+    records = {}
+    for index, (game, directory, name) in enumerate(file_list(files, per_dir)):
+        records.setdefault(game, []).append(manifest_entry(index, directory, name))
+    games = {}
+    for game, entries in records.items():
+        backup_dir = os.path.join(BACKUP_DIR, game, "2025-01-01_00-00-00")
+        games[game] = {
+            'files': [{'original': entry['original'],
+                       'backup': str(Path(backup_dir) / entry['path']),
+                       'size': entry['size'],
+                       'reused': entry['reused']} for entry in entries],
+            'backup_dir': backup_dir,
+            'storage': 'directory'
+        }
+    return records, games
+
+
+def compact_backup(files, per_dir):
+    """BackupRecords per game, with the log reading through BackedUpFiles"""
+    records = {}
+    for index, (game, directory, name) in enumerate(file_list(files, per_dir)):
+        game_records = records.get(game)
+        if game_records is None:
+            game_records = records[game] = BackupRecords()
+        game_records.append(manifest_entry(index, directory, name))
+    games = {
+        game: {
+            'files': BackedUpFiles(game_records,
+                                   backup_dir=os.path.join(BACKUP_DIR, game, "2025-01-01_00-00-00")),
+            'backup_dir': os.path.join(BACKUP_DIR, game, "2025-01-01_00-00-00"),
+            'storage': 'directory'
+        }
+        for game, game_records in records.items()
+    }
+    return records, games
+
+
+def legacy_detail(games):
+    """The log detail built as one document and encoded as one string"""
+    detail = {}
+    for name, game_log in games.items():
+        prefix = game_log['backup_dir'] + os.sep
+        detail[name] = {
+            'backup_dir': game_log['backup_dir'],
+            'storage': game_log['storage'],
+            'relative': True,
+            'files': [[entry['original'], entry['backup'][len(prefix):], entry['size'], entry['reused']]
+                      for entry in game_log['files']]
+        }
+    return len(json.dumps({'games': detail, 'errors': []}, separators=(',', ':')))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memory held by scan and backup results')
+    parser.add_argument('--files', type=int, nargs='+', default=[10000, 100000],
+                        help='Numbers of candidate files to try')
+    parser.add_argument('--per-dir', type=int, default=20, help='Files per folder')
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp())
+    try:
+        print(f"{'files':>8}  {'phase':<14}{'legacy held':>13}{'peak':>10}"
+              f"{'compact held':>14}{'peak':>10}{'saved':>8}")
+        for files in args.files:
+            # Each result is dropped before the next is built, so nothing is shared
+            rows = [('scan results',) + measure(lambda: legacy_scan(files, args.per_dir))[1:]
+                    + measure(lambda: compact_scan(files, args.per_dir))[1:]]
+
+            # The log is written with that design's records in memory
+            (_, games), legacy_held, legacy_peak = measure(lambda: legacy_backup(files, args.per_dir))
+            legacy_write = measure(lambda: legacy_detail(games))[2]
+            del games
+            (_, games), compact_held, compact_peak = measure(lambda: compact_backup(files, args.per_dir))
+            log_store = LogStore(work_dir / f"logs_{files}")
+            compact_write = measure(lambda: log_store.append({
+                'timestamp': "2025-01-01_00-00-00", 'games_backed_up': games, 'errors': []}))[2]
+            del games
+            rows.append(('backup records', legacy_held, legacy_peak, compact_held, compact_peak))
+            rows.append(('log write', 0, legacy_write, 0, compact_write))
+
+            for phase, legacy_held, legacy_peak, compact_held, compact_peak in rows:
+                saved = 1 - compact_peak / legacy_peak if legacy_peak else 0
+                print(f"{files:>8}  {phase:<14}{legacy_held / 2**20:>11.1f}MB{legacy_peak / 2**20:>8.1f}MB"
+                      f"{compact_held / 2**20:>12.1f}MB{compact_peak / 2**20:>8.1f}MB{saved:>7.0%}")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
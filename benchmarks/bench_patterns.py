@@ -0,0 +1,105 @@
+"""
+Benchmark for the known-game database as it grows
+Writes synthetic save_patterns.json files with thousands of titles spread over
+the usual placeholder roots, a few of them installed in a temporary profile,
+and times the first resolution of existing save folders (loading the file
+included), a repeat resolution and --game lookups, next to the previous
+approach of an is_dir() per pattern and a substring test per name
+
+Usage: python benchmarks/bench_patterns.py [--games N ...] [--installed N] [--lookups N]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from save_patterns import SavePatterns
+
+ROOTS = ['{DOCUMENTS}/My Games', '{DOCUMENTS}', '{APPDATA}', '{LOCALAPPDATA}',
+         '{LOCALAPPDATA}/Packages', '{APPDATA}/Publisher PUBLISHER']
+SUFFIXES = ['Saves', 'SaveGames', 'Saved/SaveGames', 'Profiles', 'UserData']
+WORDS = ['Dark', 'Star', 'Legend', 'Hollow', 'Iron', 'Shadow', 'Quest', 'Tales',
+         'Kingdom', 'Frontier', 'Rogue', 'Dungeon', 'Sky', 'Ocean', 'Forge', 'Night']
+
+
+def write_database(path, games, rng):
+    """A patterns file with the given number of made-up titles"""
+    entries = {}
+    while len(entries) < games:
+        name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {rng.randint(1, 99999)}"
+        root = rng.choice(ROOTS).replace('PUBLISHER', str(rng.randint(1, games // 20 + 1)))
+        entries[name] = {'paths': [f"{root}/{name}/{rng.choice(SUFFIXES)}"]}
+    with open(path, 'w') as f:
+        json.dump({'version': 1, 'games': entries}, f)
+    return list(entries)
+
+
+def time_call(func, repeat=5):
+    """Best time of a few calls, and the last result"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the known-game database')
+    parser.add_argument('--games', type=int, nargs='+', default=[8, 1000, 10000],
+                        help='Database sizes to try')
+    parser.add_argument('--installed', type=int, default=20, help='Games with a save folder on disk')
+    parser.add_argument('--lookups', type=int, default=200, help='--game lookups per size')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    work_dir = Path(tempfile.mkdtemp())
+    os.environ.update({
+        'USERPROFILE': str(work_dir),
+        'APPDATA': str(work_dir / "AppData" / "Roaming"),
+        'LOCALAPPDATA': str(work_dir / "AppData" / "Local"),
+    })
+    try:
+        print(f"{'games':>8}{'first':>10}{'repeat':>10}{'is_dir()':>10}"
+              f"{'lookup':>10}{'substring':>11}")
+        for games in args.games:
+            database = work_dir / f"patterns_{games}.json"
+            names = write_database(database, games, rng)
+
+            patterns = SavePatterns(database)
+            for game_name in rng.sample(names, min(args.installed, games)):
+                for folder in patterns.get_patterns_for_game(game_name):
+                    folder.mkdir(parents=True, exist_ok=True)
+            # Whole names, and names without their number
+            queries = [rng.choice(names).lower().rsplit(' ', i % 2)[0] for i in range(args.lookups)]
+
+            first, _ = time_call(lambda: SavePatterns(database).existing_patterns())
+            existing, found = time_call(patterns.existing_patterns)
+            legacy, legacy_found = time_call(lambda: {
+                game_name: [folder for folder in folders if folder.is_dir()]
+                for game_name, folders in patterns.game_patterns.items()
+            })
+            assert list(found) == [name for name, folders in legacy_found.items() if folders]
+
+            lookup, _ = time_call(lambda: [patterns.find_games(query) for query in queries])
+            substring, _ = time_call(lambda: [
+                [name for name in patterns.game_patterns if query in name.lower()]
+                for query in queries])
+
+            print(f"{games:>8}{first * 1000:>8.1f}ms{existing * 1000:>8.2f}ms{legacy * 1000:>8.2f}ms"
+                  f"{lookup / len(queries) * 1e6:>8.1f}us{substring / len(queries) * 1e6:>9.1f}us")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
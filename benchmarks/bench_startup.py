@@ -0,0 +1,142 @@
+"""
+Benchmark for command-line startup
+Copies the modules into a temporary folder with a catalog of synthetic
+snapshots and a run log, then times fresh `python backup_saves.py` processes
+for the quick commands, next to the same commands with every module imported
+up front as the entry point used to, and sums the import time Python reports
+(-X importtime) for each. Also times loading the known-game table from
+save_patterns.json against loading it from the pattern cache
+
+Usage: python benchmarks/bench_startup.py [--repeat N] [--snapshots N] [--games N ...]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from bench_patterns import write_database
+from log_store import LogStore
+from save_patterns import SavePatterns
+from snapshot_catalog import SnapshotCatalog
+
+COMMANDS = [['list'], ['logs'], ['list', '--game', 'Game 1'], ['--help']]
+
+# What backup_saves.py imported before commands loaded their own modules
+EAGER_IMPORTS = ('cProfile, pstats, game_scanner, backup_manager, restore_manager, snapshot_pruner, '
+                 'profile_batch, save_watcher, scan_stats, progress_events')
+
+
+def seed_tree(work_dir, snapshots):
+    """Modules plus a catalog and run log with the given number of snapshots"""
+    for name in os.listdir(REPO_DIR):
+        if name.endswith('.py') or name == 'save_patterns.json':
+            shutil.copy(os.path.join(REPO_DIR, name), work_dir / name)
+
+    backup_dir = work_dir / "loaded saves"
+    SnapshotCatalog(backup_dir / ".catalog.sqlite3").replace_all([
+        {'game': f"Game {index % 50}", 'timestamp': f"2025-01-{index // 50 % 28 + 1:02d}_00-00-{index % 60:02d}",
+         'storage': 'directory', 'path': str(backup_dir / f"Game {index % 50}"), 'manifest': None,
+         'file_count': 10, 'total_bytes': 40960, 'created': None}
+        for index in range(snapshots)])
+    log_store = LogStore(work_dir / "logs")
+    for index in range(snapshots // 10):
+        log_store.append({'timestamp': f"2025-01-01_00-{index // 60:02d}-{index % 60:02d}",
+                          'games_backed_up': {}, 'total_files': 0, 'errors': []})
+
+
+def time_process(command, cwd, repeat):
+    """Best wall time of a few fresh processes"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def import_time(command, cwd):
+    """Total import time in seconds and number of modules imported, from -X importtime"""
+    result = subprocess.run(command[:1] + ['-X', 'importtime'] + command[1:], cwd=cwd,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    total = 0
+    modules = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Top-level imports carry their dependencies in their cumulative time
+        if not name.startswith('  '):
+            total += int(cumulative)
+        modules += 1
+    return total / 1e6, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark command-line startup')
+    parser.add_argument('--repeat', type=int, default=10, help='Processes started per command')
+    parser.add_argument('--snapshots', type=int, default=500, help='Snapshots in the catalog')
+    parser.add_argument('--games', type=int, nargs='+', default=[1000, 10000],
+                        help='Known-game database sizes for the pattern cache')
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp())
+    os.environ.update({
+        'USERPROFILE': str(work_dir / "profile"),
+        'APPDATA': str(work_dir / "profile" / "AppData" / "Roaming"),
+        'LOCALAPPDATA': str(work_dir / "profile" / "AppData" / "Local"),
+    })
+    try:
+        seed_tree(work_dir, args.snapshots)
+        # The first run of each writes the cached bytecode both variants then use
+        subprocess.run([sys.executable, 'backup_saves.py', 'list'], cwd=work_dir,
+                       stdout=subprocess.DEVNULL, check=True)
+        baseline = time_process([sys.executable, '-c', 'pass'], work_dir, args.repeat)
+        print(f"Interpreter alone: {baseline * 1000:.1f}ms")
+
+        print(f"{'command':<24}{'startup':>10}{'imports':>10}{'modules':>9}"
+              f"{'eager':>10}{'imports':>10}{'modules':>9}")
+        for command in COMMANDS:
+            lazy = [sys.executable, 'backup_saves.py'] + command
+            eager = [sys.executable, '-c', f"import sys, {EAGER_IMPORTS}; import backup_cli; "
+                                           f"sys.argv[0] = 'backup_saves.py'; sys.exit(backup_cli.main())"] + command
+            rows = [(time_process(variant, work_dir, args.repeat),) + import_time(variant, work_dir)
+                    for variant in (lazy, eager)]
+            cells = ''.join(f"{seconds * 1000:>8.1f}ms{imports * 1000:>8.1f}ms{modules:>9}"
+                            for seconds, imports, modules in rows)
+            print(f"{' '.join(command):<24}{cells}")
+
+        print(f"\n{'games':>8}{'from json':>12}{'from cache':>12}")
+        rng = random.Random(0)
+        for games in args.games:
+            database = work_dir / f"patterns_{games}.json"
+            cache_file = work_dir / f"patterns_{games}.cache"
+            write_database(database, games, rng)
+            timings = []
+            for cached in (False, True):
+                best = None
+                for _ in range(args.repeat):
+                    if not cached and cache_file.exists():
+                        cache_file.unlink()
+                    patterns = SavePatterns(database, cache_file=cache_file)
+                    start = time.perf_counter()
+                    patterns.existing_patterns()
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                timings.append(best)
+            print(f"{games:>8}{timings[0] * 1000:>10.1f}ms{timings[1] * 1000:>10.1f}ms")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+"""
+Scanner and backup throughput benchmarks on a synthetic profile
+Times a cold and a warm GameScanner.scan_for_saves, SavePatterns.is_likely_save_file
+over every file in the profile, a full and an incremental BackupManager.backup_saves,
+list_backups, and RestoreManager.restore next to a plain copy of the same saves. Each phase is timed --repeat times without tracemalloc, keeping
+the best run, then run once more under tracemalloc for its peak memory. Results
+are written as JSON, and a previous results file can be compared against.
+
+Usage: python benchmarks/run_benchmarks.py [--scale N] [--seed S] [--world-mb M]
+                                           [--repeat N] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backup_manager import BackupManager
+from config import Config
+from game_scanner import GameScanner
+from restore_manager import RestoreManager
+from save_patterns import SavePatterns
+from synthetic_profile import generate_profile, profile_environment
+
+LIST_SNAPSHOTS = 20
+LIST_REPEAT = 50
+
+
+class BenchmarkRun:
+    def __init__(self, work_dir, profile_dir, repeat=3):
+        self.work_dir = Path(work_dir)
+        self.profile_dir = Path(profile_dir)
+        self.repeat = repeat
+        self.runs = 0
+        self.all_files = [os.path.join(dirpath, name)
+                          for dirpath, _, names in os.walk(profile_dir) for name in names]
+
+    def config(self):
+        """A Config whose backups, logs and caches live in a fresh folder"""
+        self.runs += 1
+        root = self.work_dir / f"run{self.runs}"
+        config = Config()
+        config.backup_dir = root / "loaded saves"
+        config.store_dir = config.backup_dir / ".store"
+        config.manifests_dir = config.backup_dir / ".manifests"
+        config.catalog_path = config.backup_dir / ".catalog.sqlite3"
+        config.logs_dir = root / "logs"
+        config.cache_dir = root / "cache"
+        return config
+
+    def measure(self, phase):
+        """Best time of several runs of a phase, then one more for its peak memory"""
+        setup, timed = phase
+        seconds = None
+        for _ in range(self.repeat):
+            state = setup()
+            start = time.perf_counter()
+            items, size = timed(state)
+            elapsed = time.perf_counter() - start
+            seconds = elapsed if seconds is None else min(seconds, elapsed)
+
+        state = setup()
+        tracemalloc.start()
+        try:
+            timed(state)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = {
+            'seconds': round(seconds, 4),
+            'items': items,
+            'items_per_sec': round(items / seconds, 1) if seconds else None,
+            'peak_mb': round(peak / 1024 / 1024, 2)
+        }
+        if size is not None:
+            result['mb'] = round(size / 1024 / 1024, 2)
+            result['mb_per_sec'] = round(size / 1024 / 1024 / seconds, 1) if seconds else None
+        return result
+
+    def scan_cold(self):
+        def setup():
+            return GameScanner(self.config())
+
+        def timed(scanner):
+            scanner.scan_for_saves(rescan=True)
+            return len(self.all_files), None
+        return setup, timed
+
+    def scan_warm(self):
+        def setup():
+            scanner = GameScanner(self.config())
+            scanner.scan_for_saves()
+            return scanner
+
+        def timed(scanner):
+            scanner.scan_for_saves()
+            return len(self.all_files), None
+        return setup, timed
+
+    def classify(self):
+        def setup():
+            return SavePatterns()
+
+        def timed(patterns):
+            for path in self.all_files:
+                patterns.is_likely_save_file(path)
+            return len(self.all_files), None
+        return setup, timed
+
+    def backup_full(self):
+        def setup():
+            config = self.config()
+            found_saves = GameScanner(config).scan_for_saves()
+            return BackupManager(config, incremental=False), found_saves
+
+        def timed(state):
+            manager, found_saves = state
+            backup_log = manager.backup_saves(found_saves)
+            return backup_log['total_files'], backup_log['bytes_copied'] + backup_log['bytes_reused']
+        return setup, timed
+
+    def backup_incremental(self):
+        def setup():
+            config = self.config()
+            found_saves = GameScanner(config).scan_for_saves()
+            manager = BackupManager(config, incremental=True)
+            manager.backup_saves(found_saves)
+            wait_for_next_second()
+            return manager, found_saves
+
+        def timed(state):
+            manager, found_saves = state
+            backup_log = manager.backup_saves(found_saves)
+            return backup_log['total_files'], backup_log['bytes_copied'] + backup_log['bytes_reused']
+        return setup, timed
+
+    def list_backups(self):
+        def setup():
+            config = self.config()
+            found_saves = GameScanner(config).scan_for_saves()
+            manager = BackupManager(config, storage='store')
+            for i in range(LIST_SNAPSHOTS):
+                for game_name, saves in found_saves.items():
+                    manager.write_snapshot(game_name, saves, timestamp=f"2025-01-01_00-00-{i:02d}")
+            return manager
+
+        def timed(manager):
+            snapshots = 0
+            for _ in range(LIST_REPEAT):
+                snapshots = sum(len(entries) for entries in manager.list_backups().values())
+            return snapshots * LIST_REPEAT, None
+        return setup, timed
+
+    def restore(self):
+        def setup():
+            config = self.config()
+            BackupManager(config).backup_saves(GameScanner(config).scan_for_saves())
+            return RestoreManager(config), self.work_dir / f"run{self.runs}" / "restored"
+
+        def timed(state):
+            manager, target_dir = state
+            files = size = 0
+            for game_name in manager.backup_manager.list_backups():
+                result = manager.restore(game_name, target_dir=target_dir / game_name)
+                files += len(result['restored'])
+                size += result['bytes_restored']
+            return files, size
+        return setup, timed
+
+    def raw_copy(self):
+        """Plain serial copy of the same saves, the disk speed restore is measured against"""
+        def setup():
+            config = self.config()
+            found_saves = GameScanner(config).scan_for_saves()
+            return found_saves, self.work_dir / f"run{self.runs}" / "copied"
+
+        def timed(state):
+            found_saves, target_dir = state
+            files = size = 0
+            for saves in found_saves.values():
+                for save_file in saves:
+                    destination = target_dir / f"{files}{save_file.suffix}"
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(save_file, destination)
+                    files += 1
+                    size += save_file.stat().st_size
+            return files, size
+        return setup, timed
+
+
+def wait_for_next_second():
+    """Snapshots are named by the second, so back-to-back backups must not share one"""
+    time.sleep(1.0 - time.time() % 1.0 + 0.01)
+
+
+def git_commit():
+    """Short hash of the checked-out commit, if this is a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """Print each phase's time against a previous results file"""
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for name, result in results['phases'].items():
+        old = baseline.get('phases', {}).get(name)
+        if not old or not old['seconds']:
+            continue
+        ratio = result['seconds'] / old['seconds']
+        print(f"  {name:<20}{old['seconds']:>10.4f}s -> {result['seconds']:.4f}s  ({ratio:.2f}x time)"
+              f"  peak {old['peak_mb']} -> {result['peak_mb']} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scanning and backups on a synthetic profile')
+    parser.add_argument('--scale', type=int, default=4, help='Profile size multiplier')
+    parser.add_argument('--seed', type=int, default=0, help='Profile random seed')
+    parser.add_argument('--world-mb', type=int, default=8, help='Size of each large world file in MB')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per phase, best is kept')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    parser.add_argument('--compare', help='Previous JSON results to compare against')
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp())
+    saved_environment = {key: os.environ.get(key) for key in profile_environment(work_dir)}
+    try:
+        profile = generate_profile(work_dir / "profile", scale=args.scale, seed=args.seed,
+                                   world_mb=args.world_mb)
+        os.environ.update(profile_environment(work_dir / "profile"))
+        run = BenchmarkRun(work_dir, work_dir / "profile", repeat=args.repeat)
+
+        phases = {
+            'scan_cold': run.scan_cold,
+            'scan_warm': run.scan_warm,
+            'is_likely_save_file': run.classify,
+            'backup_full': run.backup_full,
+            'backup_incremental': run.backup_incremental,
+            'list_backups': run.list_backups,
+            'restore': run.restore,
+            'raw_copy': run.raw_copy,
+        }
+        results = {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'profile': dict(profile, scale=args.scale, seed=args.seed, world_mb=args.world_mb),
+            'phases': {}
+        }
+        for name, phase in phases.items():
+            results['phases'][name] = run.measure(phase())
+            print(f"  {name}: {results['phases'][name]}", file=sys.stderr)
+    finally:
+        for key, value in saved_environment.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(work_dir)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Reproducible synthetic Windows user profiles for benchmarks
+Builds a fake USERPROFILE with Documents, AppData/Roaming and AppData/Local
+holding known games, unknown games with save folders, deep excluded app
+trees and large world files. The same seed and scale always give the same tree.
+
+Usage: python benchmarks/synthetic_profile.py OUTPUT_DIR [--scale N] [--seed S] [--world-mb M]
+"""
+
+import argparse
+import os
+import random
+from pathlib import Path
+
+EXCLUDED_APPS = ['Google', 'Discord', 'Microsoft', 'npm', 'Mozilla', 'JetBrains', 'Zoom']
+ASSET_EXTENSIONS = ['.png', '.pak', '.dll', '.txt', '.log', '.ogg', '.bin']
+SAVE_NAMES = ['slot{}.sav', 'save{}.dat', 'profile{}.json', 'player{}.xml', 'checkpoint{}.sav']
+
+
+def profile_environment(root):
+    """Environment variables pointing Config and SavePatterns at a synthetic profile"""
+    root = Path(root)
+    return {
+        'USERPROFILE': str(root),
+        'APPDATA': str(root / "AppData" / "Roaming"),
+        'LOCALAPPDATA': str(root / "AppData" / "Local"),
+    }
+
+
+class ProfileBuilder:
+    def __init__(self, root, seed=0):
+        self.root = Path(root)
+        self.rng = random.Random(seed)
+        self.files = 0
+        self.bytes = 0
+        self.save_files = 0
+
+    def write(self, relative, size, save=False):
+        """Write one file of random content"""
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            remaining = size
+            while remaining > 0:
+                chunk = min(remaining, 1024 * 1024)
+                f.write(self.rng.randbytes(chunk))
+                remaining -= chunk
+        self.files += 1
+        self.bytes += size
+        if save:
+            self.save_files += 1
+
+    def save_size(self):
+        """Typical save file size, from a few KB up to a few hundred"""
+        return int(self.rng.lognormvariate(9.5, 1.2)) + 64
+
+    def known_games(self, scale, world_mb):
+        """Saves in the locations SavePatterns knows about"""
+        documents = Path("Documents")
+        my_games = documents / "My Games"
+        roaming = Path("AppData") / "Roaming"
+        local = Path("AppData") / "Local"
+
+        for i in range(20 * scale):
+            self.write(my_games / "Skyrim" / "Saves" / f"Save{i}.ess", self.save_size(), save=True)
+            self.write(my_games / "Fallout4" / "Saves" / f"Save{i}.fos", self.save_size(), save=True)
+        for i in range(5 * scale):
+            self.write(documents / "The Witcher 3" / "gamesaves" / f"QuickSave{i}.sav",
+                       self.save_size(), save=True)
+            self.write(roaming / "StardewValley" / "Saves" / f"Farm_{i}" / f"Farm_{i}",
+                       self.save_size(), save=True)
+            self.write(local / "FortniteGame" / "Saved" / "Config" / f"GameUserSettings{i}.ini",
+                       self.save_size(), save=True)
+
+        # Large world files, the heaviest thing a backup copies
+        for i in range(2):
+            self.write(my_games / "Terraria" / "Worlds" / f"World{i}.wld",
+                       world_mb * 1024 * 1024, save=True)
+        self.write(my_games / "Terraria" / "Players" / "Player.plr", self.save_size(), save=True)
+
+    def unknown_games(self, base, count):
+        """Game folders SavePatterns does not know, with saves beside their assets"""
+        for g in range(count):
+            game_dir = Path(base) / f"Indie Studio {g}" / f"Game {g}"
+            for i in range(self.rng.randint(3, 8)):
+                folder = self.rng.choice(['saves', 'savegames', 'profiles/user1', 'data'])
+                name = self.rng.choice(SAVE_NAMES).format(i)
+                self.write(game_dir / folder / name, self.save_size(), save=True)
+            for i in range(self.rng.randint(10, 40)):
+                extension = self.rng.choice(ASSET_EXTENSIONS)
+                self.write(game_dir / "assets" / f"pack{i % 4}" / f"asset{i}{extension}",
+                           self.rng.randint(0, 4096))
+
+    def excluded_apps(self, base, scale, depth=6):
+        """Deep non-game app trees full of small cache files the scanner must skip"""
+        for app in EXCLUDED_APPS:
+            for branch in range(4 * scale):
+                folder = Path(base) / app / "User Data" / f"Profile {branch}"
+                for level in range(depth):
+                    folder = folder / f"level{level}"
+                    for i in range(5):
+                        name = f"entry{i}" + self.rng.choice(['.dat', '.json', '.tmp', '.db', ''])
+                        self.write(folder / name, self.rng.randint(0, 2048))
+
+    def build(self, scale=1, world_mb=8):
+        """Create the whole profile and return its statistics"""
+        self.known_games(scale, world_mb)
+        self.unknown_games(Path("AppData") / "Roaming", 15 * scale)
+        self.unknown_games(Path("AppData") / "Local", 15 * scale)
+        self.unknown_games(Path("Documents") / "My Games", 5 * scale)
+        self.excluded_apps(Path("AppData") / "Roaming", scale)
+        self.excluded_apps(Path("AppData") / "Local", scale)
+        return {'files': self.files, 'bytes': self.bytes, 'save_files': self.save_files}
+
+
+def generate_profile(root, scale=1, seed=0, world_mb=8):
+    """Build a synthetic profile under root, returning its file and byte counts"""
+    return ProfileBuilder(root, seed=seed).build(scale=scale, world_mb=world_mb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic user profile')
+    parser.add_argument('output', help='Directory to create the profile in')
+    parser.add_argument('--scale', type=int, default=1, help='Size multiplier')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--world-mb', type=int, default=8, help='Size of each large world file in MB')
+    args = parser.parse_args()
+
+    if os.path.exists(args.output) and os.listdir(args.output):
+        parser.error(f"{args.output} is not empty")
+    stats = generate_profile(args.output, scale=args.scale, seed=args.seed, world_mb=args.world_mb)
+    print(f"{stats['files']} files ({stats['save_files']} saves), "
+          f"{stats['bytes'] / 1024 / 1024:.1f} MB in {args.output}")
+
+
+if __name__ == '__main__':
+    main()
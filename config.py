@@ -2,6 +2,7 @@
 Configuration settings for the Game Save Backup Utility
 """
 
+import copy
 import os
 from pathlib import Path
 
@@ -11,10 +12,12 @@ class Config:
         self.base_dir = Path(__file__).parent
         self.backup_dir = self.base_dir / "loaded saves"
         self.logs_dir = self.base_dir / "logs"
-        
-        # Ensure directories exist
-        self.backup_dir.mkdir(exist_ok=True)
-        self.logs_dir.mkdir(exist_ok=True)
+        self.cache_dir = self.base_dir / "cache"
+        self.store_dir = self.backup_dir / ".store"
+        self.manifests_dir = self.backup_dir / ".manifests"
+        self.catalog_path = self.backup_dir / ".catalog.sqlite3"
+        # Nothing is created here: whatever writes into these folders creates
+        # them, so read-only commands leave the disk untouched
         
         # Common save file extensions
         self.save_extensions = {
@@ -69,13 +72,83 @@ class Config:
         # Minimum file count threshold for unknown games
         self.min_save_files = 3
         
-        # User directories
+        # Incremental backups reuse unchanged files from the previous snapshot
+        self.incremental_backups = True
+        self.incremental_verify_hash = False
+        self.incremental_link_mode = 'hardlink'  # 'hardlink', 'reflink' or 'copy'
+        
+        # 'directory' keeps plain snapshot folders, 'store' deduplicates file
+        # contents in a content-addressed object store under store_dir, and
+        # 'archive' writes one compressed zip per snapshot
+        self.backup_storage = 'directory'
+        
+        # Archive compression: 'deflate', 'zstd' (Python 3.14+) or 'stored';
+        # archive_level is the compression level, None for the default
+        self.archive_compression = 'deflate'
+        self.archive_level = None
+        
+        # Number of threads used to walk app folders while scanning
+        self.scan_jobs = 1
+        
+        # Parallel copy settings; copy_rate_limit is in bytes per second (None = unlimited)
+        self.copy_workers = 4
+        self.copy_rate_limit = None
+        
+        # Retention applied by --prune: keep_last keeps each game's newest N
+        # snapshots, keep_daily/weekly/monthly the newest snapshot of each of
+        # the last N days, weeks and months that have one. With every value
+        # None or 0 nothing is pruned.
+        self.retention = {'keep_last': 10, 'keep_daily': 7, 'keep_weekly': 4, 'keep_monthly': 12}
+        # Per-game overrides of any retention key, e.g. {'Skyrim': {'keep_last': 30}}
+        self.retention_overrides = {}
+        # Apply retention after every backup run, not only on --prune
+        self.auto_prune = False
+        
+        # Watch mode: seconds a game must stay quiet before it is backed up,
+        # and how often watched folders are polled when watchdog is unavailable
+        self.watch_debounce = 3.0
+        self.watch_poll_interval = 2.0
+        
+        # User directories; profile_name is set on configs made by for_profile()
+        self.profile_name = None
         self.user_profile = Path(os.environ.get('USERPROFILE', ''))
         self.appdata = Path(os.environ.get('APPDATA', ''))
         self.localappdata = Path(os.environ.get('LOCALAPPDATA', ''))
         
         # Common game save locations
-        self.scan_locations = [
+        self.scan_locations = self._scan_locations()
+    
+    def for_profile(self, profile_root, profile_name):
+        """A copy of this config that scans the user profile at profile_root
+        
+        The profile may be a local user folder or one on a mounted disk
+        image, laid out like a Windows user folder. Backups, logs and the
+        store stay shared; the scan index gets a folder of its own.
+        """
+        profile = copy.copy(self)
+        profile.profile_name = profile_name
+        profile.user_profile = Path(profile_root)
+        profile.appdata = profile.user_profile / "AppData" / "Roaming"
+        profile.localappdata = profile.user_profile / "AppData" / "Local"
+        profile.scan_locations = profile._scan_locations()
+        profile.cache_dir = self.cache_dir / "profiles" / profile_name
+        return profile
+    
+    def environment(self):
+        """Environment variables as seen by the user whose profile is scanned"""
+        environ = dict(os.environ)
+        if self.profile_name is not None:
+            environ.update({
+                'USERPROFILE': str(self.user_profile),
+                'APPDATA': str(self.appdata),
+                'LOCALAPPDATA': str(self.localappdata),
+                'HOME': str(self.user_profile),
+            })
+        return environ
+    
+    def _scan_locations(self):
+        """Common game save locations under the user directories"""
+        return [
             self.user_profile / "Documents" / "My Games",
             self.user_profile / "Documents",
             self.appdata,
@@ -0,0 +1,96 @@
+"""
+Concurrent copy engine used by the backup manager
+Runs copy jobs on a bounded thread pool with optional byte-rate limiting,
+while handing results back in submission order so logs stay deterministic
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RateLimiter:
+    """Token bucket shared by all copy workers"""
+
+    def __init__(self, bytes_per_second):
+        self.bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        self._next_free = time.monotonic()
+
+    def consume(self, nbytes):
+        """Block until nbytes may be transferred without exceeding the rate"""
+        if not self.bytes_per_second or nbytes <= 0:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_free)
+            self._next_free = start + nbytes / self.bytes_per_second
+            delay = start - now
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CopyEngine:
+    def __init__(self, workers=4, bytes_per_second=None):
+        self.workers = max(1, int(workers or 1))
+        self.rate_limiter = RateLimiter(bytes_per_second)
+        self._created_dirs = set()
+        self._dirs_lock = threading.Lock()
+
+        # Total time workers have spent running jobs
+        self.busy_seconds = 0.0
+        self._busy_lock = threading.Lock()
+
+    def ensure_dir(self, directory):
+        """Create a destination directory once, however many files land in it"""
+        with self._dirs_lock:
+            if directory in self._created_dirs:
+                return
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(directory)
+
+    def throttle(self, nbytes):
+        """Account for bytes about to be copied"""
+        self.rate_limiter.consume(nbytes)
+
+    def map(self, func, jobs):
+        """Run func over jobs, yielding (job, result, error) in job order
+
+        jobs may be any iterable, including a generator fed by a running
+        scan; at most a few jobs per worker are pulled ahead of the results
+        being consumed, so memory stays flat however many files there are.
+        Exceptions raised by func are returned as error instead of
+        propagating, so one failed file never stops the rest of the backup.
+        """
+        if self.workers == 1:
+            for job in jobs:
+                yield (job, *self._call(func, job))
+            return
+
+        window = self.workers * 4
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for job in jobs:
+                in_flight.append((job, executor.submit(self._call, func, job)))
+                while len(in_flight) >= window or (in_flight and in_flight[0][1].done()):
+                    job_done, future = in_flight.popleft()
+                    yield (job_done, *future.result())
+
+            while in_flight:
+                job_done, future = in_flight.popleft()
+                yield (job_done, *future.result())
+
+    def _call(self, func, job):
+        """Run one job, capturing its exception and timing it"""
+        start = time.perf_counter()
+        try:
+            return func(job), None
+        except Exception as e:
+            return None, e
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._busy_lock:
+                self.busy_seconds += elapsed
@@ -0,0 +1,126 @@
+"""
+Single-pass directory walking built on os.scandir
+Shared by the scanner so every directory is listed exactly once
+"""
+
+import os
+
+# Counters every walker keeps; files_classified counts files run through the
+# classifier and files_matched those it accepted, including ones from the index
+COUNTERS = ('dirs_visited', 'dirs_cached', 'files_seen', 'files_classified',
+            'files_matched', 'errors')
+
+
+class DirectoryWalker:
+    def __init__(self, verbose=False, index=None):
+        self.verbose = verbose
+        self.index = index
+        self.reset_counts()
+
+    def walk(self, root, classify=None):
+        """Walk a tree top-down, yielding (dirpath, subdirs, files) per directory
+
+        subdirs and files are lists of os.DirEntry objects. Like os.walk, the
+        caller may remove entries from subdirs to prune them before descent.
+        Symlinked directories are not followed, so each directory is listed once.
+
+        When classify is given, only files it accepts are yielded. With a scan
+        index attached, directories whose mtime is unchanged are served from the
+        index instead of being listed and classified again.
+        """
+        stack = [os.fspath(root)]
+
+        while stack:
+            dirpath = stack.pop()
+            if classify is None:
+                listing = self.list_dir(dirpath)
+            else:
+                listing = self.list_classified(dirpath, classify)
+            if listing is None:
+                continue
+
+            subdirs, files = listing
+            yield dirpath, subdirs, files
+
+            # Push in reverse so subdirectories are visited in listing order
+            for entry in reversed(subdirs):
+                stack.append(entry.path)
+
+    def list_dir(self, dirpath):
+        """List one directory, returning (subdirs, files) or None if unreadable"""
+        subdirs = []
+        files = []
+
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry)
+                        elif entry.is_file():
+                            files.append(entry)
+                    except OSError:
+                        continue
+        except (PermissionError, OSError) as e:
+            self.errors += 1
+            if self.verbose:
+                print(f"  Warning: Cannot access {dirpath}: {e}")
+            return None
+
+        self.dirs_visited += 1
+        self.files_seen += len(files)
+
+        return subdirs, files
+
+    def list_classified(self, dirpath, classify):
+        """List one directory keeping only files accepted by classify"""
+        mtime_ns = None
+        if self.index is not None:
+            mtime_ns, cached = self.index.lookup(dirpath)
+            if cached is not None:
+                self.dirs_cached += 1
+                self.files_matched += len(cached[1])
+                return cached
+
+        listing = self.list_dir(dirpath)
+        if listing is None:
+            return None
+
+        subdirs, files = listing
+        self.files_classified += len(files)
+        files = [entry for entry in files if classify(entry)]
+        self.files_matched += len(files)
+        if self.index is not None and mtime_ns is not None:
+            self.index.record(dirpath, mtime_ns, subdirs, files)
+
+        return subdirs, files
+
+    def fork(self):
+        """New walker sharing this one's settings and index, for another thread"""
+        return DirectoryWalker(verbose=self.verbose, index=self.index)
+
+    def reset_counts(self):
+        """Zero the counters before another scan with the same walker"""
+        for counter in COUNTERS:
+            setattr(self, counter, 0)
+
+    def add_counts(self, other):
+        """Fold another walker's counters into this one"""
+        for counter in COUNTERS:
+            setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+
+    def counts(self):
+        """Current counters as a dict"""
+        return {counter: getattr(self, counter) for counter in COUNTERS}
+
+    def iter_files(self, root, prune=None, classify=None):
+        """Yield every file entry under root exactly once
+
+        prune is an optional callable taking a directory DirEntry; returning
+        True skips that directory and everything below it. classify filters
+        the files yielded, as in walk().
+        """
+        for _, subdirs, files in self.walk(root, classify=classify):
+            if prune is not None:
+                subdirs[:] = [entry for entry in subdirs if not prune(entry)]
+            yield from files
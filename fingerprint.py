@@ -0,0 +1,79 @@
+"""
+File fingerprints used to tell whether saves changed since the last snapshot
+The fast path compares size and mtime against the snapshot manifest, which
+records both for every file. A file whose size matches but whose mtime does
+not is compared by content hash, BLAKE2b read through a memory map for large
+files, so a save rewritten with the same bytes still counts as unchanged.
+"""
+
+import hashlib
+import mmap
+import os
+
+CHUNK_SIZE = 1024 * 1024
+
+# Files at least this large are hashed through a memory map instead of reads
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+
+def hash_file(file_path):
+    """BLAKE2b of a file's contents"""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+                return digest.hexdigest()
+            except (OSError, ValueError):
+                # Some filesystems cannot be mapped; fall back to plain reads
+                f.seek(0)
+                digest = hashlib.blake2b(digest_size=32)
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stat_fingerprint(stat):
+    """The (size, mtime) pair that stands for a file's contents on the fast path"""
+    return stat.st_size, stat.st_mtime_ns
+
+
+class SnapshotFingerprints:
+    """A game's last snapshot, checked file by file against the live saves"""
+
+    def __init__(self, manifest_files):
+        self.expected = {entry['original']: (entry['size'], entry['mtime_ns'], entry.get('hash'))
+                         for entry in manifest_files if entry.get('original')}
+        self.held = {}
+
+    def hold(self, save_file):
+        """Hold back a save that still matches the snapshot; False if it is new or changed
+
+        A save rewritten with the same bytes keeps its size but not its
+        mtime, so then its content hash decides.
+        """
+        expected = self.expected.get(str(save_file))
+        if expected is None:
+            return False
+        size, mtime_ns, file_hash = expected
+        try:
+            fingerprint = stat_fingerprint(os.stat(save_file))
+            if fingerprint[0] != size:
+                return False
+            if fingerprint[1] != mtime_ns and (not file_hash or hash_file(save_file) != file_hash):
+                return False
+        except OSError:
+            return False
+        self.held[str(save_file)] = save_file
+        return True
+
+    def release(self):
+        """The held saves, once the game turns out to need a snapshot after all"""
+        held = list(self.held.values())
+        self.held.clear()
+        return held
+
+    def unchanged(self):
+        """Whether every file of the snapshot was seen, unchanged, and nothing else"""
+        return bool(self.expected) and len(self.held) == len(self.expected)
@@ -2,190 +2,291 @@
 Core scanning logic for finding game save files
 """
 
-import os
+import time
 from pathlib import Path
 from save_patterns import SavePatterns
+from save_classifier import SaveClassifier
+from dir_walker import DirectoryWalker
+from scan_planner import ScanPlanner
+from scan_index import ScanIndex
+from scan_stats import ScanStats
+from progress_events import EventStream
+from save_set import DirectoryTable, SaveSet
 
 class GameScanner:
-    def __init__(self, config, verbose=False):
+    def __init__(self, config, verbose=False, use_index=True, jobs=None, events=None):
         self.config = config
         self.verbose = verbose
-        self.save_patterns = SavePatterns()
+        self.jobs = jobs or config.scan_jobs
+        self.events = events or EventStream()
+        self.save_patterns = SavePatterns(environ=config.environment(),
+                                          cache_file=config.cache_dir / "patterns.cache")
+        self.classifier = SaveClassifier(config)
+        
+        # Remembers directory listings between runs so unchanged trees are skipped
+        self.index = None
+        if use_index:
+            self.index = ScanIndex(str(config.cache_dir / "scan_index.sqlite3"),
+                                   self.classifier.fingerprint, verbose=verbose)
+        self.walker = DirectoryWalker(verbose=verbose, index=self.index)
+        
+        # Timing and counters of the most recent scan
+        self.stats = ScanStats()
     
-    def scan_for_saves(self, game_filter=None):
-        """Scan system for game save files"""
+    def scan_for_saves(self, game_filter=None, rescan=False):
+        """Scan system for game save files, returning {game: SaveSet}"""
         found_saves = {}
+        table = DirectoryTable()
+        for game_name, files in self.iter_save_sets(game_filter=game_filter, rescan=rescan):
+            saves = found_saves.get(game_name)
+            if saves is None:
+                saves = found_saves[game_name] = SaveSet(table=table)
+            saves.extend(files)
         
-        # First, scan known game patterns
-        if self.verbose:
-            print("Scanning known game save locations...")
+        return found_saves
+    
+    def iter_saves(self, game_filter=None, rescan=False, stats=None):
+        """Yield (game_name, save_file) pairs as soon as each one is settled
         
-        for game_name, patterns in self.save_patterns.get_all_patterns().items():
-            if game_filter and game_filter.lower() not in game_name.lower():
-                continue
-                
-            game_saves = []
-            for pattern_path in patterns:
-                if pattern_path.exists():
-                    saves = self._scan_directory(pattern_path)
-                    game_saves.extend(saves)
-            
-            if game_saves:
-                found_saves[game_name] = game_saves
-                if self.verbose:
-                    print(f"  Found {len(game_saves)} saves for {game_name}")
+        Known games stream out while their folders are walked. An unknown game
+        is yielded once its app folder has been fully walked and every earlier
+        known or unknown game whose name it contains has been settled, so the
+        results match scanning everything first and classifying afterwards.
+        
+        Timing and counters go into stats if given, else a new ScanStats,
+        which is kept as self.stats either way.
+        """
+        for game_name, files in self.iter_save_sets(game_filter=game_filter, rescan=rescan,
+                                                    stats=stats):
+            for save_file in files:
+                yield game_name, save_file
+    
+    def iter_save_sets(self, game_filter=None, rescan=False, stats=None):
+        """Yield (game_name, SaveSet) batches in the order iter_saves() yields their files"""
+        self.stats = stats if stats is not None else ScanStats()
+        self.events.emit('scan_started', game_filter=game_filter)
+        self.walker.reset_counts()
+        if self.index is not None:
+            if rescan:
+                self.index.clear()
+            self.index.load()
+        
+        # Only known games with an existing save folder take part; the rest
+        # could neither be found nor hold back an unknown game's decision
+        known_patterns = self.save_patterns.existing_patterns(game_filter)
         
-        # Then, scan common locations for unknown games
+        # Known game folders and common locations overlap heavily, so plan
+        # one walk per disjoint root and route each file to every claimant
         if self.verbose:
-            print("Scanning common save locations...")
+            print("Scanning known game save locations and common save locations...")
         
-        for location in self.config.scan_locations:
-            if location.exists():
-                unknown_saves = self._scan_for_unknown_games(location, found_saves.keys())
-                found_saves.update(unknown_saves)
+        planner = ScanPlanner(known_patterns, self.config.scan_locations, verbose=self.verbose)
+        resolver = _GameResolver(self, known_patterns, self.config.scan_locations)
         
-        return found_saves
-    
-    def _scan_directory(self, directory):
-        """Scan a directory for save files"""
-        saves = []
-        try:
-            for item in directory.rglob('*'):
-                if item.is_file() and self._is_save_file(item):
-                    saves.append(item)
-        except (PermissionError, OSError) as e:
+        found_games = set()
+        for segment in planner.iter_segments(self.walker, self._is_save_file,
+                                             self._is_excluded_app, jobs=self.jobs,
+                                             stats=self.stats, events=self.events):
+            yield from self._announce(resolver.add(segment), found_games)
+        yield from self._announce(resolver.finish(), found_games)
+        
+        if self.index is not None:
+            self.index.save()
             if self.verbose:
-                print(f"  Warning: Cannot access {directory}: {e}")
+                print(f"  {self.walker.dirs_cached} of {self.walker.dirs_visited + self.walker.dirs_cached} "
+                      f"directories unchanged since the last scan")
         
-        return saves
+        self.stats.finish(resolver.known_found)
+        self.events.emit('scan_finished', seconds=round(self.stats.seconds, 3),
+                         dirs=self.walker.dirs_visited + self.walker.dirs_cached,
+                         files=self.walker.files_seen, saves=self.walker.files_matched,
+                         games=len(found_games))
     
-    def _scan_for_unknown_games(self, base_path, known_games):
-        """Scan for games not in our known patterns"""
-        unknown_saves = {}
+    def list_saves(self, folders):
+        """Save files now in the given folders, listing only those folders
         
-        try:
-            for item in base_path.iterdir():
-                if not item.is_dir():
-                    continue
-                
-                # Skip if we already know about this game
-                if any(known_game.lower() in item.name.lower() for known_game in known_games):
-                    continue
-                
-                # Skip excluded applications
-                if self._is_excluded_app(item.name):
-                    continue
-                
-                # Look for save-like folders or files
-                potential_saves = []
-                for subitem in item.rglob('*'):
-                    if subitem.is_file() and self._is_save_file(subitem):
-                        potential_saves.append(subitem)
-                    elif subitem.is_dir() and self._is_save_folder(subitem):
-                        # Scan inside save folders
-                        for save_file in subitem.rglob('*'):
-                            if save_file.is_file() and self._is_save_file(save_file):
-                                potential_saves.append(save_file)
-                
-                # Only include if it meets our criteria for being a game
-                if self._is_likely_game(item.name, potential_saves):
-                    game_name = item.name
-                    unknown_saves[game_name] = potential_saves
-                    if self.verbose:
-                        print(f"  Found {len(potential_saves)} potential saves for {game_name}")
-        
-        except (PermissionError, OSError) as e:
-            if self.verbose:
-                print(f"  Warning: Cannot access {base_path}: {e}")
-        
-        return unknown_saves
+        For watch mode, which knows where a game's saves live and only needs
+        to see what changed there, without walking the rest of the profile.
+        """
+        saves = []
+        for folder in folders:
+            listing = self.walker.list_classified(folder, self._is_save_file)
+            if listing is not None:
+                saves.extend(Path(entry.path) for entry in listing[1])
+        return saves
+    
+    def _announce(self, batches, found_games):
+        """Pass (game_name, SaveSet) batches through, sending game_found for each new game"""
+        for game_name, files in batches:
+            if game_name not in found_games:
+                found_games.add(game_name)
+                self.events.emit('game_found', game=game_name)
+            yield game_name, files
     
     def _is_save_file(self, file_path):
         """Check if a file is likely a save file"""
-        return self.save_patterns.is_likely_save_file(file_path)
-    
-    def _is_save_folder(self, folder_path):
-        """Check if a folder is likely to contain saves"""
-        folder_name = folder_path.name.lower()
-        return any(save_name in folder_name for save_name in self.config.save_folder_names)
+        return self.classifier.is_likely_save_file(file_path)
     
     def _is_excluded_app(self, app_name):
         """Check if this is a known non-game application or online game"""
-        app_lower = app_name.lower()
-        
-        # Check against excluded apps list
-        if app_lower in self.config.excluded_apps:
-            return True
-        
-        # Check for partial matches with excluded apps
-        for excluded in self.config.excluded_apps:
-            if excluded in app_lower or app_lower in excluded:
-                return True
-        
-        # Check against online games/MMOs list
-        if app_lower in self.config.excluded_online_games:
-            return True
-        
-        # Check for partial matches with online games
-        for excluded_game in self.config.excluded_online_games:
-            if excluded_game in app_lower or app_lower in excluded_game:
-                return True
-        
-        return False
+        return self.classifier.is_excluded_app(app_name)
     
     def _is_likely_game(self, app_name, potential_saves):
         """Determine if this is likely a game based on name and save patterns"""
-        app_lower = app_name.lower()
-        
         # If it's a known gaming platform, keep it
-        for platform in self.config.gaming_platforms:
-            if platform in app_lower:
-                return True
+        if self.classifier.is_gaming_platform(app_name):
+            return True
         
         # Must have minimum number of save files
         if len(potential_saves) < self.config.min_save_files:
             return False
         
-        # Look for game-like indicators in the name
-        game_indicators = [
-            'game', 'simulator', 'quest', 'world', 'craft', 'wars', 'legends',
-            'online', 'rpg', 'mmo', 'adventure', 'fantasy', 'racing', 'sports',
-            'strategy', 'action', 'shooter', 'puzzle', 'arcade', 'indie',
-            'emulator', 'launcher'
-        ]
-        
         # Check if name contains game-like words
-        has_game_indicator = any(indicator in app_lower for indicator in game_indicators)
+        if self.classifier.has_game_indicator(app_name):
+            return True
         
-        # Look for actual save file patterns in the files
+        # Otherwise require strong save file patterns in at least two files
         save_file_count = 0
-        for save_file in potential_saves:
+        paths = potential_saves.paths() if isinstance(potential_saves, SaveSet) else potential_saves
+        for save_file in paths:
             if self._has_strong_save_indicators(save_file):
                 save_file_count += 1
+                if save_file_count >= 2:
+                    return True
         
-        # Require either game indicator in name OR strong save file patterns
-        return has_game_indicator or (save_file_count >= 2)
+        return False
     
     def _has_strong_save_indicators(self, file_path):
         """Check if file has strong indicators of being a game save"""
-        file_path = Path(file_path)
-        name_lower = file_path.name.lower()
-        
-        # Strong save file indicators
-        strong_indicators = [
-            'save', 'profile', 'player', 'character', 'world', 'level',
-            'progress', 'checkpoint', 'slot', 'game'
-        ]
-        
-        # Check filename
-        for indicator in strong_indicators:
-            if indicator in name_lower:
-                return True
-        
-        # Check parent directory names
-        for parent in file_path.parents:
-            parent_name = parent.name.lower()
-            if any(indicator in parent_name for indicator in strong_indicators):
-                return True
-        
-        return False
\ No newline at end of file
+        return self.classifier.has_strong_save_indicators(file_path)
+
+
+class _GameResolver:
+    """Settles known and unknown games from streamed scan segments
+    
+    Mirrors the batch rules: known games are found if any of their folders
+    holds a save, and an app folder under scan location i is skipped when its
+    name contains a game already found among known games or locations < i.
+    """
+    
+    def __init__(self, scanner, known_patterns, scan_locations):
+        self.scanner = scanner
+        self.verbose = scanner.verbose
+        self.known_games = list(known_patterns)
+        self.known_found = {}
+        
+        # Only existing folders are passed in, and each is walked once
+        self.pending_patterns = {
+            game_name: len(patterns)
+            for game_name, patterns in known_patterns.items()
+        }
+        self.expected_locations = {i for i, location in enumerate(scan_locations)
+                                   if location.is_dir()}
+        
+        self.listed = set()
+        self.app_order = {}
+        # Candidate files of undecided app folders, which can be very many
+        self.table = DirectoryTable()
+        self.app_files = {}
+        self.decisions = {}
+        self.waiting = []
+        self.finished = False
+    
+    def add(self, segment):
+        """Take one segment from the walk and yield whatever it settles"""
+        for (game_name, _), files in segment.known_files.items():
+            self.known_found[game_name] = self.known_found.get(game_name, 0) + len(files)
+            if files:
+                yield game_name, files
+        
+        self.listed.update(segment.listed)
+        for location_index, names in segment.app_order.items():
+            self.app_order.setdefault(location_index, []).extend(names)
+        for target, files in segment.app_files.items():
+            saves = self.app_files.get(target)
+            if saves is None:
+                saves = self.app_files[target] = SaveSet(table=self.table)
+            saves.extend(files)
+        
+        for kind, target in segment.completed:
+            if kind == 'known':
+                self.pending_patterns[target[0]] -= 1
+            else:
+                self.waiting.append(target)
+        
+        yield from self._drain()
+    
+    def finish(self):
+        """Settle everything left once the walk is over"""
+        self.finished = True
+        
+        # App folders whose walk failed part-way are judged on what was found
+        queued = set(self.waiting)
+        for location_index in sorted(self.app_order):
+            for app_name in self.app_order[location_index]:
+                target = (location_index, app_name)
+                if target not in self.decisions and target not in queued:
+                    self.waiting.append(target)
+        
+        if self.verbose:
+            for game_name in self.known_games:
+                if self.known_found.get(game_name):
+                    print(f"  Found {self.known_found[game_name]} saves for {game_name}")
+        
+        yield from self._drain()
+    
+    def _drain(self):
+        """Decide every waiting app folder that no longer depends on anything"""
+        progress = True
+        while progress and self.waiting:
+            progress = False
+            for target in list(self.waiting):
+                start = time.perf_counter()
+                found = self._decide(target)
+                if found is None:
+                    continue
+                self.scanner.stats.add_decision(time.perf_counter() - start, found)
+                
+                progress = True
+                self.waiting.remove(target)
+                self.decisions[target] = found
+                potential_saves = self.app_files.pop(target, [])
+                if not found:
+                    continue
+                
+                if self.verbose:
+                    print(f"  Found {len(potential_saves)} potential saves for {target[1]}")
+                if potential_saves:
+                    yield target[1], potential_saves
+    
+    def _decide(self, target):
+        """Return True/False once an app folder can be judged, else None"""
+        location_index, app_name = target
+        name_lower = app_name.lower()
+        blocked = False
+        
+        # Skip if we already know about this game
+        for game_name in self.known_games:
+            if game_name.lower() in name_lower:
+                if self.known_found.get(game_name):
+                    return False
+                if self.pending_patterns[game_name] > 0 and not self.finished:
+                    blocked = True
+        
+        for earlier in range(location_index):
+            if earlier not in self.listed:
+                if earlier in self.expected_locations and not self.finished:
+                    blocked = True
+                continue
+            for other_name in self.app_order.get(earlier, []):
+                if other_name.lower() in name_lower:
+                    decision = self.decisions.get((earlier, other_name))
+                    if decision:
+                        return False
+                    if decision is None:
+                        blocked = True
+        
+        if blocked:
+            return None
+        
+        return self.scanner._is_likely_game(app_name, self.app_files.get(target, ()))
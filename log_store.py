@@ -0,0 +1,233 @@
+"""
+Append-only store for backup run logs
+Each run appends one compact line of per-file detail to details.jsonl and one
+summary line to runs.jsonl pointing at it, so runs can be listed, filtered
+and totalled without reading any per-file detail
+"""
+
+import json
+import os
+from pathlib import Path
+
+RUNS_FILE = "runs.jsonl"
+DETAILS_FILE = "details.jsonl"
+LEGACY_PATTERN = "backup_*.json"
+
+
+class LogStore:
+    def __init__(self, logs_dir, verbose=False):
+        self.logs_dir = Path(logs_dir)
+        self.runs_path = self.logs_dir / RUNS_FILE
+        self.details_path = self.logs_dir / DETAILS_FILE
+        self.verbose = verbose
+
+    def append(self, backup_log):
+        """Record one backup run, returning its summary"""
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
+
+        # Detail first, so a summary never points past the end of details.jsonl;
+        # it is encoded a file at a time rather than built as one string
+        with open(self.details_path, 'ab') as f:
+            f.seek(0, os.SEEK_END)
+            offset = f.tell()
+            for chunk in self._detail_chunks(backup_log):
+                f.write(chunk.encode('utf-8'))
+            f.write(b'\n')
+            length = f.tell() - offset
+
+        summary = self._summarize(backup_log, offset, length)
+        with open(self.runs_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary, separators=(',', ':')) + '\n')
+
+        return summary
+
+    def list_runs(self, offset=0, limit=None, game=None, errors_only=False,
+                  since=None, until=None):
+        """Return (summaries, total) for matching runs, newest first
+
+        game matches any game name containing it, case-insensitively; since
+        and until bound the run timestamp inclusively. Only runs.jsonl is read.
+        """
+        self.migrate_legacy()
+
+        runs = []
+        for summary in self._read_summaries():
+            if game and not any(game.lower() in name.lower() for name in summary['games']):
+                continue
+            if errors_only and not summary['error_count']:
+                continue
+            if since and summary['timestamp'] < since:
+                continue
+            if until and summary['timestamp'] > until:
+                continue
+            runs.append(summary)
+
+        runs.sort(key=lambda summary: summary['timestamp'], reverse=True)
+        end = None if limit is None else offset + limit
+        return runs[offset:end], len(runs)
+
+    def read_run(self, timestamp):
+        """Load one run's full log in the original backup_log shape, or None"""
+        self.migrate_legacy()
+
+        for summary in self._read_summaries():
+            if summary['timestamp'] != timestamp:
+                continue
+            with open(self.details_path, 'rb') as f:
+                f.seek(summary['detail_offset'])
+                detail = json.loads(f.read(summary['detail_length']).decode('utf-8'))
+            return self._expand(summary, detail)
+
+        return None
+
+    def originals(self, game_name, timestamp):
+        """Where each file of a run's snapshot of a game came from, by its path inside the snapshot
+
+        Logs written before snapshots had manifests are the only record of
+        their files' original locations. Their backup paths may come from
+        another machine, so the snapshot-relative part is found by the
+        snapshot's folder (or archive) name rather than by backup_dir.
+        """
+        backup_log = self.read_run(timestamp)
+        game_log = (backup_log or {}).get('games_backed_up', {}).get(game_name)
+        if not game_log:
+            return {}
+
+        originals = {}
+        for entry in game_log['files']:
+            parts = (entry.get('backup') or '').replace('\\', '/').split('/')
+            for index in range(len(parts) - 1, -1, -1):
+                if parts[index] == timestamp or parts[index].startswith(timestamp + '.'):
+                    originals['/'.join(parts[index + 1:])] = entry.get('original')
+                    break
+        return originals
+
+    def migrate_legacy(self):
+        """Import logs/backup_*.json files written before this store existed
+
+        Runs already present are skipped, so this is cheap once migrated. The
+        original files are left in place and may be deleted afterwards.
+        """
+        legacy_files = sorted(self.logs_dir.glob(LEGACY_PATTERN))
+        if not legacy_files:
+            return 0
+
+        known = {summary['timestamp'] for summary in self._read_summaries()}
+        migrated = 0
+        for log_file in legacy_files:
+            if log_file.stem[len('backup_'):] in known:
+                continue
+            try:
+                with open(log_file, encoding='utf-8') as f:
+                    backup_log = json.load(f)
+            except (OSError, ValueError) as e:
+                if self.verbose:
+                    print(f"  Warning: Could not migrate {log_file}: {e}")
+                continue
+
+            backup_log.setdefault('timestamp', log_file.stem[len('backup_'):])
+            if backup_log['timestamp'] in known:
+                continue
+            self.append(backup_log)
+            known.add(backup_log['timestamp'])
+            migrated += 1
+
+        if migrated and self.verbose:
+            print(f"  Migrated {migrated} backup logs into {self.runs_path}")
+        return migrated
+
+    def _read_summaries(self):
+        """Yield every run summary, skipping a torn last line"""
+        if not self.runs_path.exists():
+            return
+        with open(self.runs_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    @staticmethod
+    def _summarize(backup_log, offset, length):
+        """Per-run totals kept in runs.jsonl"""
+        games = backup_log.get('games_backed_up', {})
+        return {
+            'timestamp': backup_log.get('timestamp'),
+            'games': {name: game_log.get('count', len(game_log.get('files', [])))
+                      for name, game_log in games.items()},
+            'total_files': backup_log.get('total_files', 0),
+            'files_copied': backup_log.get('files_copied', 0),
+            'files_reused': backup_log.get('files_reused', 0),
+            'bytes_copied': backup_log.get('bytes_copied', 0),
+            'bytes_reused': backup_log.get('bytes_reused', 0),
+            'error_count': len(backup_log.get('errors', [])),
+            'detail_offset': offset,
+            'detail_length': length
+        }
+
+    @staticmethod
+    def _detail_chunks(backup_log):
+        """Per-file detail as JSON text, each game's backup folder stored once, plus run stats"""
+        dumps = json.JSONEncoder(separators=(',', ':')).encode
+        yield '{"games":{'
+        for game_index, (name, game_log) in enumerate(backup_log.get('games_backed_up', {}).items()):
+            backup_dir = game_log.get('backup_dir', '')
+            entries = game_log.get('files', [])
+
+            # Paths inside the snapshot folder are stored relative to it; a
+            # BackedUpFiles view knows whether they are, plain lists are checked
+            if hasattr(entries, 'log_rows'):
+                relative, rows = entries.log_rows()
+            else:
+                prefix = backup_dir + os.sep if backup_dir else None
+                relative = bool(prefix) and all(entry.get('backup', '').startswith(prefix)
+                                                 for entry in entries)
+                rows = ([entry.get('original'),
+                         entry.get('backup', '')[len(prefix):] if relative else entry.get('backup', ''),
+                         entry.get('size'), entry.get('reused', False)]
+                        for entry in entries)
+
+            header = dumps({
+                'backup_dir': backup_dir,
+                'storage': game_log.get('storage', 'directory'),
+                'relative': relative
+            })
+            yield (',' if game_index else '') + dumps(name) + ':' + header[:-1] + ',"files":['
+            for row_index, row in enumerate(rows):
+                yield (',' if row_index else '') + dumps(row)
+            yield ']}'
+
+        yield '},"errors":' + dumps(backup_log.get('errors', []))
+        if backup_log.get('stats'):
+            yield ',"stats":' + dumps(backup_log['stats'])
+        yield '}'
+
+    @staticmethod
+    def _expand(summary, detail):
+        """Rebuild the original backup_log dict from a summary and its detail"""
+        games_backed_up = {}
+        for name, game in detail['games'].items():
+            backup_dir = game['backup_dir']
+            files = []
+            for original, backup, size, reused in game['files']:
+                if game['relative']:
+                    backup = backup_dir + os.sep + backup
+                files.append({'original': original, 'backup': backup,
+                              'size': size, 'reused': reused})
+            games_backed_up[name] = {
+                'files': files,
+                'count': len(files),
+                'backup_dir': backup_dir,
+                'storage': game['storage']
+            }
+
+        backup_log = {
+            key: summary[key]
+            for key in ('timestamp', 'total_files', 'files_copied', 'files_reused',
+                        'bytes_copied', 'bytes_reused')
+        }
+        backup_log['games_backed_up'] = games_backed_up
+        backup_log['errors'] = detail['errors']
+        if 'stats' in detail:
+            backup_log['stats'] = detail['stats']
+        return backup_log
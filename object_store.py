@@ -0,0 +1,215 @@
+"""
+Content-addressed object store for deduplicated backups
+Each unique file is stored once as a blob keyed by its hash, and every
+snapshot is a small JSON manifest listing the blobs it references
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from fingerprint import CHUNK_SIZE
+from save_set import BackupRecords
+
+
+def temp_path_for(destination):
+    """A fresh name beside destination, to write a file under before os.replace()"""
+    return f"{os.fspath(destination)}.{os.urandom(6).hex()}.tmp"
+
+
+def copy_file_hashed(source, destination):
+    """Copy a file like shutil.copy2 while hashing it, returning the hash
+
+    The copy is written under a temporary name and renamed over destination,
+    so a file already there (perhaps a hardlink shared with another
+    snapshot) is replaced, never written into.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    temp_path = temp_path_for(destination)
+    try:
+        with open(source, 'rb') as src, open(temp_path, 'xb') as dst:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                dst.write(chunk)
+        shutil.copystat(source, temp_path)
+        os.replace(temp_path, destination)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return digest.hexdigest()
+
+
+def save_manifest(path, game_name, timestamp, files):
+    """Atomically write a snapshot manifest listing its files
+
+    files is a list of entries or a BackupRecords; either way the entries
+    are encoded one at a time rather than as one document.
+    """
+    manifest = {
+        'game': game_name,
+        'timestamp': timestamp,
+        'file_count': len(files),
+        'total_bytes': (files.total_bytes() if isinstance(files, BackupRecords)
+                        else sum(entry['size'] for entry in files)),
+        'files': files
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix('.tmp')
+    header = json.dumps({key: value for key, value in manifest.items() if key != 'files'})
+    with open(temp_path, 'w') as f:
+        f.write(header[:-1] + ', "files": [')
+        for index, entry in enumerate(files):
+            f.write(', ' + json.dumps(entry) if index else json.dumps(entry))
+        f.write(']}')
+    os.replace(temp_path, path)
+
+    return manifest
+
+
+class ObjectStore:
+    def __init__(self, root, verbose=False):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.snapshots_dir = self.root / "snapshots"
+        self.verbose = verbose
+
+    def object_path(self, digest):
+        """Location of the blob for a hash"""
+        return self.objects_dir / digest[:2] / digest
+
+    def manifest_path(self, game_name, timestamp):
+        """Location of a snapshot manifest"""
+        return self.snapshots_dir / game_name / f"{timestamp}.json"
+
+    def put_file(self, file_path):
+        """Store a file's contents, returning (hash, size, newly_stored)
+
+        The file is read once: it is copied to a temporary blob while being
+        hashed, then renamed into place unless an identical blob already exists.
+        """
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.blake2b(digest_size=32)
+        size = 0
+
+        fd, temp_path = tempfile.mkstemp(dir=self.objects_dir, suffix='.tmp')
+        try:
+            with open(file_path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+
+            object_hash = digest.hexdigest()
+            target = self.object_path(object_hash)
+            if target.exists():
+                os.remove(temp_path)
+                return object_hash, size, False
+
+            target.parent.mkdir(exist_ok=True)
+            os.replace(temp_path, target)
+            return object_hash, size, True
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def has_object(self, digest):
+        """Check whether a blob is present"""
+        return self.object_path(digest).exists()
+
+    def write_manifest(self, game_name, timestamp, files):
+        """Write a snapshot manifest referencing stored blobs"""
+        return save_manifest(self.manifest_path(game_name, timestamp), game_name, timestamp, files)
+
+    def read_manifest(self, game_name, timestamp):
+        """Load a snapshot manifest"""
+        with open(self.manifest_path(game_name, timestamp)) as f:
+            return json.load(f)
+
+    def list_snapshots(self, game_name=None):
+        """Return {game: [timestamps, newest first]} for stored snapshots"""
+        snapshots = {}
+        if not self.snapshots_dir.is_dir():
+            return snapshots
+
+        for game_dir in os.scandir(self.snapshots_dir):
+            if not game_dir.is_dir():
+                continue
+            if game_name and game_name.lower() not in game_dir.name.lower():
+                continue
+
+            timestamps = [entry.name[:-len('.json')] for entry in os.scandir(game_dir.path)
+                          if entry.name.endswith('.json')]
+            if timestamps:
+                snapshots[game_dir.name] = sorted(timestamps, reverse=True)
+
+        return snapshots
+
+    def latest_manifest(self, game_name, before=None):
+        """Load the newest manifest for a game, or None"""
+        timestamps = self.list_snapshots().get(game_name, [])
+        for timestamp in timestamps:
+            if before is None or timestamp < before:
+                return self.read_manifest(game_name, timestamp)
+        return None
+
+    def restore(self, game_name, timestamp, target_dir):
+        """Materialize a snapshot as a plain directory tree under target_dir"""
+        manifest = self.read_manifest(game_name, timestamp)
+        target_dir = Path(target_dir)
+        restored = []
+
+        for entry in manifest['files']:
+            destination = target_dir / entry['path']
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self.object_path(entry['hash']), destination)
+            if entry.get('mtime_ns') is not None:
+                os.utime(destination, ns=(entry['mtime_ns'], entry['mtime_ns']))
+            restored.append(destination)
+
+        return restored
+
+    def delete_snapshot(self, game_name, timestamp):
+        """Remove a snapshot manifest; its blobs are reclaimed by gc()"""
+        path = self.manifest_path(game_name, timestamp)
+        path.unlink()
+        try:
+            path.parent.rmdir()
+        except OSError:
+            pass
+
+    def gc(self):
+        """Delete blobs no snapshot references, returning (objects, bytes) removed"""
+        referenced = set()
+        for game_name, timestamps in self.list_snapshots().items():
+            for timestamp in timestamps:
+                for entry in self.read_manifest(game_name, timestamp)['files']:
+                    referenced.add(entry['hash'])
+
+        removed = 0
+        reclaimed = 0
+        if not self.objects_dir.is_dir():
+            return removed, reclaimed
+
+        for bucket in os.scandir(self.objects_dir):
+            if not bucket.is_dir():
+                continue
+            for blob in os.scandir(bucket.path):
+                if blob.name in referenced:
+                    continue
+                try:
+                    size = blob.stat().st_size
+                    os.remove(blob.path)
+                    removed += 1
+                    reclaimed += size
+                except OSError as e:
+                    if self.verbose:
+                        print(f"  Warning: Could not remove {blob.path}: {e}")
+
+        return removed, reclaimed
@@ -0,0 +1,149 @@
+"""
+Batch backups of several user profiles in one run
+Each profile root (a local user folder, or one on a mounted disk image) gets
+its own Config and SavePatterns and is scanned in a worker process, so the
+profiles are scanned side by side. Saves are backed up as each profile's scan
+completes, under game names prefixed with the profile name, into the shared
+backup folder, store, catalog and run log.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from game_scanner import GameScanner
+from save_set import DirectoryTable, SaveSet
+
+
+def profile_game_name(profile_name, game_name):
+    """A game's name within a profile, as used for its snapshots"""
+    return f"[{profile_name}] {game_name}"
+
+
+def profile_names(profile_roots):
+    """[(name, root)] with a unique short name per profile root, from its folder name"""
+    named = []
+    taken = set()
+    for root in profile_roots:
+        base = Path(root).name or 'profile'
+        name = base
+        suffix = 2
+        while name.lower() in taken:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        taken.add(name.lower())
+        named.append((name, root))
+    return named
+
+
+def scan_profile(config, game_filter=None, rescan=False, use_index=True):
+    """Scan one profile's saves; runs in a worker process
+
+    Returns ({game: SaveSet}, the scan's stats as a dict).
+    """
+    scanner = GameScanner(config, use_index=use_index, jobs=config.scan_jobs)
+    found_saves = scanner.scan_for_saves(game_filter=game_filter, rescan=rescan)
+    return found_saves, scanner.stats.as_dict()
+
+
+class ProfileBatch:
+    def __init__(self, config, profile_roots, verbose=False, processes=None, use_index=True):
+        self.config = config
+        self.verbose = verbose
+        self.use_index = use_index
+        self.profiles = [(name, config.for_profile(root, name))
+                         for name, root in profile_names(profile_roots)]
+        self.processes = processes or min(len(self.profiles), os.cpu_count() or 1) or 1
+
+        # {profile name: {'root', 'games', 'files', 'scan'}} of the most recent run
+        self.results = {}
+        self.errors = []
+
+    def iter_saves(self, game_filter=None, rescan=False):
+        """Yield (profile game name, save file) pairs, one profile at a time as its scan completes
+
+        A profile whose root is missing or whose scan fails is left out and
+        noted in self.errors.
+        """
+        for game_name, files in self.iter_save_sets(game_filter=game_filter, rescan=rescan):
+            for save_file in files:
+                yield game_name, save_file
+
+    def iter_save_sets(self, game_filter=None, rescan=False):
+        """Yield (profile game name, SaveSet) for each game, in iter_saves() order"""
+        self.results.clear()
+        del self.errors[:]
+        pending = []
+        for name, profile_config in self.profiles:
+            if profile_config.user_profile.is_dir():
+                pending.append((name, profile_config))
+            else:
+                self._fail(name, f"profile folder not found: {profile_config.user_profile}")
+
+        if self.processes <= 1 or len(pending) <= 1:
+            for name, profile_config in pending:
+                try:
+                    outcome = scan_profile(profile_config, game_filter, rescan, self.use_index)
+                except Exception as e:
+                    self._fail(name, e)
+                    continue
+                yield from self._finish(name, profile_config, *outcome)
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.processes, len(pending))) as pool:
+            futures = {pool.submit(scan_profile, profile_config, game_filter, rescan,
+                                   self.use_index): (name, profile_config)
+                       for name, profile_config in pending}
+            for future in as_completed(futures):
+                name, profile_config = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    self._fail(name, e)
+                    continue
+                yield from self._finish(name, profile_config, *outcome)
+
+    def scan_for_saves(self, game_filter=None, rescan=False):
+        """Scan every profile, returning {profile game name: SaveSet}"""
+        found_saves = {}
+        table = DirectoryTable()
+        for game_name, files in self.iter_save_sets(game_filter=game_filter, rescan=rescan):
+            saves = found_saves.get(game_name)
+            if saves is None:
+                saves = found_saves[game_name] = SaveSet(table=table)
+            saves.extend(files)
+        return found_saves
+
+    def backup(self, backup_manager, game_filter=None, rescan=False):
+        """Back up every profile into one run, returning its log
+
+        The log lists each profile's root, counts and scan stats under
+        'profiles', and failed profiles among its errors.
+        """
+        # Fresh containers, as the log keeps the ones it is given
+        self.results = {}
+        self.errors = []
+        return backup_manager.backup_stream(
+            self.iter_saves(game_filter=game_filter, rescan=rescan),
+            profiles=self.results, errors=self.errors)
+
+    def _finish(self, name, profile_config, found_saves, scan_stats):
+        """Record a finished profile scan and yield its games under profile game names"""
+        self.results[name] = {
+            'root': str(profile_config.user_profile),
+            'games': len(found_saves),
+            'files': sum(len(save_files) for save_files in found_saves.values()),
+            'scan': scan_stats
+        }
+        if self.verbose:
+            print(f"  {name}: {self.results[name]['games']} games, "
+                  f"{self.results[name]['files']} save files")
+        for game_name, save_files in found_saves.items():
+            yield profile_game_name(name, game_name), save_files
+
+    def _fail(self, name, error):
+        """Note a profile that could not be scanned"""
+        error_msg = f"Failed to scan profile {name}: {error}"
+        self.errors.append(error_msg)
+        if self.verbose:
+            print(f"  Error: {error_msg}")
@@ -0,0 +1,56 @@
+"""
+Machine-readable progress events for the UI and tooling
+The scanner and backup manager report what they are doing as small dicts;
+backup_saves.py --json-events prints them as JSON Lines and the backend
+forwards them to the UI as JSON-RPC notifications. Per-directory and per-file
+progress is rate-limited so reporting never slows the hot loops.
+"""
+
+import json
+import threading
+import time
+
+# Shortest gap between two progress events of the same kind, in seconds
+PROGRESS_INTERVAL = 0.2
+
+
+class EventStream:
+    """Sends events to a sink callable; without a sink every call is a no-op"""
+
+    def __init__(self, sink=None, interval=PROGRESS_INTERVAL):
+        self.sink = sink
+        self.interval = interval
+        self.started = time.monotonic()
+        self._next_due = {}
+        self._lock = threading.Lock()
+
+    def emit(self, event, **fields):
+        """Send one event, stamped with seconds since the stream started"""
+        if self.sink is None:
+            return
+        record = {'event': event, 'elapsed': round(time.monotonic() - self.started, 3)}
+        record.update(fields)
+        with self._lock:
+            self.sink(record)
+
+    def due(self, event):
+        """Whether a rate-limited progress event may be sent now
+
+        Callers check this before building the event, so a suppressed
+        event costs one clock read.
+        """
+        if self.sink is None:
+            return False
+        now = time.monotonic()
+        if now < self._next_due.get(event, 0.0):
+            return False
+        self._next_due[event] = now + self.interval
+        return True
+
+
+def json_lines(stream):
+    """Sink writing each event to stream as one JSON line"""
+    def write(record):
+        stream.write(json.dumps(record, default=str) + '\n')
+        stream.flush()
+    return write
@@ -0,0 +1,178 @@
+"""
+Restores snapshots to where their saves came from
+Every file goes back to the original path recorded in the snapshot manifest.
+Files are copied in parallel into a temporary file beside the destination,
+checked against the manifest hash and only then renamed over the live save,
+so a failed or damaged restore never replaces a good file.
+"""
+
+import hashlib
+import json
+import os
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from backup_manager import BackupManager
+from copy_engine import CopyEngine
+from fingerprint import CHUNK_SIZE, hash_file
+from progress_events import EventStream
+
+TEMP_SUFFIX = '.restore-tmp'
+
+
+class RestoreManager:
+    def __init__(self, config, verbose=False, workers=None, events=None):
+        self.config = config
+        self.verbose = verbose
+        self.events = events or EventStream()
+        self.backup_manager = BackupManager(config, verbose=verbose)
+        self.copy_engine = CopyEngine(workers=workers or config.copy_workers)
+
+    def restore(self, game_name, timestamp=None, target_dir=None, files=None):
+        """Put a snapshot's files back, returning what was restored, skipped and failed
+
+        timestamp defaults to the newest snapshot of the game. Files return
+        to their original paths unless target_dir is given, in which case
+        they keep their layout inside the snapshot. files optionally limits
+        the restore to those snapshot-relative paths.
+        """
+        entry = self.find_snapshot(game_name, timestamp)
+        try:
+            with open(entry['manifest']) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot read the manifest of {game_name} {entry['timestamp']}: {e}")
+
+        result = {
+            'game': game_name,
+            'timestamp': entry['timestamp'],
+            'storage': entry['storage'],
+            'restored': [],
+            'skipped': [],
+            'errors': [],
+            'bytes_restored': 0
+        }
+
+        # Manifests rebuilt for old snapshots may lack original paths that
+        # the backup log still has
+        originals = None
+        jobs = []
+        for file_entry in manifest['files']:
+            if files is not None and file_entry['path'] not in files:
+                continue
+            original = file_entry.get('original')
+            if target_dir is None and not original:
+                if originals is None:
+                    originals = self.backup_manager.log_store.originals(game_name, entry['timestamp'])
+                original = originals.get(file_entry['path'])
+            if target_dir is not None:
+                destination = Path(target_dir) / file_entry['path']
+            elif original:
+                destination = Path(original)
+            else:
+                result['errors'].append(f"No original location recorded for {file_entry['path']}; "
+                                        f"restore it to a target directory instead")
+                continue
+            jobs.append((entry, file_entry, destination))
+
+        self.events.emit('restore_started', game=game_name, timestamp=entry['timestamp'],
+                         files=len(jobs))
+        if self.verbose:
+            print(f"Restoring {len(jobs)} files for {game_name} from {entry['timestamp']}...")
+
+        for job, outcome, error in self.copy_engine.map(self._restore_file, jobs):
+            file_entry, destination = job[1], job[2]
+            if error is not None:
+                error_msg = f"Failed to restore {destination}: {error}"
+                result['errors'].append(error_msg)
+                if self.verbose:
+                    print(f"  Error: {error_msg}")
+            elif outcome == 'skipped':
+                result['skipped'].append(str(destination))
+                if self.verbose:
+                    print(f"  Unchanged: {destination}")
+            else:
+                result['restored'].append(str(destination))
+                result['bytes_restored'] += file_entry['size']
+                if self.verbose:
+                    print(f"  Restored: {destination}")
+
+            if self.events.due('restore_progress'):
+                self.events.emit('restore_progress', file=str(destination),
+                                 files_done=(len(result['restored']) + len(result['skipped'])
+                                             + len(result['errors'])),
+                                 files_total=len(jobs), bytes_restored=result['bytes_restored'])
+
+        self.events.emit('restore_finished', game=game_name, timestamp=entry['timestamp'],
+                         restored=len(result['restored']), skipped=len(result['skipped']),
+                         errors=len(result['errors']), bytes_restored=result['bytes_restored'])
+        return result
+
+    def find_snapshot(self, game_name, timestamp=None):
+        """Catalog entry of a game's snapshot, the newest one by default"""
+        entries = self.backup_manager.list_backups(game_name).get(game_name, [])
+        if not entries:
+            raise ValueError(f"No backups found for {game_name}")
+        if timestamp is None:
+            return entries[0]
+
+        for entry in entries:
+            if entry['timestamp'] == timestamp:
+                return entry
+        raise ValueError(f"No backup of {game_name} at {timestamp}")
+
+    def _restore_file(self, job):
+        """Restore one file through a verified temporary copy; runs on a copy worker"""
+        entry, file_entry, destination = job
+        if self._is_identical(destination, file_entry):
+            return 'skipped'
+
+        self.copy_engine.ensure_dir(destination.parent)
+        temp_path = destination.with_name(destination.name + TEMP_SUFFIX)
+        try:
+            digest = hashlib.blake2b(digest_size=32)
+            with self._open_source(entry, file_entry) as src, open(temp_path, 'wb') as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                dst.flush()
+                os.fsync(dst.fileno())
+
+            if file_entry.get('hash') and digest.hexdigest() != file_entry['hash']:
+                raise ValueError("backup copy does not match its recorded hash")
+            if file_entry.get('mtime_ns') is not None:
+                os.utime(temp_path, ns=(file_entry['mtime_ns'], file_entry['mtime_ns']))
+            os.replace(temp_path, destination)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return 'restored'
+
+    @contextmanager
+    def _open_source(self, entry, file_entry):
+        """Open a file's backed-up bytes in whichever storage holds them"""
+        if entry['storage'] == 'archive':
+            with zipfile.ZipFile(entry['path']) as archive, archive.open(file_entry['path']) as member:
+                yield member
+        elif entry['storage'] == 'store':
+            with open(self.backup_manager.store.object_path(file_entry['hash']), 'rb') as f:
+                yield f
+        else:
+            with open(Path(entry['path']) / file_entry['path'], 'rb') as f:
+                yield f
+
+    @staticmethod
+    def _is_identical(destination, file_entry):
+        """Whether the file in place already matches the backed-up one"""
+        try:
+            stat = os.stat(destination)
+        except OSError:
+            return False
+        if stat.st_size != file_entry['size']:
+            return False
+        if file_entry.get('mtime_ns') == stat.st_mtime_ns:
+            return True
+        return bool(file_entry.get('hash')) and hash_file(destination) == file_entry['hash']
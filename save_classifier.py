@@ -0,0 +1,199 @@
+"""
+Precompiled classification rules for save files and app folders
+Keyword lists are compiled into single regexes and extension lists into frozen
+sets once per process, shared by every classifier, so the per-file checks in
+the scanner stay cheap
+"""
+
+import hashlib
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+# File extensions that mark a likely save file
+SAVE_EXTENSIONS = frozenset({
+    '.sav', '.save', '.dat', '.json', '.xml', '.cfg', '.ini',
+    '.profile', '.plr', '.wld', '.ess', '.skse', '.fos'
+})
+
+# Filename fragments that mark a likely save file
+SAVE_KEYWORDS = (
+    'save', 'profile', 'user', 'player', 'game', 'world',
+    'character', 'progress', 'slot', 'checkpoint'
+)
+
+# Filename fragments of common non-save files
+EXCLUDED_NAME_PATTERNS = (
+    'log', 'cache', 'temp', 'crash', 'error', 'debug', 'config',
+    'settings', 'preferences', 'install', 'uninstall', 'update',
+    'readme', 'license', 'changelog', 'version', 'manifest'
+)
+
+# Extensions that are never saves
+EXCLUDED_EXTENSIONS = frozenset({
+    '.exe', '.dll', '.msi', '.bat', '.cmd', '.ps1', '.sh',
+    '.txt', '.md', '.html', '.css', '.js', '.py', '.cpp', '.h',
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.svg',
+    '.mp3', '.wav', '.ogg', '.mp4', '.avi', '.mkv', '.zip', '.rar'
+})
+
+# Strong save indicators in file and folder names
+STRONG_SAVE_INDICATORS = (
+    'save', 'profile', 'player', 'character', 'world', 'level',
+    'progress', 'checkpoint', 'slot', 'game'
+)
+
+# Game-like words in app folder names
+GAME_INDICATORS = (
+    'game', 'simulator', 'quest', 'world', 'craft', 'wars', 'legends',
+    'online', 'rpg', 'mmo', 'adventure', 'fantasy', 'racing', 'sports',
+    'strategy', 'action', 'shooter', 'puzzle', 'arcade', 'indie',
+    'emulator', 'launcher'
+)
+
+
+@lru_cache(maxsize=None)
+def compile_keywords(keywords):
+    """Compile a keyword family (a tuple or frozenset) into one regex matching any of
+    them as a substring"""
+    if not keywords:
+        return re.compile(r'(?!)')
+    return re.compile('|'.join(re.escape(keyword) for keyword in sorted(set(keywords))))
+
+
+def file_name(file_path):
+    """Final path component, as Path(file_path).name would give it"""
+    name = getattr(file_path, 'name', None)
+    if isinstance(name, str):
+        return name
+    return Path(file_path).name
+
+
+def path_suffix(name):
+    """Extension of a file name as Path(name).suffix sees it, without building a Path"""
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[i:]
+    return ''
+
+
+class SaveClassifier:
+    def __init__(self, config=None):
+        self.save_extensions = SAVE_EXTENSIONS
+        self.excluded_extensions = EXCLUDED_EXTENSIONS
+        self._save_keywords = compile_keywords(SAVE_KEYWORDS)
+        self._excluded_names = compile_keywords(EXCLUDED_NAME_PATTERNS)
+        self._strong_indicators = compile_keywords(STRONG_SAVE_INDICATORS)
+        self._game_indicators = compile_keywords(GAME_INDICATORS)
+
+        # Per-directory verdicts for strong save indicators in folder names
+        self._dir_verdicts = {}
+        self._app_verdicts = {}
+
+        self.config = config
+        if config is not None:
+            self._excluded_apps = frozenset(config.excluded_apps)
+            self._excluded_online = frozenset(config.excluded_online_games)
+            self._excluded_app_pattern = compile_keywords(self._excluded_apps)
+            self._excluded_online_pattern = compile_keywords(self._excluded_online)
+
+            # "name in any excluded entry" becomes one substring search over
+            # the entries joined by NUL, which never appears in a folder name
+            self._excluded_apps_joined = self._join(self._excluded_apps)
+            self._excluded_online_joined = self._join(self._excluded_online)
+            self._gaming_platforms = compile_keywords(frozenset(config.gaming_platforms))
+
+        self.fingerprint = self._compute_fingerprint()
+
+    def is_likely_save_file(self, file_path):
+        """Check if a file is likely a save file based on extension and name"""
+        name = file_name(file_path)
+        suffix = path_suffix(name).lower()
+        name_lower = name.lower()
+
+        # Skip obviously non-save files
+        if suffix in self.excluded_extensions or self._excluded_names.search(name_lower):
+            return False
+
+        if suffix in self.save_extensions:
+            return True
+
+        return self._save_keywords.search(name_lower) is not None
+
+    def is_excluded_file(self, file_path):
+        """Check if file should be excluded from save detection"""
+        name = file_name(file_path)
+        if path_suffix(name).lower() in self.excluded_extensions:
+            return True
+
+        return self._excluded_names.search(name.lower()) is not None
+
+    def is_excluded_app(self, app_name):
+        """Check if this is a known non-game application or online game"""
+        verdict = self._app_verdicts.get(app_name)
+        if verdict is None:
+            app_lower = app_name.lower()
+            verdict = bool(
+                self._excluded_app_pattern.search(app_lower) or
+                (self._excluded_apps_joined is not None and
+                 app_lower in self._excluded_apps_joined) or
+                self._excluded_online_pattern.search(app_lower) or
+                (self._excluded_online_joined is not None and
+                 app_lower in self._excluded_online_joined)
+            )
+            self._app_verdicts[app_name] = verdict
+        return verdict
+
+    def is_gaming_platform(self, app_name):
+        """Check if an app folder belongs to a known gaming platform"""
+        return self._gaming_platforms.search(app_name.lower()) is not None
+
+    def has_game_indicator(self, app_name):
+        """Check if an app folder name contains a game-like word"""
+        return self._game_indicators.search(app_name.lower()) is not None
+
+    def has_strong_save_indicators(self, file_path):
+        """Check if file has strong indicators of being a game save"""
+        path = os.fspath(file_path)
+        if self._strong_indicators.search(os.path.basename(path).lower()):
+            return True
+
+        return self._dir_has_indicator(os.path.dirname(path))
+
+    def _dir_has_indicator(self, directory):
+        """Whether a directory or any of its parents has a strong indicator name"""
+        verdict = self._dir_verdicts.get(directory)
+        if verdict is not None:
+            return verdict
+
+        # Walk up until a cached ancestor or the root, then fill in on the way down
+        chain = []
+        current = directory
+        while True:
+            chain.append(current)
+            parent = os.path.dirname(current)
+            if parent == current or parent in self._dir_verdicts:
+                break
+            current = parent
+
+        verdict = self._dir_verdicts.get(os.path.dirname(chain[-1]), False)
+        for path in reversed(chain):
+            if not verdict and self._strong_indicators.search(os.path.basename(path).lower()):
+                verdict = True
+            self._dir_verdicts[path] = verdict
+
+        return self._dir_verdicts[directory]
+
+    @staticmethod
+    def _join(entries):
+        """Join entries for substring search, or None when there are none"""
+        return '\0'.join(entries) if entries else None
+
+    def _compute_fingerprint(self):
+        """Stable hash of every rule, used to invalidate cached classifications"""
+        parts = [
+            sorted(self.save_extensions), sorted(self.excluded_extensions),
+            sorted(SAVE_KEYWORDS), sorted(EXCLUDED_NAME_PATTERNS),
+        ]
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
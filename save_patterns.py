@@ -1,52 +1,99 @@
 """
 Database of game save locations and patterns
-Contains knowledge base of where popular games store their save files
+Known games and their save folders live in save_patterns.json, loaded on
+first use. Paths use placeholders such as {APPDATA} or {DOCUMENTS} and may
+list extra folders per platform. Lookups go through indexes: names are
+matched by normalized name and word prefix, and save folders are resolved
+through a path trie, so a scan only touches the folders that exist. The
+expanded folders and trie can be kept in a marshal cache file, reused while
+the patterns file and the placeholder values it used are unchanged.
 """
 
+from bisect import bisect_left
 from pathlib import Path
+import json
+import marshal
 import os
+import re
+import string
+import sys
+from save_classifier import SaveClassifier
+
+PATTERNS_FILE = Path(__file__).parent / "save_patterns.json"
+
+# Placeholders are {NAME}; anything but the ones below is read from the environment
+PLACEHOLDER = re.compile(r'\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+# Folders with at most this many known children are checked with a stat per
+# child; folders with more are listed once instead
+STAT_LIMIT = 2
+
+PUNCTUATION = str.maketrans('', '', string.punctuation)
+
+# Bumped whenever the cached table's layout changes
+CACHE_VERSION = 1
+
+
+def normalize_name(name):
+    """Lowercase a game name and drop its punctuation, for comparing names"""
+    return ' '.join(name.lower().translate(PUNCTUATION).split())
+
+
+def platform_key():
+    """Name of the running platform as used in save_patterns.json"""
+    if sys.platform.startswith('win'):
+        return 'windows'
+    if sys.platform == 'darwin':
+        return 'darwin'
+    return 'linux'
+
 
 class SavePatterns:
-    def __init__(self):
-        self.user_profile = Path(os.environ.get('USERPROFILE', ''))
-        self.appdata = Path(os.environ.get('APPDATA', ''))
-        self.localappdata = Path(os.environ.get('LOCALAPPDATA', ''))
-        
-        # Known game save patterns
-        self.game_patterns = {
-            # Steam games
-            "The Witcher 3": [
-                self.user_profile / "Documents" / "The Witcher 3" / "gamesaves",
-            ],
-            "Skyrim": [
-                self.user_profile / "Documents" / "My Games" / "Skyrim" / "Saves",
-            ],
-            "Fallout 4": [
-                self.user_profile / "Documents" / "My Games" / "Fallout4" / "Saves",
-            ],
-            "Cyberpunk 2077": [
-                self.appdata / "CD Projekt Red" / "Cyberpunk 2077" / "UserData",
-            ],
-            
-            # Epic Games
-            "Fortnite": [
-                self.localappdata / "FortniteGame" / "Saved",
-            ],
-            
-            # GOG games
-            "Baldur's Gate 3": [
-                self.appdata / "Larian Studios" / "Baldur's Gate 3" / "PlayerProfiles",
-            ],
-            
-            # Indie games
-            "Stardew Valley": [
-                self.appdata / "StardewValley" / "Saves",
-            ],
-            "Terraria": [
-                self.user_profile / "Documents" / "My Games" / "Terraria" / "Players",
-                self.user_profile / "Documents" / "My Games" / "Terraria" / "Worlds",
-            ],
-        }
+    def __init__(self, patterns_file=None, environ=None, cache_file=None):
+        # environ stands in for os.environ, e.g. Config.environment() of another profile
+        environ = os.environ if environ is None else environ
+        self.user_profile = Path(environ.get('USERPROFILE', ''))
+        self.appdata = Path(environ.get('APPDATA', ''))
+        self.localappdata = Path(environ.get('LOCALAPPDATA', ''))
+        self.patterns_file = Path(patterns_file) if patterns_file else PATTERNS_FILE
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._classifier = None
+        
+        # Values for placeholders, captured now like the directories above
+        self.placeholders = dict(environ)
+        self.placeholders.update({
+            'USERPROFILE': environ.get('USERPROFILE', ''),
+            'APPDATA': environ.get('APPDATA', ''),
+            'LOCALAPPDATA': environ.get('LOCALAPPDATA', ''),
+            'DOCUMENTS': str(self.user_profile / "Documents") if environ.get('USERPROFILE') else '',
+            'HOME': environ.get('HOME') or environ.get('USERPROFILE', ''),
+        })
+        
+        # Loaded on first use: expanded folders per game, and a trie of
+        # their path components; the name indexes wait for the first lookup
+        self._folders = None
+        self._trie = None
+        self._order = None
+        self._game_patterns = None
+        self._names = None
+        self._word_index = None
+        # Placeholders looked up while expanding, and the values they had
+        self._used = {}
+    
+    @property
+    def classifier(self):
+        """Config-free SaveClassifier, built on first use"""
+        if self._classifier is None:
+            self._classifier = SaveClassifier()
+        return self._classifier
+    
+    @property
+    def game_patterns(self):
+        """{game name: [save folder paths]} for this platform, loaded on first use"""
+        if self._game_patterns is None:
+            self._game_patterns = {game_name: [Path(folder) for folder in folders]
+                                   for game_name, folders in self._load().items()}
+        return self._game_patterns
     
     def get_patterns_for_game(self, game_name):
         """Get save patterns for a specific game"""
@@ -56,47 +103,209 @@ class SavePatterns:
         """Get all known game save patterns"""
         return self.game_patterns
     
-    def is_likely_save_file(self, file_path):
-        """Check if a file is likely a save file based on extension and name"""
-        file_path = Path(file_path)
+    def find_games(self, game_filter):
+        """Known game names matching a --game filter
+        
+        An exact name (ignoring case and punctuation) wins; otherwise names
+        with a word starting with the filter, then names containing it.
+        """
+        folders = self._load()
+        if self._names is None:
+            self._index_names(folders)
+        key = normalize_name(game_filter)
+        if key in self._names:
+            return [self._names[key]]
         
-        # Skip obviously non-save files
-        if self._is_excluded_file(file_path):
-            return False
+        # Every word-start suffix of every name, sorted, serves prefix queries
+        matches = set()
+        start = bisect_left(self._word_index, (key,))
+        for suffix, game_name in self._word_index[start:]:
+            if not suffix.startswith(key):
+                break
+            matches.add(game_name)
+        if not matches:
+            matches = {game_name for game_name in folders
+                       if game_filter.lower() in game_name.lower()}
+        return sorted(matches, key=self._order.__getitem__)
+    
+    def existing_patterns(self, game_filter=None):
+        """{game name: [save folders that exist]} for known games with at least one
         
-        # Check extension
-        save_extensions = {'.sav', '.save', '.dat', '.json', '.xml', '.cfg', '.ini', 
-                          '.profile', '.plr', '.wld', '.ess', '.skse', '.fos'}
-        if file_path.suffix.lower() in save_extensions:
-            return True
+        Folders are resolved through a trie of path components, so folders
+        shared by many patterns are checked once and a missing folder rules
+        out everything below it.
+        """
+        folders = self._load()
+        if game_filter:
+            games = self.find_games(game_filter)
+            trie = self._build_trie({game_name: folders[game_name] for game_name in games})
+        else:
+            games = folders
+            trie = self._trie
         
-        # Check filename patterns
-        name_lower = file_path.name.lower()
-        save_keywords = ['save', 'profile', 'user', 'player', 'game', 'world', 
-                        'character', 'progress', 'slot', 'checkpoint']
+        found = set()
+        for anchor, node in trie.items():
+            self._resolve(anchor, node, found)
         
-        return any(keyword in name_lower for keyword in save_keywords)
+        existing = {}
+        for game_name in sorted({game_name for game_name, _ in found}, key=self._order.__getitem__):
+            existing[game_name] = [Path(folder) for folder in folders[game_name]
+                                   if (game_name, folder) in found]
+        return existing
+    
+    def is_likely_save_file(self, file_path):
+        """Check if a file is likely a save file based on extension and name"""
+        return self.classifier.is_likely_save_file(file_path)
     
     def _is_excluded_file(self, file_path):
         """Check if file should be excluded from save detection"""
-        name_lower = file_path.name.lower()
-        
-        # Exclude common non-save files
-        excluded_patterns = [
-            'log', 'cache', 'temp', 'crash', 'error', 'debug', 'config',
-            'settings', 'preferences', 'install', 'uninstall', 'update',
-            'readme', 'license', 'changelog', 'version', 'manifest'
-        ]
-        
-        # Exclude by extension
-        excluded_extensions = {
-            '.exe', '.dll', '.msi', '.bat', '.cmd', '.ps1', '.sh',
-            '.txt', '.md', '.html', '.css', '.js', '.py', '.cpp', '.h',
-            '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.svg',
-            '.mp3', '.wav', '.ogg', '.mp4', '.avi', '.mkv', '.zip', '.rar'
-        }
-        
-        if file_path.suffix.lower() in excluded_extensions:
-            return True
-        
-        return any(pattern in name_lower for pattern in excluded_patterns)
\ No newline at end of file
+        return self.classifier.is_excluded_file(file_path)
+    
+    def _load(self):
+        """Read the patterns file once, returning {game name: [expanded folders]}"""
+        if self._folders is not None:
+            return self._folders
+        
+        cached = self._read_cache()
+        if cached is not None:
+            self._folders, self._trie = cached
+            self._order = {game_name: i for i, game_name in enumerate(self._folders)}
+            return self._folders
+        
+        with open(self.patterns_file, encoding='utf-8') as f:
+            data = json.load(f)
+        
+        platform = platform_key()
+        folders = {}
+        for game_name, entry in data['games'].items():
+            paths = entry.get('paths', [])
+            variants = entry.get('platforms')
+            if variants and variants.get(platform):
+                paths = paths + variants[platform]
+            expanded = []
+            for path in paths:
+                folder = self._expand(path)
+                if folder is not None and folder not in expanded:
+                    expanded.append(folder)
+            folders[game_name] = expanded
+        
+        self._trie = self._build_trie(folders)
+        self._order = {game_name: i for i, game_name in enumerate(folders)}
+        self._folders = folders
+        self._write_cache()
+        return folders
+    
+    def _source_key(self):
+        """What the cached table was built from: patterns file, its size and mtime, platform"""
+        stat = os.stat(self.patterns_file)
+        return [os.fspath(self.patterns_file), stat.st_size, stat.st_mtime_ns, platform_key()]
+    
+    def _read_cache(self):
+        """(folders, trie) from the cache file, or None if it is missing or stale"""
+        if self.cache_file is None:
+            return None
+        try:
+            # One read: marshal.load() on a file reads it a few bytes at a time
+            with open(self.cache_file, 'rb') as f:
+                cached = marshal.loads(f.read())
+            if (cached['version'] != CACHE_VERSION or cached['source'] != self._source_key() or
+                    any(self.placeholders.get(name) != value
+                        for name, value in cached['placeholders'].items())):
+                return None
+            return cached['folders'], cached['trie']
+        except (OSError, EOFError, ValueError, TypeError, KeyError):
+            return None
+    
+    def _write_cache(self):
+        """Save the expanded table for the next run; a failure only costs the speed-up"""
+        if self.cache_file is None:
+            return
+        temp_path = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(marshal.dumps({
+                    'version': CACHE_VERSION,
+                    'source': self._source_key(),
+                    'placeholders': self._used,
+                    'folders': self._folders,
+                    'trie': self._trie,
+                }))
+            os.replace(temp_path, self.cache_file)
+        except (OSError, ValueError):
+            pass
+    
+    def _index_names(self, folders):
+        """Index game names by normalized name and by every word-start suffix"""
+        self._names = {}
+        word_index = []
+        for game_name in folders:
+            key = normalize_name(game_name)
+            self._names.setdefault(key, game_name)
+            words = key.split(' ')
+            for i in range(len(words)):
+                word_index.append((' '.join(words[i:]), game_name))
+        word_index.sort()
+        self._word_index = word_index
+    
+    @staticmethod
+    def _build_trie(folders):
+        """Nest folders by path component; None keys list the (game, folder) pairs ending there"""
+        trie = {}
+        nodes = {}
+        
+        def node_for(key):
+            node = nodes.get(key)
+            if node is None:
+                parent, name = os.path.split(key)
+                if parent == key:
+                    node = trie.setdefault(key, {})
+                else:
+                    node = node_for(parent).setdefault(name, {})
+                nodes[key] = node
+            return node
+        
+        for game_name, game_folders in folders.items():
+            for folder in game_folders:
+                node_for(os.path.normcase(folder)).setdefault(None, []).append((game_name, folder))
+        return trie
+    
+    def _expand(self, path):
+        """Fill in a path's placeholders, or None if one of them is unset"""
+        missing = False
+        
+        def value(match):
+            nonlocal missing
+            resolved = self.placeholders.get(match.group(1))
+            self._used[match.group(1)] = resolved
+            if not resolved:
+                missing = True
+                return ''
+            return resolved
+        
+        expanded = PLACEHOLDER.sub(value, path)
+        if missing or not os.path.isabs(expanded):
+            return None
+        return os.path.normpath(expanded)
+    
+    def _resolve(self, directory, node, found):
+        """Mark every pattern in a trie node that exists below directory"""
+        for game_name, pattern in node.get(None, ()):
+            found.add((game_name, pattern))
+        
+        children = len(node) - (None in node)
+        if not children:
+            return
+        if children <= STAT_LIMIT:
+            present = [name for name in node
+                       if name is not None and os.path.isdir(os.path.join(directory, name))]
+        else:
+            try:
+                with os.scandir(directory) as entries:
+                    listed = [os.path.normcase(entry.name) for entry in entries if entry.is_dir()]
+            except OSError:
+                return
+            present = [name for name in listed if name in node]
+        
+        for name in present:
+            self._resolve(os.path.join(directory, name), node[name], found)
@@ -0,0 +1,263 @@
+"""
+Compact, column-oriented lists of save files
+A scan can turn up hundreds of thousands of candidate files, and a Path or a
+dict per file costs far more than the file's name. A SaveSet stores each
+directory once in a DirectoryTable and every file as an index into it plus its
+basename; BackupRecords keeps a snapshot's manifest entries the same
+way, with sizes, mtimes, hashes and flags in array columns. Paths and entry
+dicts are only built, one at a time, when something reads them.
+"""
+
+import os
+from array import array
+from pathlib import Path
+
+HASH_SIZE = 32
+
+
+class DirectoryTable:
+    """Directory strings stored once each and referred to by index"""
+
+    __slots__ = ('dirs', 'ids')
+
+    def __init__(self):
+        self.dirs = []
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.dirs)
+
+    def intern(self, directory):
+        """Index of a directory, adding it on first sight"""
+        index = self.ids.get(directory)
+        if index is None:
+            index = self.ids[directory] = len(self.dirs)
+            self.dirs.append(directory)
+        return index
+
+
+class SaveSet:
+    """An ordered list of file paths, read back as Path objects
+
+    Sets sharing a DirectoryTable share its directory strings, and extend()
+    between them only copies integers.
+    """
+
+    __slots__ = ('table', 'dir_ids', 'names')
+
+    def __init__(self, paths=(), table=None):
+        self.table = table if table is not None else DirectoryTable()
+        self.dir_ids = array('I')
+        self.names = []
+        for path in paths:
+            self.add(path)
+
+    def add(self, path):
+        """Append one file path"""
+        directory, name = os.path.split(os.fspath(path))
+        self.add_name(self.table.intern(directory), name)
+
+    def add_name(self, dir_id, name):
+        """Append a file by its directory's index in the table and its name"""
+        self.dir_ids.append(dir_id)
+        self.names.append(name)
+
+    def extend(self, other):
+        """Append every file of another SaveSet"""
+        if other.table is self.table:
+            self.dir_ids.extend(other.dir_ids)
+        else:
+            # Each directory of the other table is looked up once
+            remap = {}
+            for dir_id in other.dir_ids:
+                mapped = remap.get(dir_id)
+                if mapped is None:
+                    mapped = remap[dir_id] = self.table.intern(other.table.dirs[dir_id])
+                self.dir_ids.append(mapped)
+        self.names.extend(other.names)
+
+    def path(self, index):
+        """One file's path as a string"""
+        return os.path.join(self.table.dirs[self.dir_ids[index]], self.names[index])
+
+    def paths(self):
+        """Every file's path as a string, without building Path objects"""
+        dirs = self.table.dirs
+        for dir_id, name in zip(self.dir_ids, self.names):
+            yield os.path.join(dirs[dir_id], name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        return Path(self.path(index))
+
+    def __iter__(self):
+        # Consecutive files mostly share a directory, so its Path is reused
+        dirs = self.table.dirs
+        last_id = None
+        directory = None
+        for dir_id, name in zip(self.dir_ids, self.names):
+            if dir_id != last_id:
+                last_id = dir_id
+                directory = Path(dirs[dir_id])
+            yield directory / name
+
+    def __eq__(self, other):
+        if not isinstance(other, SaveSet):
+            return NotImplemented
+        return len(self) == len(other) and list(self.paths()) == list(other.paths())
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"SaveSet({len(self)} files)"
+
+
+class BackupRecords:
+    """A snapshot's manifest entries in columns
+
+    Entries go in and come out as the dicts stored in manifests (path,
+    original, size, mtime_ns, hash, reused). Manifest paths are split on '/'
+    into the same DirectoryTable as the originals; hashes are kept as raw
+    digests.
+    """
+
+    __slots__ = ('originals', 'path_dirs', 'path_names', 'sizes', 'mtimes',
+                 'hashes', 'other_hashes', 'reused')
+
+    def __init__(self, table=None):
+        self.originals = SaveSet(table=table)
+        self.path_dirs = array('I')
+        self.path_names = []
+        self.sizes = array('q')
+        self.mtimes = array('q')
+        self.hashes = bytearray()
+        # Hashes that are missing or not a hex digest of HASH_SIZE bytes, by index
+        self.other_hashes = {}
+        self.reused = array('b')
+
+    def append(self, entry):
+        """Add one manifest entry"""
+        index = len(self.sizes)
+        self.originals.add(entry['original'] or '')
+        directory, _, name = entry['path'].rpartition('/')
+        self.path_dirs.append(self.originals.table.intern(directory))
+        self.path_names.append(name)
+        self.sizes.append(entry['size'])
+        mtime_ns = entry.get('mtime_ns')
+        self.mtimes.append(-1 if mtime_ns is None else mtime_ns)
+        self.reused.append(bool(entry.get('reused')))
+
+        digest = entry.get('hash')
+        try:
+            raw = bytes.fromhex(digest)
+        except (TypeError, ValueError):
+            raw = None
+        if raw is None or len(raw) != HASH_SIZE:
+            self.other_hashes[index] = digest
+            raw = bytes(HASH_SIZE)
+        self.hashes += raw
+
+    def path(self, index):
+        """An entry's path inside the snapshot, '/'-separated"""
+        directory = self.originals.table.dirs[self.path_dirs[index]]
+        name = self.path_names[index]
+        return f"{directory}/{name}" if directory else name
+
+    def original(self, index):
+        """An entry's original location, or None if none was recorded"""
+        return self.originals.path(index) or None
+
+    def hash(self, index):
+        """An entry's hash as hex"""
+        if index in self.other_hashes:
+            return self.other_hashes[index]
+        return self.hashes[index * HASH_SIZE:(index + 1) * HASH_SIZE].hex()
+
+    def total_bytes(self):
+        """Sum of the entries' sizes"""
+        return sum(self.sizes)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        mtime_ns = self.mtimes[index]
+        return {
+            'path': self.path(index),
+            'original': self.original(index),
+            'size': self.sizes[index],
+            'mtime_ns': None if mtime_ns == -1 else mtime_ns,
+            'hash': self.hash(index),
+            'reused': bool(self.reused[index])
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self):
+        return f"BackupRecords({len(self)} files)"
+
+
+class BackedUpFiles:
+    """The backup log's view of a snapshot's files, built on its BackupRecords
+
+    Each file reads back as {'original', 'backup', 'size', 'reused'}, where
+    backup is the file inside backup_dir, or the object path of its hash for
+    store snapshots.
+    """
+
+    __slots__ = ('records', 'backup_dir', 'object_path')
+
+    def __init__(self, records, backup_dir=None, object_path=None):
+        self.records = records
+        self.backup_dir = None if backup_dir is None else str(backup_dir)
+        self.object_path = object_path
+
+    def backup(self, index):
+        """Where one file's backed-up copy lives"""
+        if self.object_path is not None:
+            return str(self.object_path(self.records.hash(index)))
+        return os.path.join(self.backup_dir, os.path.normpath(self.records.path(index)))
+
+    def log_rows(self):
+        """(relative, rows) for the log: rows are [original, backup, size, reused], and
+        backup is relative to backup_dir when relative is True"""
+        records = self.records
+        if self.object_path is not None:
+            rows = ([records.original(index), self.backup(index), records.sizes[index],
+                     bool(records.reused[index])] for index in range(len(records)))
+            return False, rows
+        rows = ([records.original(index), os.path.normpath(records.path(index)),
+                 records.sizes[index], bool(records.reused[index])]
+                for index in range(len(records)))
+        return True, rows
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        records = self.records
+        if index < 0:
+            index += len(records)
+        if not 0 <= index < len(records):
+            raise IndexError(index)
+        return {
+            'original': records.original(index),
+            'backup': self.backup(index),
+            'size': records.sizes[index],
+            'reused': bool(records.reused[index])
+        }
+
+    def __iter__(self):
+        for index in range(len(self.records)):
+            yield self[index]
+
+    def __repr__(self):
+        return f"BackedUpFiles({len(self)} files)"
@@ -0,0 +1,269 @@
+"""
+Watch mode that backs up saves as games write them
+Only the folders holding found saves are watched, through filesystem
+notifications when watchdog is installed and by polling their listings
+otherwise. Bursts of writes are debounced per game, and a game is backed up
+only once one of its save files differs from its last snapshot. The full scan
+runs once at start; after that only the folders of games that changed are
+listed again.
+"""
+
+import json
+import os
+import threading
+import time
+
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+# Longest single wait, so Ctrl+C is still noticed promptly on Windows
+MAX_WAIT = 1.0
+
+
+class SaveWatcher:
+    def __init__(self, config, scanner, backup_manager, verbose=False, game_filter=None,
+                 debounce=None, poll_interval=None, use_notifications=True):
+        self.config = config
+        self.scanner = scanner
+        self.backup_manager = backup_manager
+        self.verbose = verbose
+        self.game_filter = game_filter
+        self.debounce = config.watch_debounce if debounce is None else debounce
+        self.poll_interval = config.watch_poll_interval if poll_interval is None else poll_interval
+
+        self.dir_games = {}   # watched folder -> games with saves in it
+        self.saves = {}       # game -> paths of its save files, as last found
+        self.listings = {}    # watched folder -> listing last seen by poll()
+        self.backed_up = {}   # game -> {save path: (mtime_ns, size)} at its last snapshot
+        self.pending = {}     # game -> time of its latest change
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._observer = Observer() if use_notifications and Observer is not None else None
+
+    def run(self):
+        """Watch and back up until stop() is called or Ctrl+C is pressed"""
+        found_saves = self.start()
+        mode = ("filesystem notifications" if self._observer
+                else f"polling every {self.poll_interval:g}s")
+        print(f"Watching {len(self.dir_games)} folders for {len(found_saves)} games ({mode}).")
+        print("Press Ctrl+C to stop.")
+
+        if self._observer:
+            self._observer.start()
+        try:
+            while not self._stop.is_set():
+                self.step()
+                self._wait()
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+        finally:
+            if self._observer:
+                self._observer.stop()
+                self._observer.join()
+
+    def stop(self):
+        """Ask run() to return"""
+        self._stop.set()
+        self._wake.set()
+
+    def start(self):
+        """Scan once, load each game's last snapshot and queue games changed since"""
+        found_saves = self.refresh()
+
+        for game_name, entries in self.backup_manager.list_backups().items():
+            if game_name in found_saves:
+                self.backed_up[game_name] = self._load_snapshot(entries[0])
+
+        # Anything saved while nothing was watching is backed up straight away
+        now = time.monotonic()
+        for game_name, saves in found_saves.items():
+            if self._signature(saves) != self.backed_up.get(game_name):
+                self.pending[game_name] = now - self.debounce
+
+        return found_saves
+
+    def step(self, now=None):
+        """Poll if needed, then back up games quiet for the debounce period"""
+        now = time.monotonic() if now is None else now
+        if self._observer is None:
+            for directory in self.poll():
+                self._changed(directory, now)
+        return self.flush(now)
+
+    def poll(self):
+        """Re-list every watched folder, returning those whose contents changed"""
+        changed = []
+        for directory in list(self.dir_games):
+            listing = self._listing(directory)
+            if listing != self.listings.get(directory):
+                self.listings[directory] = listing
+                changed.append(directory)
+        return changed
+
+    def flush(self, now):
+        """Back up every pending game whose saves changed, returning the log or None"""
+        with self._lock:
+            due = [game_name for game_name, changed_at in self.pending.items()
+                   if now - changed_at >= self.debounce]
+            for game_name in due:
+                del self.pending[game_name]
+        if not due:
+            return None
+
+        # Only the changed games' folders are listed again, which also picks
+        # up save files added to them
+        found_saves = self.rescan(due)
+        changed = {}
+        signatures = {}
+        for game_name in due:
+            saves = found_saves.get(game_name)
+            if not saves:
+                continue
+            signature = self._signature(saves)
+            if signature != self.backed_up.get(game_name):
+                changed[game_name] = saves
+                signatures[game_name] = signature
+            elif self.verbose:
+                print(f"  {game_name}: no save files changed")
+        if not changed:
+            return None
+
+        # Unchanged files are reused from the previous snapshot, so only the
+        # changed ones are copied
+        backup_log = self.backup_manager.backup_saves(changed)
+        self.backed_up.update(signatures)
+
+        clock = time.strftime('%H:%M:%S')
+        for game_name, game_log in backup_log['games_backed_up'].items():
+            print(f"[{clock}] Backed up {game_name}: {game_log['count']} save files")
+        if backup_log['files_reused']:
+            print(f"  {backup_log['files_copied']} copied, {backup_log['files_reused']} unchanged")
+        for error in backup_log['errors']:
+            print(f"  Warning: {error}")
+
+        return backup_log
+
+    def refresh(self):
+        """Scan for saves and watch the folders holding them"""
+        found_saves = {
+            game_name: saves
+            for game_name, saves in self.scanner.scan_for_saves(game_filter=self.game_filter).items()
+            if not self.game_filter or self.game_filter.lower() in game_name.lower()
+        }
+
+        dir_games = {}
+        for game_name, saves in found_saves.items():
+            self.saves[game_name] = {str(save_file) for save_file in saves}
+            for save_file in saves:
+                dir_games.setdefault(os.path.dirname(save_file), set()).add(game_name)
+
+        with self._lock:
+            previous = self.dir_games
+            self.dir_games = dir_games
+
+        for directory in dir_games:
+            if directory not in self.listings:
+                self.listings[directory] = self._listing(directory)
+        for directory in set(self.listings) - set(dir_games):
+            del self.listings[directory]
+
+        if self._observer and set(dir_games) != set(previous):
+            self._observer.unschedule_all()
+            for directory in dir_games:
+                if os.path.isdir(directory):
+                    self._observer.schedule(self, directory, recursive=False)
+
+        return found_saves
+
+    def rescan(self, games):
+        """List the watched folders of the given games again, returning their saves
+
+        New files in a folder only count for the game when no other game
+        has saves in that folder, since the scan decides who owns those.
+        """
+        with self._lock:
+            dir_games = dict(self.dir_games)
+
+        found_saves = {}
+        for game_name in games:
+            known = self.saves.get(game_name, set())
+            saves = []
+            for directory, owners in dir_games.items():
+                if game_name not in owners:
+                    continue
+                files = self.scanner.list_saves([directory])
+                if len(owners) > 1:
+                    files = [save_file for save_file in files if str(save_file) in known]
+                saves.extend(files)
+            found_saves[game_name] = saves
+            self.saves[game_name] = {str(save_file) for save_file in saves}
+        return found_saves
+
+    def dispatch(self, event):
+        """watchdog callback: queue the games whose folders saw the event"""
+        now = time.monotonic()
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if path:
+                self._changed(os.path.dirname(os.fsdecode(path)), now)
+        self._wake.set()
+
+    def _changed(self, directory, now):
+        """Restart the debounce period of every game with saves in directory"""
+        with self._lock:
+            for game_name in self.dir_games.get(directory, ()):
+                self.pending[game_name] = now
+
+    def _wait(self):
+        """Sleep until the next poll, the next debounce deadline or a notification"""
+        with self._lock:
+            first_change = min(self.pending.values(), default=None)
+
+        timeout = MAX_WAIT if self._observer else self.poll_interval
+        if first_change is not None:
+            timeout = min(timeout, max(0.0, first_change + self.debounce - time.monotonic()))
+        self._wake.wait(timeout)
+        self._wake.clear()
+
+    def _load_snapshot(self, entry):
+        """Signature of a catalogued snapshot, read from its manifest"""
+        try:
+            with open(entry['manifest'], encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            if self.verbose:
+                print(f"  Warning: Could not read manifest {entry['manifest']}: {e}")
+            return None
+        return {file_entry['original']: (file_entry['mtime_ns'], file_entry['size'])
+                for file_entry in manifest['files']}
+
+    @staticmethod
+    def _signature(saves):
+        """{save path: (mtime_ns, size)} for the save files that still exist"""
+        signature = {}
+        for save_file in saves:
+            try:
+                stat = os.stat(save_file)
+            except OSError:
+                continue
+            signature[str(save_file)] = (stat.st_mtime_ns, stat.st_size)
+        return signature
+
+    @staticmethod
+    def _listing(directory):
+        """Names, mtimes and sizes of a folder's files, plus its subfolder names"""
+        listing = set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        listing.add((entry.name, None, None))
+                    else:
+                        stat = entry.stat(follow_symlinks=False)
+                        listing.add((entry.name, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            pass
+        return frozenset(listing)
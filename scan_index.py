@@ -0,0 +1,179 @@
+"""
+Persistent scan index so repeat scans only re-list directories that changed
+Stores each directory's mtime, its subdirectories and its candidate save files
+"""
+
+import os
+import sqlite3
+
+
+class IndexedEntry:
+    """Lightweight stand-in for os.DirEntry served from the index"""
+    __slots__ = ('name', 'path', 'size', 'mtime_ns')
+
+    def __init__(self, dirpath, name, size=None, mtime_ns=None):
+        self.name = name
+        self.path = os.path.join(dirpath, name)
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+
+class ScanIndex:
+    SCHEMA_VERSION = '1'
+
+    def __init__(self, index_path, rules_fingerprint, verbose=False):
+        self.index_path = index_path
+        self.rules_fingerprint = rules_fingerprint
+        self.verbose = verbose
+
+        self._dirs = {}      # dirpath -> (mtime_ns, subdir names, candidate files)
+        self._decoded = {}   # dirpath -> (row, entries) kept warm between scans
+        self._changed = {}
+        self._seen = set()
+        self._loaded = False
+
+    def load(self):
+        """Load the index from disk, discarding it if the rules changed"""
+        if self._loaded:
+            return
+
+        self._loaded = True
+        if not os.path.exists(self.index_path):
+            return
+
+        try:
+            conn = self._connect()
+            try:
+                meta = dict(conn.execute("SELECT key, value FROM meta"))
+                if (meta.get('schema') != self.SCHEMA_VERSION or
+                        meta.get('rules') != self.rules_fingerprint):
+                    if self.verbose:
+                        print("  Scan index is out of date, rebuilding")
+                    return
+
+                for path, mtime_ns, subdirs, files in conn.execute(
+                        "SELECT path, mtime_ns, subdirs, files FROM dirs"):
+                    self._dirs[path] = (mtime_ns, subdirs, files)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            if self.verbose:
+                print(f"  Warning: Could not read scan index: {e}")
+            self._dirs = {}
+
+    def clear(self):
+        """Forget every cached listing so the next scan walks everything"""
+        self._loaded = True
+        self._dirs = {}
+        self._decoded = {}
+        self._changed = {}
+
+    def lookup(self, dirpath):
+        """Check a directory against the index
+
+        Returns (mtime_ns, listing). listing is the cached (subdirs, save_files)
+        pair of IndexedEntry lists when the directory's mtime is unchanged, or
+        None when it is new or changed and must be listed again. mtime_ns is
+        None when the directory cannot be stat'ed.
+        """
+        self._seen.add(dirpath)
+
+        try:
+            mtime_ns = os.stat(dirpath).st_mtime_ns
+        except OSError:
+            return None, None
+
+        cached = self._dirs.get(dirpath)
+        if cached is None or cached[0] != mtime_ns:
+            return mtime_ns, None
+
+        # Rows are decoded once per process; callers get copies they may prune
+        decoded = self._decoded.get(dirpath)
+        if decoded is None or decoded[0] is not cached:
+            _, subdirs, files = cached
+            decoded = (cached, self._decode(dirpath, subdirs, files))
+            self._decoded[dirpath] = decoded
+
+        subdir_entries, file_entries = decoded[1]
+        return mtime_ns, (list(subdir_entries), list(file_entries))
+
+    def record(self, dirpath, mtime_ns, subdirs, save_files):
+        """Store a fresh listing of a directory and its classified save files"""
+        self._seen.add(dirpath)
+        subdir_names = '\0'.join(entry.name for entry in subdirs)
+
+        # Files are stored as flat name/size/mtime triples; names never hold NUL
+        file_fields = []
+        for entry in save_files:
+            try:
+                stat = entry.stat()
+                file_fields.extend((entry.name, str(stat.st_size), str(stat.st_mtime_ns)))
+            except OSError:
+                file_fields.extend((entry.name, '', ''))
+
+        row = (mtime_ns, subdir_names, '\0'.join(file_fields))
+        self._dirs[dirpath] = row
+        self._changed[dirpath] = row
+
+    def save(self):
+        """Write changed directories back and drop ones no longer visited"""
+        removed = [path for path in self._dirs if path not in self._seen]
+        for path in removed:
+            del self._dirs[path]
+            self._decoded.pop(path, None)
+
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            conn = self._connect()
+            try:
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)",
+                             (self.SCHEMA_VERSION,))
+                stored_rules = conn.execute(
+                    "SELECT value FROM meta WHERE key = 'rules'").fetchone()
+                if stored_rules is None or stored_rules[0] != self.rules_fingerprint:
+                    conn.execute("DELETE FROM dirs")
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('rules', ?)",
+                                 (self.rules_fingerprint,))
+                    changed = self._dirs
+                else:
+                    changed = self._changed
+                    conn.executemany("DELETE FROM dirs WHERE path = ?",
+                                     ((path,) for path in removed))
+
+                conn.executemany(
+                    "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?)",
+                    ((path, *row) for path, row in changed.items()))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            if self.verbose:
+                print(f"  Warning: Could not save scan index: {e}")
+
+        self._changed = {}
+        self._seen = set()
+
+    def _connect(self):
+        """Open the index database, creating tables on first use"""
+        conn = sqlite3.connect(self.index_path)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS dirs ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER, subdirs TEXT, files TEXT)")
+        return conn
+
+    @staticmethod
+    def _decode(dirpath, subdirs, files):
+        """Turn stored rows back into entry objects"""
+        subdir_entries = [IndexedEntry(dirpath, name) for name in subdirs.split('\0') if name]
+
+        file_entries = []
+        fields = files.split('\0') if files else []
+        for i in range(0, len(fields), 3):
+            name, size, mtime_ns = fields[i:i + 3]
+            file_entries.append(IndexedEntry(
+                dirpath, name,
+                int(size) if size else None,
+                int(mtime_ns) if mtime_ns else None))
+
+        return subdir_entries, file_entries
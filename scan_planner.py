@@ -0,0 +1,259 @@
+"""
+Plans scans so overlapping roots are walked only once
+Known game save folders and scan locations are merged into a minimal set of
+disjoint walks, and every discovered file is routed to each target claiming it
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from save_set import DirectoryTable, SaveSet
+
+
+def path_key(path):
+    """Normalized key used to compare paths for containment"""
+    return os.path.normcase(os.path.abspath(os.fspath(path)))
+
+
+class ScanPlanner:
+    def __init__(self, known_patterns, scan_locations, verbose=False):
+        self.verbose = verbose
+
+        # Targets rooted at each directory key
+        self.known_targets = {}      # key -> [(game_name, pattern_index)]
+        self.location_targets = {}   # key -> [location_index]
+        self.paths = {}              # key -> original path
+        self.game_order = list(known_patterns)
+
+        for game_name, patterns in known_patterns.items():
+            for pattern_index, pattern_path in enumerate(patterns):
+                key = path_key(pattern_path)
+                self.known_targets.setdefault(key, []).append((game_name, pattern_index))
+                self.paths.setdefault(key, pattern_path)
+
+        for location_index, location in enumerate(scan_locations):
+            key = path_key(location)
+            self.location_targets.setdefault(key, []).append(location_index)
+            self.paths.setdefault(key, location)
+
+        # Every ancestor of a target must be descended into even if unclaimed
+        self.target_ancestors = set()
+        for key in self.paths:
+            parent = os.path.dirname(key)
+            while parent not in self.target_ancestors and parent != key:
+                self.target_ancestors.add(parent)
+                key, parent = parent, os.path.dirname(parent)
+
+    def plan(self):
+        """Return the minimal list of existing, disjoint roots to walk"""
+        roots = []
+        for key in sorted(self.paths, key=lambda k: (k.count(os.sep), k)):
+            if any(self._is_within(key, root) for root in roots):
+                continue
+            if os.path.isdir(key):
+                roots.append(key)
+        return roots
+
+    def iter_segments(self, walker, is_save_file, is_excluded_app, jobs=1, stats=None,
+                      events=None):
+        """Walk the planned roots, yielding ScanResults segments in listing order
+
+        The directories leading to scan targets are listed up front on the
+        calling thread; every other claimed subtree (typically one app folder)
+        becomes a task. With jobs > 1 tasks run on a thread pool, at most
+        2 * jobs of them ahead of the segment being yielded, so finished
+        subtrees never pile up while the consumer is busy; otherwise each
+        runs lazily when its segment is reached. Either way segments arrive
+        in the same order, and each segment's completed list names the
+        targets whose whole tree has been walked by the time it is yielded.
+
+        With stats (a ScanStats), each root's time and counters are recorded,
+        along with those of every subtree walked as a separate task. With
+        events (an EventStream), root_started and rate-limited scan_progress
+        events are sent as segments are yielded.
+        """
+        segments = []
+        segment_roots = []
+        executor = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+
+        try:
+            for root in self.plan():
+                root_path = os.fspath(self.paths[root])
+                before = walker.counts()
+                start = time.perf_counter()
+                self._walk_structure(root_path, root, (), (), walker,
+                                     is_save_file, is_excluded_app, segments)
+                if stats is not None:
+                    counts = walker.counts()
+                    stats.add_walk(root_path, time.perf_counter() - start,
+                                   {counter: counts[counter] - before[counter] for counter in counts})
+                segment_roots.extend([root_path] * (len(segments) - len(segment_roots)))
+
+            current_root = None
+            submitted = 0
+            running = 0
+            for index, root_path in enumerate(segment_roots):
+                if executor is not None:
+                    # Start tasks up to the window, and always the one needed now
+                    while submitted < len(segments) and (running < 2 * jobs or submitted <= index):
+                        task = segments[submitted]
+                        if isinstance(task, _DeferredCall):
+                            segments[submitted] = executor.submit(task.fn, *task.args)
+                            running += 1
+                        submitted += 1
+
+                # Yielded segments are not kept
+                segment, segments[index] = segments[index], None
+                if events is not None and root_path != current_root:
+                    current_root = root_path
+                    events.emit('root_started', path=root_path)
+                if not isinstance(segment, ScanResults):
+                    if executor is not None:
+                        running -= 1
+                    segment, task_walker, seconds, dirpath = segment.result()
+                    walker.add_counts(task_walker)
+                    if stats is not None:
+                        stats.add_walk(root_path, seconds, task_walker.counts(), app=dirpath)
+                if events is not None and events.due('scan_progress'):
+                    events.emit('scan_progress', dirs=walker.dirs_visited + walker.dirs_cached,
+                                files=walker.files_seen, saves=walker.files_matched)
+                yield segment
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def _walk_structure(self, dirpath, key, claims, started, walker, is_save_file,
+                        is_excluded_app, segments):
+        """List directories on the way to scan targets and farm out the rest"""
+        started += tuple(('known', target) for target in self.known_targets.get(key, ()))
+        listing = walker.list_classified(dirpath, is_save_file)
+
+        if listing is not None:
+            subdirs, files = listing
+            results = ScanResults()
+            segments.append(results)
+            children = self._route(key, claims, subdirs, files, is_excluded_app, results)
+
+            for entry, child_key, child_claims, child_started in children:
+                if child_key in self.target_ancestors or child_key in self.paths:
+                    self._walk_structure(entry.path, child_key, child_claims, child_started,
+                                         walker, is_save_file, is_excluded_app, segments)
+                else:
+                    # Started once iter_segments gets near it
+                    segments.append(_DeferredCall(
+                        self._walk_task, (entry.path, child_key, child_claims, child_started,
+                                          walker, is_save_file, is_excluded_app)))
+
+        # Everything below this directory has been queued ahead of this marker
+        if started:
+            marker = ScanResults()
+            marker.completed.extend(started)
+            segments.append(marker)
+
+    def _walk_task(self, dirpath, key, claims, started, walker, is_save_file, is_excluded_app):
+        """Walk one subtree with its own walker and results, timing it"""
+        start = time.perf_counter()
+        task_walker = walker.fork()
+        results = ScanResults()
+        self._walk_tree(dirpath, key, claims, task_walker, is_save_file, is_excluded_app, results)
+        results.completed.extend(started)
+        return results, task_walker, time.perf_counter() - start, dirpath
+
+    def _walk_tree(self, dirpath, key, claims, walker, is_save_file, is_excluded_app, results):
+        """Walk one tree, carrying each directory's claims down to its files"""
+        pending = {dirpath: (key, claims)}
+
+        for dirpath, subdirs, files in walker.walk(dirpath, classify=is_save_file):
+            key, claims = pending.pop(dirpath)
+            children = self._route(key, claims, subdirs, files, is_excluded_app, results)
+
+            for entry, child_key, child_claims, _ in children:
+                pending[entry.path] = (child_key, child_claims)
+            subdirs[:] = [child[0] for child in children]
+
+    def _route(self, key, claims, subdirs, files, is_excluded_app, results):
+        """Route one directory's save files and decide which subdirectories to enter
+
+        Returns (entry, child_key, child_claims, started) for every
+        subdirectory that is claimed by a target or leads to one, where
+        started holds the claims that begin at that subdirectory.
+        """
+        # Targets rooted exactly here add claims for this directory
+        for target in self.known_targets.get(key, ()):
+            claims += (('known', target),)
+        locations = self.location_targets.get(key, ())
+        results.listed.extend(locations)
+
+        if claims and files:
+            # Files are kept as the directory's index plus their names, no Path each
+            dir_id = results.table.intern(os.path.dirname(files[0].path))
+            for kind, target in claims:
+                bucket = results.files(results.known_files if kind == 'known' else results.app_files,
+                                       target)
+                for entry in files:
+                    bucket.add_name(dir_id, entry.name)
+
+        children = []
+        for entry in subdirs:
+            child_key = os.path.join(key, os.path.normcase(entry.name))
+            child_claims = claims
+
+            # Each child of a scan location is a candidate app folder
+            if locations and not is_excluded_app(entry.name):
+                for location_index in locations:
+                    target = (location_index, entry.name)
+                    results.app_order.setdefault(location_index, []).append(entry.name)
+                    results.files(results.app_files, target)
+                    child_claims += (('app', target),)
+
+            if child_claims or child_key in self.target_ancestors or child_key in self.paths:
+                children.append((entry, child_key, child_claims, child_claims[len(claims):]))
+
+        return children
+
+    @staticmethod
+    def _is_within(key, root):
+        """Check whether key is root or lies beneath it"""
+        return key == root or key.startswith(root.rstrip(os.sep) + os.sep)
+
+
+class ScanResults:
+    """Files routed to known games and app folders during a walk"""
+
+    def __init__(self):
+        self.table = DirectoryTable()  # directories of every SaveSet below
+        self.known_files = {}
+        self.app_files = {}
+        self.app_order = {}
+        self.listed = []      # scan locations whose app folders were listed
+        self.completed = []   # claims whose whole tree has been walked
+
+    def files(self, bucket, target):
+        """A target's SaveSet in known_files or app_files, created on first use"""
+        saves = bucket.get(target)
+        if saves is None:
+            saves = bucket[target] = SaveSet(table=self.table)
+        return saves
+
+    def extend(self, other):
+        """Append another set of results, keeping per-target order"""
+        for target, files in other.known_files.items():
+            self.files(self.known_files, target).extend(files)
+        for target, files in other.app_files.items():
+            self.files(self.app_files, target).extend(files)
+        for location_index, names in other.app_order.items():
+            self.app_order.setdefault(location_index, []).extend(names)
+        self.listed.extend(other.listed)
+        self.completed.extend(other.completed)
+
+
+class _DeferredCall:
+    """A subtree walk not started yet; result() runs it on the calling thread"""
+
+    def __init__(self, fn, args):
+        self.fn = fn
+        self.args = args
+
+    def result(self):
+        return self.fn(*self.args)
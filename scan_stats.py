@@ -0,0 +1,110 @@
+"""
+Per-phase timing and counters for scans and backups
+Every scan fills a ScanStats at negligible cost; backups store it in their log
+and --stats prints it, so the roots and app folders that dominate show up
+"""
+
+import time
+
+from dir_walker import COUNTERS
+
+TOP_APPS = 10
+
+
+def _walk_entry(path):
+    """Empty time and counters for one root or app folder"""
+    entry = {'path': path, 'seconds': 0.0}
+    entry.update((counter, 0) for counter in COUNTERS)
+    return entry
+
+
+class ScanStats:
+    def __init__(self, top_apps=TOP_APPS):
+        self.top_apps = top_apps
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.roots = {}
+        self.apps = []
+        self.known_games = {}
+        self.detection = {'seconds': 0.0, 'apps_checked': 0, 'games_found': 0}
+
+    def add_walk(self, root, seconds, counts, app=None):
+        """Add one walked subtree's time and counters to its root, and to its app folder"""
+        entry = self.roots.get(root)
+        if entry is None:
+            entry = self.roots[root] = _walk_entry(root)
+        entry['seconds'] += seconds
+        for counter in COUNTERS:
+            entry[counter] += counts[counter]
+
+        if app is not None:
+            app_entry = _walk_entry(app)
+            app_entry['seconds'] = seconds
+            app_entry.update(counts)
+            self.apps.append(app_entry)
+
+    def add_decision(self, seconds, found):
+        """Record judging one app folder as a game or not"""
+        self.detection['seconds'] += seconds
+        self.detection['apps_checked'] += 1
+        if found:
+            self.detection['games_found'] += 1
+
+    def finish(self, known_found):
+        """Stop the clock once the scan is over"""
+        self.seconds = time.perf_counter() - self.started
+        self.known_games = {game_name: count for game_name, count in known_found.items() if count}
+
+    def as_dict(self):
+        """JSON-ready stats; walk seconds are busy time, so threads can add up past the wall time"""
+        roots = sorted(self.roots.values(), key=lambda entry: entry['seconds'], reverse=True)
+        apps = sorted(self.apps, key=lambda entry: entry['seconds'], reverse=True)[:self.top_apps]
+        totals = {counter: sum(entry[counter] for entry in roots) for counter in COUNTERS}
+
+        return {
+            'seconds': _round(self.seconds if self.seconds is not None
+                              else time.perf_counter() - self.started),
+            'totals': totals,
+            'roots': [dict(entry, seconds=_round(entry['seconds'])) for entry in roots],
+            'slowest_apps': [dict(entry, seconds=_round(entry['seconds'])) for entry in apps],
+            'known_games': dict(self.known_games),
+            'unknown_detection': dict(self.detection, seconds=_round(self.detection['seconds']))
+        }
+
+
+def _round(seconds):
+    """Seconds rounded for logs and reports"""
+    return round(seconds, 4)
+
+
+def format_stats(stats):
+    """Readable report of a backup log's 'stats' entry"""
+    lines = []
+    scan = stats.get('scan')
+    if scan:
+        totals = scan['totals']
+        lines.append(f"Scan: {scan['seconds']:.2f}s wall, {totals['dirs_visited']} directories listed, "
+                     f"{totals['dirs_cached']} unchanged from the index, {totals['files_seen']} files seen, "
+                     f"{totals['files_classified']} classified, {totals['files_matched']} saves, "
+                     f"{totals['errors']} errors")
+        lines.append("  Roots (time spent walking each):")
+        for entry in scan['roots']:
+            lines.append(f"    {entry['seconds']:8.3f}s  {entry['path']}  ({entry['dirs_visited']} dirs, "
+                         f"{entry['files_seen']} files, {entry['files_matched']} saves)")
+        if scan['slowest_apps']:
+            lines.append("  Slowest folders:")
+            for entry in scan['slowest_apps']:
+                lines.append(f"    {entry['seconds']:8.3f}s  {entry['path']}  ({entry['dirs_visited']} dirs, "
+                             f"{entry['files_seen']} files, {entry['files_matched']} saves)")
+        detection = scan['unknown_detection']
+        lines.append(f"  Known games: {len(scan['known_games'])} found, "
+                     f"{sum(scan['known_games'].values())} saves")
+        lines.append(f"  Unknown game detection: {detection['seconds']:.3f}s, "
+                     f"{detection['apps_checked']} app folders judged, {detection['games_found']} games")
+
+    copy = stats.get('copy')
+    if copy:
+        lines.append(f"Copy: {copy['seconds']:.2f}s busy over {copy['wall_seconds']:.2f}s, "
+                     f"{copy['files']} files, {copy['bytes_copied']} bytes copied, "
+                     f"{copy['bytes_reused']} bytes reused, {copy['errors']} errors")
+    return lines
@@ -0,0 +1,98 @@
+"""
+Compressed single-file snapshots
+Each snapshot is streamed into one zip container whose central directory
+doubles as the index, so any single save can be restored on its own
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import zipfile
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+ARCHIVE_SUFFIX = '.zip'
+
+COMPRESSION_METHODS = {
+    'stored': zipfile.ZIP_STORED,
+    'deflate': zipfile.ZIP_DEFLATED,
+}
+
+# Zstandard members need Python 3.14's zipfile; older versions fall back to deflate
+if hasattr(zipfile, 'ZIP_ZSTANDARD'):
+    COMPRESSION_METHODS['zstd'] = zipfile.ZIP_ZSTANDARD
+
+
+def compression_method(name, verbose=False):
+    """zipfile constant for a configured compression name"""
+    if name in COMPRESSION_METHODS:
+        return COMPRESSION_METHODS[name]
+    if verbose:
+        print(f"  Warning: {name} compression is not available here, using deflate")
+    return zipfile.ZIP_DEFLATED
+
+
+class ArchiveWriter:
+    """Streams files into one snapshot archive, which appears only once complete"""
+
+    def __init__(self, archive_path, compression='deflate', level=None, verbose=False):
+        self.archive_path = Path(archive_path)
+        self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+        self.temp_path = self.archive_path.with_name(self.archive_path.name + '.tmp')
+
+        # Members are written one at a time; copy workers queue on this lock
+        self._lock = threading.Lock()
+        self._zip = zipfile.ZipFile(self.temp_path, 'w',
+                                    compression=compression_method(compression, verbose),
+                                    compresslevel=level)
+        self.compressed_bytes = 0
+
+    def add_file(self, source, arcname):
+        """Compress one file into the archive, returning (hash, size)"""
+        large = os.path.getsize(source) > zipfile.ZIP64_LIMIT
+        digest = hashlib.blake2b(digest_size=32)
+        size = 0
+
+        with self._lock:
+            with open(source, 'rb') as src, self._zip.open(arcname, 'w', force_zip64=large) as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+
+        return digest.hexdigest(), size
+
+    def close(self, keep=True):
+        """Finish the central directory and move the archive into place"""
+        self.compressed_bytes = sum(info.compress_size for info in self._zip.infolist())
+        self._zip.close()
+        if keep:
+            os.replace(self.temp_path, self.archive_path)
+        else:
+            os.remove(self.temp_path)
+
+
+def restore_archive(archive_path, target_dir, members=None, mtimes=None):
+    """Extract members (default all) under target_dir without touching the rest
+
+    The zip central directory locates each member directly, so restoring
+    one save reads only that save's compressed bytes. mtimes optionally maps
+    member names to nanosecond mtimes to restore exactly.
+    """
+    target_dir = Path(target_dir)
+    mtimes = mtimes or {}
+    restored = []
+
+    with zipfile.ZipFile(archive_path) as archive:
+        names = archive.namelist() if members is None else list(members)
+        for name in names:
+            destination = target_dir / name
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            with archive.open(name) as src, open(destination, 'wb') as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            if mtimes.get(name) is not None:
+                os.utime(destination, ns=(mtimes[name], mtimes[name]))
+            restored.append(destination)
+
+    return restored
@@ -0,0 +1,97 @@
+"""
+Catalog of backup snapshots so listing backups never walks snapshot folders
+One SQLite row per snapshot records its size and file count; the per-file
+details live in the snapshot's JSON manifest
+"""
+
+import os
+import sqlite3
+
+COLUMNS = ('game', 'timestamp', 'storage', 'path', 'manifest',
+           'file_count', 'total_bytes', 'created')
+
+
+class SnapshotCatalog:
+    def __init__(self, catalog_path, verbose=False):
+        self.catalog_path = catalog_path
+        self.verbose = verbose
+
+    def exists(self):
+        """Whether the catalog has been created yet"""
+        return os.path.exists(self.catalog_path)
+
+    def add(self, entry):
+        """Record a snapshot, replacing any previous row for it"""
+        self._write([entry])
+
+    def replace_all(self, entries):
+        """Replace the whole catalog, as when rebuilding it from disk"""
+        self._write(entries, clear=True)
+
+    def remove(self, game_name, timestamp, storage):
+        """Forget a deleted snapshot"""
+        self.remove_all([{'game': game_name, 'timestamp': timestamp, 'storage': storage}])
+
+    def remove_all(self, entries):
+        """Forget several deleted snapshots in one transaction"""
+        if not self.exists():
+            return
+        conn = self._connect()
+        try:
+            conn.executemany("DELETE FROM snapshots WHERE game = ? AND timestamp = ? AND storage = ?",
+                             ((entry['game'], entry['timestamp'], entry['storage']) for entry in entries))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def list(self, game_name=None):
+        """Return {game: [snapshot entries, newest first]}, optionally filtered by name"""
+        backups = {}
+        if not self.exists():
+            return backups
+
+        query = f"SELECT {', '.join(COLUMNS)} FROM snapshots"
+        params = ()
+        if game_name:
+            query += " WHERE instr(lower(game), lower(?)) > 0"
+            params = (game_name,)
+        query += " ORDER BY game, timestamp DESC"
+
+        try:
+            conn = self._connect()
+            try:
+                for row in conn.execute(query, params):
+                    entry = dict(zip(COLUMNS, row))
+                    backups.setdefault(entry['game'], []).append(entry)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            if self.verbose:
+                print(f"  Warning: Could not read snapshot catalog: {e}")
+
+        return backups
+
+    def _write(self, entries, clear=False):
+        """Insert or replace rows in one transaction"""
+        os.makedirs(os.path.dirname(os.fspath(self.catalog_path)), exist_ok=True)
+        conn = self._connect()
+        try:
+            if clear:
+                conn.execute("DELETE FROM snapshots")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO snapshots ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in COLUMNS)})",
+                ([entry[column] for column in COLUMNS] for entry in entries))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self):
+        """Open the catalog database, creating its table on first use"""
+        conn = sqlite3.connect(os.fspath(self.catalog_path))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "game TEXT, timestamp TEXT, storage TEXT, path TEXT, manifest TEXT, "
+            "file_count INTEGER, total_bytes INTEGER, created TEXT, "
+            "PRIMARY KEY (game, timestamp, storage))")
+        return conn
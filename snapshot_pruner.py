@@ -0,0 +1,181 @@
+"""
+Retention policy and pruning of old snapshots
+What to delete is decided from the snapshot catalog alone: each game keeps its
+newest keep_last snapshots plus the newest snapshot of each of the last
+keep_daily days, keep_weekly weeks and keep_monthly months that have one.
+Snapshots are deleted in parallel. A hardlinked file only counts towards the
+bytes reclaimed once its last link is gone, and deleted store snapshots free
+their blobs through the store's garbage collection.
+"""
+
+import os
+from datetime import datetime
+
+from backup_manager import BackupManager
+from copy_engine import CopyEngine
+
+RETENTION_KEYS = ('keep_last', 'keep_daily', 'keep_weekly', 'keep_monthly')
+TIMESTAMP_FORMAT = "%Y-%m-%d_%H-%M-%S"
+TIMESTAMP_LENGTH = len("2000-01-01_00-00-00")
+
+# The period a snapshot falls in for each thinning rule
+PERIODS = {
+    'keep_daily': lambda moment: moment.date(),
+    'keep_weekly': lambda moment: moment.isocalendar()[:2],
+    'keep_monthly': lambda moment: (moment.year, moment.month),
+}
+
+
+def retention_policy(config, game_name):
+    """A game's retention settings, with its overrides applied"""
+    policy = dict(config.retention)
+    overrides = config.retention_overrides
+    override = overrides.get(game_name)
+    if override is None:
+        override = next((value for name, value in overrides.items()
+                         if name.lower() == game_name.lower()), {})
+    policy.update(override)
+    return policy
+
+
+def snapshot_time(timestamp):
+    """When a snapshot was taken, from its timestamp with any -NN suffix"""
+    base, suffix = timestamp[:TIMESTAMP_LENGTH], timestamp[TIMESTAMP_LENGTH:]
+    if suffix and not (suffix.startswith('-') and suffix[1:].isdigit()):
+        raise ValueError(f"Not a snapshot timestamp: {timestamp}")
+    return datetime.strptime(base, TIMESTAMP_FORMAT)
+
+
+def select_snapshots(entries, policy):
+    """Split a game's catalog entries into (keep, delete) under a retention policy
+
+    A policy with no limit set keeps everything, and snapshots whose
+    timestamp cannot be parsed are never deleted.
+    """
+    if not any(policy.get(key) for key in RETENTION_KEYS):
+        return list(entries), []
+
+    keep = []
+    dated = []
+    for entry in entries:
+        try:
+            dated.append((snapshot_time(entry['timestamp']), entry))
+        except ValueError:
+            keep.append(entry)
+    # Runs within the same second differ only by their -NN suffix
+    dated.sort(key=lambda item: (item[0], item[1]['timestamp']), reverse=True)
+
+    kept = set(range(min(policy.get('keep_last') or 0, len(dated))))
+    for key, period in PERIODS.items():
+        limit = policy.get(key) or 0
+        seen = set()
+        for index, (moment, _) in enumerate(dated):
+            if len(seen) >= limit:
+                break
+            bucket = period(moment)
+            if bucket not in seen:
+                seen.add(bucket)
+                kept.add(index)
+
+    keep.extend(entry for index, (_, entry) in enumerate(dated) if index in kept)
+    delete = [entry for index, (_, entry) in enumerate(dated) if index not in kept]
+    return keep, delete
+
+
+class SnapshotPruner:
+    def __init__(self, config, verbose=False, workers=None, backup_manager=None):
+        self.config = config
+        self.verbose = verbose
+        self.backup_manager = backup_manager or BackupManager(config, verbose=verbose)
+        self.copy_engine = CopyEngine(workers=workers or config.copy_workers)
+
+    def plan(self, game_filter=None):
+        """Return {game: [catalog entries to delete]} under each game's policy"""
+        plan = {}
+        for game_name, entries in self.backup_manager.list_backups(game_filter).items():
+            _, delete = select_snapshots(entries, retention_policy(self.config, game_name))
+            if delete:
+                plan[game_name] = delete
+        return plan
+
+    def prune(self, game_filter=None, dry_run=False):
+        """Delete the snapshots retention does not keep, returning what was deleted
+
+        With dry_run nothing is touched; bytes_reclaimed is then the total
+        size of the snapshots, an upper bound when files are shared.
+        """
+        entries = [entry for game_entries in self.plan(game_filter).values()
+                   for entry in game_entries]
+        result = {
+            'deleted': [],
+            'bytes_reclaimed': 0,
+            'objects_removed': 0,
+            'errors': [],
+            'dry_run': dry_run
+        }
+
+        if dry_run:
+            result['deleted'] = entries
+            result['bytes_reclaimed'] = sum(entry['total_bytes'] for entry in entries)
+            return result
+
+        # (device, inode) -> [size, link count before pruning, links removed]
+        links = {}
+        for entry, removed, error in self.copy_engine.map(self._delete_snapshot, entries):
+            if error is not None:
+                error_msg = f"Failed to delete {entry['game']} {entry['timestamp']}: {error}"
+                result['errors'].append(error_msg)
+                if self.verbose:
+                    print(f"  Error: {error_msg}")
+                continue
+
+            result['deleted'].append(entry)
+            if self.verbose:
+                print(f"  Deleted {entry['game']} {entry['timestamp']} ({entry['storage']})")
+            for key, size, nlink in removed:
+                record = links.setdefault(key, [size, nlink, 0])
+                # The first removal of an inode saw its full link count
+                record[1] = max(record[1], nlink)
+                record[2] += 1
+
+        self.backup_manager.catalog.remove_all(result['deleted'])
+        result['bytes_reclaimed'] = sum(size for size, nlink, removed in links.values()
+                                        if removed >= nlink)
+
+        if any(entry['storage'] == 'store' for entry in result['deleted']):
+            removed_objects, reclaimed = self.backup_manager.collect_garbage()
+            result['objects_removed'] = removed_objects
+            result['bytes_reclaimed'] += reclaimed
+
+        return result
+
+    def _delete_snapshot(self, entry):
+        """Delete one snapshot's files and manifest; runs on a worker thread
+
+        Returns ((device, inode), size, link count) for every file removed.
+        """
+        removed = []
+        if entry['storage'] == 'store':
+            if os.path.exists(entry['manifest']):
+                self.backup_manager.store.delete_snapshot(entry['game'], entry['timestamp'])
+            return removed
+
+        if entry['storage'] == 'archive':
+            if os.path.exists(entry['path']):
+                removed.append(self._remove_file(entry['path']))
+        else:
+            for dirpath, _, filenames in os.walk(entry['path'], topdown=False):
+                for name in filenames:
+                    removed.append(self._remove_file(os.path.join(dirpath, name)))
+                os.rmdir(dirpath)
+
+        if os.path.exists(entry['manifest']):
+            os.remove(entry['manifest'])
+        return removed
+
+    @staticmethod
+    def _remove_file(path):
+        """Delete a file, returning its inode key, size and link count beforehand"""
+        stat = os.lstat(path)
+        os.remove(path)
+        return (stat.st_dev, stat.st_ino), stat.st_size, stat.st_nlink
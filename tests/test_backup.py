@@ -2,6 +2,8 @@
 Unit tests for the backup functionality
 """
 
+import json
+import os
 import unittest
 import tempfile
 import shutil
@@ -9,6 +11,11 @@ from pathlib import Path
 from unittest.mock import Mock, patch
 
 from backup_manager import BackupManager
+from restore_manager import RestoreManager
+from snapshot_pruner import SnapshotPruner, retention_policy, select_snapshots
+from copy_engine import CopyEngine
+from fingerprint import hash_file
+from log_store import LogStore
 from config import Config
 
 class TestBackupManager(unittest.TestCase):
@@ -19,6 +26,17 @@ class TestBackupManager(unittest.TestCase):
         self.config.logs_dir = self.temp_dir / "logs"
         self.config.backup_dir.mkdir(parents=True, exist_ok=True)
         self.config.logs_dir.mkdir(parents=True, exist_ok=True)
+        self.config.incremental_backups = True
+        self.config.incremental_verify_hash = False
+        self.config.incremental_link_mode = 'hardlink'
+        self.config.backup_storage = 'directory'
+        self.config.store_dir = self.config.backup_dir / ".store"
+        self.config.manifests_dir = self.config.backup_dir / ".manifests"
+        self.config.catalog_path = self.config.backup_dir / ".catalog.sqlite3"
+        self.config.copy_workers = 4
+        self.config.copy_rate_limit = None
+        self.config.archive_compression = 'deflate'
+        self.config.archive_level = None
         
         self.backup_manager = BackupManager(self.config, verbose=False)
     
@@ -42,9 +60,510 @@ class TestBackupManager(unittest.TestCase):
         self.assertEqual(len(game_dirs), 1)
         self.assertTrue(game_dirs[0].is_dir())
     
+    def test_incremental_backup_reuses_unchanged_files(self):
+        save_file = self.temp_dir / "slot1.sav"
+        save_file.write_bytes(b"progress")
+        other_file = self.temp_dir / "slot2.sav"
+        other_file.write_bytes(b"a")
+        test_saves = {"Test Game": [save_file, other_file]}
+        
+        first = self.backup_manager.backup_saves(test_saves)
+        other_file.write_bytes(b"ab")
+        with patch('backup_manager.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "9999-01-01_00-00-00"
+            second = self.backup_manager.backup_saves(test_saves)
+        
+        self.assertEqual(first['files_copied'], 2)
+        self.assertEqual(second['files_copied'], 1)
+        self.assertEqual(second['files_reused'], 1)
+        self.assertEqual(second['bytes_reused'], len(b"progress"))
+        
+        backup = Path(second['games_backed_up']["Test Game"]['files'][0]['backup'])
+        self.assertEqual(backup.read_bytes(), b"progress")
+    
+    def test_runs_in_the_same_second_get_their_own_snapshots(self):
+        save_file = self.temp_dir / "slot1.sav"
+        save_file.write_bytes(b"progress")
+        other_file = self.temp_dir / "slot2.sav"
+        other_file.write_bytes(b"a")
+        test_saves = {"Test Game": [save_file, other_file]}
+        
+        with patch('backup_manager.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "2025-01-01_00-00-00"
+            first = self.backup_manager.backup_saves(test_saves)
+            # slot1.sav is hardlinked from the first snapshot, then changes
+            other_file.write_bytes(b"ab")
+            self.backup_manager.backup_saves(test_saves)
+            save_file.write_bytes(b"later progress")
+            third = self.backup_manager.backup_saves(test_saves)
+        
+        snapshots = sorted(path.name for path in (self.config.backup_dir / "Test Game").iterdir())
+        self.assertEqual(snapshots, ["2025-01-01_00-00-00", "2025-01-01_00-00-00-02",
+                                     "2025-01-01_00-00-00-03"])
+        first_files = {Path(entry['original']).name: Path(entry['backup']).read_bytes()
+                       for entry in first['games_backed_up']["Test Game"]['files']}
+        self.assertEqual(first_files, {"slot1.sav": b"progress", "slot2.sav": b"a"})
+        self.assertEqual(third['files_reused'], 1)
+        self.assertEqual(self.backup_manager.list_backups()["Test Game"][0]['timestamp'],
+                         "2025-01-01_00-00-00-03")
+    
+    def test_incremental_backup_copies_changed_files(self):
+        save_file = self.temp_dir / "slot1.sav"
+        save_file.write_bytes(b"progress")
+        test_saves = {"Test Game": [save_file]}
+        self.backup_manager.backup_saves(test_saves)
+        
+        save_file.write_bytes(b"more progress")
+        with patch('backup_manager.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "9999-01-01_00-00-00"
+            second = self.backup_manager.backup_saves(test_saves)
+        
+        self.assertEqual(second['files_copied'], 1)
+        self.assertEqual(second['files_reused'], 0)
+    
+    def test_unchanged_game_gets_no_new_snapshot(self):
+        save_files = [self.temp_dir / "slot1.sav", self.temp_dir / "slot2.sav"]
+        for save_file in save_files:
+            save_file.write_bytes(save_file.name.encode())
+        self.backup_manager.backup_saves({"Test Game": save_files})
+        
+        with patch('backup_manager.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "9999-01-01_00-00-00"
+            unchanged = self.backup_manager.backup_saves({"Test Game": save_files})
+            # A save that disappeared is a change too
+            deleted = self.backup_manager.backup_saves({"Test Game": save_files[:1]})
+        
+        self.assertEqual(unchanged['games_unchanged'], ["Test Game"])
+        self.assertEqual((unchanged['total_files'], unchanged['games_backed_up']), (0, {}))
+        self.assertEqual(deleted['games_unchanged'], [])
+        self.assertEqual(deleted['games_backed_up']["Test Game"]['count'], 1)
+        self.assertEqual(len(list(self.config.backup_dir.glob("Test Game/*"))), 2)
+    
+    def test_save_rewritten_with_same_bytes_is_unchanged(self):
+        save_files = [self.temp_dir / "slot1.sav", self.temp_dir / "slot2.sav"]
+        for save_file in save_files:
+            save_file.write_bytes(save_file.name.encode())
+        self.backup_manager.backup_saves({"Test Game": save_files})
+        
+        # Same size and bytes, new mtime
+        stat = save_files[0].stat()
+        os.utime(save_files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 5 * 10**9))
+        # Same size, different bytes
+        with patch('backup_manager.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "9999-01-01_00-00-00"
+            touched = self.backup_manager.backup_saves({"Test Game": save_files})
+            save_files[1].write_bytes(b"slot9.sav")
+            changed = self.backup_manager.backup_saves({"Test Game": save_files})
+        
+        self.assertEqual(touched['games_unchanged'], ["Test Game"])
+        self.assertEqual(touched['games_backed_up'], {})
+        self.assertEqual(changed['games_backed_up']["Test Game"]['count'], 2)
+        self.assertEqual(len(list(self.config.backup_dir.glob("Test Game/*"))), 2)
+    
+    def test_store_snapshots_share_identical_content(self):
+        save_file = self.temp_dir / "world.wld"
+        save_file.write_bytes(b"terrain" * 1000)
+        manager = BackupManager(self.config, verbose=False, storage='store')
+        
+        first = manager.write_snapshot("Test Game", [save_file], "2025-01-01_00-00-00")
+        second = manager.write_snapshot("Test Game", [save_file], "2025-01-02_00-00-00")
+        
+        self.assertEqual(first['files'][0]['hash'], second['files'][0]['hash'])
+        self.assertTrue(second['files'][0]['reused'])
+        blobs = [p for p in (self.config.store_dir / "objects").rglob('*') if p.is_file()]
+        self.assertEqual(len(blobs), 1)
+        
+        listed = manager.list_backups()["Test Game"]
+        self.assertEqual([b['timestamp'] for b in listed],
+                         ["2025-01-02_00-00-00", "2025-01-01_00-00-00"])
+    
+    def test_store_restore_and_gc(self):
+        save_file = self.temp_dir / "slot.sav"
+        save_file.write_bytes(b"old")
+        manager = BackupManager(self.config, verbose=False, storage='store')
+        manager.write_snapshot("Test Game", [save_file], "2025-01-01_00-00-00")
+        save_file.write_bytes(b"newer")
+        manager.write_snapshot("Test Game", [save_file], "2025-01-02_00-00-00")
+        
+        restored = manager.restore_snapshot("Test Game", "2025-01-01_00-00-00",
+                                            self.temp_dir / "restored")
+        self.assertEqual(restored[0].read_bytes(), b"old")
+        
+        manager.delete_snapshot("Test Game", "2025-01-01_00-00-00")
+        removed, reclaimed = manager.collect_garbage()
+        self.assertEqual((removed, reclaimed), (1, 3))
+    
+    def test_archive_snapshot_restores_single_file(self):
+        save_dir = self.temp_dir / "saves"
+        save_dir.mkdir()
+        for name in ["slot1.sav", "slot2.sav"]:
+            (save_dir / name).write_bytes(name.encode() * 500)
+        manager = BackupManager(self.config, verbose=False, storage='archive')
+        
+        manager.backup_saves({"Test Game": sorted(save_dir.iterdir())})
+        
+        listed = manager.list_backups()["Test Game"]
+        self.assertEqual(listed[0]['storage'], 'archive')
+        self.assertEqual(listed[0]['file_count'], 2)
+        archive_path = Path(listed[0]['path'])
+        self.assertTrue(archive_path.is_file())
+        self.assertLess(archive_path.stat().st_size, 2 * len(b"slot1.sav") * 500)
+        
+        restored = manager.restore_archive("Test Game", listed[0]['timestamp'],
+                                           self.temp_dir / "restored", files=["saves/slot2.sav"])
+        self.assertEqual([p.name for p in restored], ["slot2.sav"])
+        self.assertEqual(restored[0].read_bytes(), b"slot2.sav" * 500)
+        self.assertEqual(restored[0].stat().st_mtime_ns,
+                         (save_dir / "slot2.sav").stat().st_mtime_ns)
+    
+    def test_parallel_backup_log_order_is_deterministic(self):
+        save_files = []
+        for i in range(20):
+            save_file = self.temp_dir / "saves" / f"slot{i:02d}.sav"
+            save_file.parent.mkdir(exist_ok=True)
+            save_file.write_bytes(b"x" * i)
+            save_files.append(save_file)
+        
+        manager = BackupManager(self.config, verbose=False, incremental=False, workers=8)
+        result = manager.backup_saves({"Test Game": save_files, "Other Game": save_files[:3]})
+        
+        logged = [entry['original'] for entry in result['games_backed_up']["Test Game"]['files']]
+        self.assertEqual(logged, [str(path) for path in save_files])
+        self.assertEqual(list(result['games_backed_up']), ["Test Game", "Other Game"])
+        self.assertEqual(result['bytes_copied'], sum(range(20)) + sum(range(3)))
+    
+    def test_saves_sharing_a_relative_path_get_distinct_copies(self):
+        save_files = []
+        for folder in ("A", "B", "C"):
+            save_file = self.temp_dir / folder / "saves" / "slot.sav"
+            save_file.parent.mkdir(parents=True)
+            save_file.write_bytes(folder.encode() * 100000)
+            save_files.append(save_file)
+        
+        for storage, timestamp in (('directory', "2025-01-01_00-00-01"), ('archive', "2025-01-01_00-00-02"),
+                                   ('store', "2025-01-01_00-00-03")):
+            with self.subTest(storage=storage), patch('backup_manager.datetime') as mock_datetime:
+                mock_datetime.now.return_value.strftime.return_value = timestamp
+                manager = BackupManager(self.config, incremental=False, storage=storage, workers=4)
+                result = manager.backup_saves({"Test Game": save_files})
+                
+                self.assertEqual(result['errors'], [])
+                entry = manager.list_backups("Test Game")["Test Game"][0]
+                self.assertEqual(entry['file_count'], 3)
+                with open(entry['manifest']) as f:
+                    manifest = json.load(f)
+                self.assertEqual([file_entry['path'] for file_entry in manifest['files']],
+                                 ["saves/slot.sav", "saves/slot (2).sav", "saves/slot (3).sav"])
+                self.assertEqual([file_entry['hash'] for file_entry in manifest['files']],
+                                 [hash_file(path) for path in save_files])
+                if storage == 'directory':
+                    for file_entry in manifest['files']:
+                        copied = Path(entry['path']) / file_entry['path']
+                        self.assertEqual(hash_file(copied), file_entry['hash'])
+    
+    def test_backup_stream_consumes_events_lazily(self):
+        save_file = self.temp_dir / "slot1.sav"
+        save_file.write_bytes(b"data")
+        consumed = []
+        
+        def events():
+            for i in range(3):
+                consumed.append(i)
+                yield "Test Game", save_file
+        
+        manager = BackupManager(self.config, verbose=False, incremental=False, workers=1)
+        result = manager.backup_stream(events())
+        
+        self.assertEqual(consumed, [0, 1, 2])
+        self.assertEqual(result['files_copied'], 3)
+        self.assertIn("Test Game", result['games_backed_up'])
+    
     def test_list_backups_empty(self):
         result = self.backup_manager.list_backups()
         self.assertEqual(result, {})
+    
+    def test_logged_files_and_manifest_match_the_backup(self):
+        save_dir = self.temp_dir / "saves"
+        save_dir.mkdir()
+        for name in ("slot1.sav", "slot2.sav"):
+            (save_dir / name).write_text(name)
+        
+        for storage, timestamp in (('directory', "2025-01-01_00-00-01"), ('store', "2025-01-01_00-00-02")):
+            with self.subTest(storage=storage), patch('backup_manager.datetime') as mock_datetime:
+                mock_datetime.now.return_value.strftime.return_value = timestamp
+                manager = BackupManager(self.config, incremental=False, storage=storage)
+                result = manager.backup_saves({"Test Game": sorted(save_dir.iterdir())})
+                game_log = result['games_backed_up']["Test Game"]
+                
+                logged = manager.log_store.read_run(result['timestamp'])
+                self.assertEqual(logged['games_backed_up']["Test Game"]['files'], game_log['files'])
+                self.assertEqual(json.loads(json.dumps(result))['games_backed_up'], result['games_backed_up'])
+                self.assertEqual([entry['original'] for entry in game_log['files']],
+                                 [str(save_dir / "slot1.sav"), str(save_dir / "slot2.sav")])
+                
+                entry = manager.list_backups("Test Game")["Test Game"][0]
+                with open(entry['manifest']) as f:
+                    manifest = json.load(f)
+                self.assertEqual([file_entry['hash'] for file_entry in manifest['files']],
+                                 [hash_file(save_dir / "slot1.sav"), hash_file(save_dir / "slot2.sav")])
+                self.assertEqual(manifest['total_bytes'], 18)
+    
+    def test_backup_is_catalogued_with_manifest(self):
+        save_file = self.temp_dir / "slot1.sav"
+        save_file.write_bytes(b"progress")
+        other_file = self.temp_dir / "slot2.sav"
+        other_file.write_bytes(b"a")
+        self.backup_manager.backup_saves({"Test Game": [save_file, other_file]})
+        other_file.write_bytes(b"ab")
+        with patch('backup_manager.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = "9999-01-01_00-00-00"
+            self.backup_manager.backup_saves({"Test Game": [save_file, other_file]})
+        
+        listed = self.backup_manager.list_backups("test")["Test Game"]
+        self.assertEqual(len(listed), 2)
+        self.assertEqual(listed[0]['timestamp'], "9999-01-01_00-00-00")
+        self.assertEqual((listed[0]['file_count'], listed[0]['total_bytes']), (2, len(b"progress") + 2))
+        
+        with open(listed[0]['manifest']) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest['files'][0]['hash'], hash_file(save_file))
+        self.assertTrue(manifest['files'][0]['reused'])
+        self.assertEqual(self.backup_manager.list_backups("other"), {})
+    
+    def test_rebuild_catalog_adds_older_snapshots(self):
+        legacy = self.config.backup_dir / "Old Game" / "2024-01-01_00-00-00" / "saves"
+        legacy.mkdir(parents=True)
+        (legacy / "slot.sav").write_bytes(b"old save")
+        
+        listed = self.backup_manager.list_backups()["Old Game"]
+        
+        self.assertEqual((listed[0]['file_count'], listed[0]['total_bytes']), (1, len(b"old save")))
+        self.assertTrue(Path(listed[0]['manifest']).is_file())
+        self.assertEqual(self.backup_manager.rebuild_catalog(), 1)
+    
+    def test_restore_puts_saves_back_in_place(self):
+        save_dir = self.temp_dir / "saves"
+        save_dir.mkdir()
+        for name in ["slot1.sav", "slot2.sav"]:
+            (save_dir / name).write_bytes(name.encode())
+        mtime_ns = (save_dir / "slot1.sav").stat().st_mtime_ns
+        
+        for storage in ['directory', 'store', 'archive']:
+            with self.subTest(storage=storage):
+                manager = BackupManager(self.config, verbose=False, storage=storage)
+                with patch('backup_manager.datetime') as mock_datetime:
+                    mock_datetime.now.return_value.strftime.return_value = f"2025-01-01_{storage}"
+                    manager.backup_saves({"Test Game": sorted(save_dir.iterdir())})
+                (save_dir / "slot1.sav").write_bytes(b"corrupted")
+                (save_dir / "slot2.sav").unlink()
+                
+                result = RestoreManager(self.config).restore("Test Game", f"2025-01-01_{storage}")
+                
+                self.assertEqual(len(result['restored']), 2)
+                self.assertEqual(result['errors'], [])
+                self.assertEqual((save_dir / "slot1.sav").read_bytes(), b"slot1.sav")
+                self.assertEqual((save_dir / "slot2.sav").read_bytes(), b"slot2.sav")
+                self.assertEqual((save_dir / "slot1.sav").stat().st_mtime_ns, mtime_ns)
+    
+    def test_restore_in_place_from_snapshot_made_before_manifests(self):
+        timestamp = "2025-01-01_00-00-00"
+        save_dir = self.temp_dir / "Documents" / "My Games" / "Old Game"
+        save_dir.mkdir(parents=True)
+        snapshot = self.config.backup_dir / "Old Game" / timestamp / "SaveGames"
+        snapshot.mkdir(parents=True)
+        legacy_files = []
+        for name in ("slot1.sav", "slot2.sav"):
+            (snapshot / name).write_bytes(name.encode())
+            # Logs of the time held absolute Windows paths from the machine that made them
+            legacy_files.append({
+                'original': str(save_dir / name),
+                'backup': f"C:\\Saves\\loaded saves\\Old Game\\{timestamp}\\SaveGames\\{name}",
+                'size': len(name)
+            })
+        with open(self.config.logs_dir / f"backup_{timestamp}.json", 'w') as f:
+            json.dump({'timestamp': timestamp, 'total_files': 2, 'errors': [],
+                       'games_backed_up': {"Old Game": {'files': legacy_files, 'count': 2}}}, f)
+        
+        result = RestoreManager(self.config).restore("Old Game")
+        
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(sorted(result['restored']), [str(save_dir / "slot1.sav"), str(save_dir / "slot2.sav")])
+        self.assertEqual((save_dir / "slot2.sav").read_bytes(), b"slot2.sav")
+        
+        # Manifests already rebuilt without original paths fall back to the log
+        manifest_path = Path(self.backup_manager.list_backups("Old Game")["Old Game"][0]['manifest'])
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest['files'][0]['original'], str(save_dir / "slot1.sav"))
+        for file_entry in manifest['files']:
+            file_entry['original'] = None
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+        (save_dir / "slot1.sav").unlink()
+        
+        result = RestoreManager(self.config).restore("Old Game")
+        self.assertEqual((result['restored'], result['errors']), ([str(save_dir / "slot1.sav")], []))
+    
+    def test_restore_skips_identical_files(self):
+        save_file = self.temp_dir / "slot1.sav"
+        save_file.write_bytes(b"progress")
+        self.backup_manager.backup_saves({"Test Game": [save_file]})
+        
+        result = RestoreManager(self.config).restore("Test Game")
+        
+        self.assertEqual((result['restored'], result['skipped']), ([], [str(save_file)]))
+    
+    def test_restore_rejects_damaged_backup_copy(self):
+        save_file = self.temp_dir / "slot1.sav"
+        save_file.write_bytes(b"progress")
+        self.backup_manager.backup_saves({"Test Game": [save_file]})
+        snapshot = Path(self.backup_manager.list_backups()["Test Game"][0]['path'])
+        next(snapshot.rglob("slot1.sav")).write_bytes(b"bit rot!")
+        save_file.write_bytes(b"current")
+        
+        result = RestoreManager(self.config).restore("Test Game")
+        
+        self.assertEqual(len(result['errors']), 1)
+        self.assertEqual(save_file.read_bytes(), b"current")
+        self.assertEqual([p.name for p in self.temp_dir.iterdir() if p.is_file()], ["slot1.sav"])
+    
+    def test_retention_thins_by_period(self):
+        timestamps = ["2025-03-01_10-00-00", "2025-03-01_09-00-00", "2025-02-28_12-00-00",
+                      "2025-02-20_12-00-00", "2025-01-15_12-00-00", "legacy"]
+        entries = [{'timestamp': timestamp} for timestamp in timestamps]
+        
+        keep, delete = select_snapshots(entries, {'keep_last': 1, 'keep_daily': 2,
+                                                  'keep_monthly': 3})
+        
+        self.assertEqual(sorted(entry['timestamp'] for entry in keep),
+                         ["2025-01-15_12-00-00", "2025-02-28_12-00-00",
+                          "2025-03-01_10-00-00", "legacy"])
+        self.assertEqual(len(delete), 2)
+        self.assertEqual(select_snapshots(entries, {'keep_last': None})[1], [])
+        
+        # A second run within the same second is the newer snapshot
+        same_second = [{'timestamp': "2025-03-01_10-00-00"}, {'timestamp': "2025-03-01_10-00-00-02"}]
+        self.assertEqual(select_snapshots(same_second, {'keep_last': 1}),
+                         ([same_second[1]], [same_second[0]]))
+        
+        self.config.retention = {'keep_last': 10, 'keep_daily': 7}
+        self.config.retention_overrides = {'skyrim': {'keep_last': 30}}
+        self.assertEqual(retention_policy(self.config, "Skyrim"), {'keep_last': 30, 'keep_daily': 7})
+    
+    def test_prune_counts_hardlinked_files_once(self):
+        save_dir = self.temp_dir / "saves"
+        save_dir.mkdir()
+        (save_dir / "shared.sav").write_bytes(b"never changes")
+        for day in range(1, 4):
+            (save_dir / "slot.sav").write_bytes(b"x" * day)
+            with patch('backup_manager.datetime') as mock_datetime:
+                mock_datetime.now.return_value.strftime.return_value = f"2025-01-0{day}_00-00-00"
+                self.backup_manager.backup_saves({"Test Game": sorted(save_dir.iterdir())})
+        self.config.retention = {'keep_last': 1}
+        self.config.retention_overrides = {}
+        
+        result = SnapshotPruner(self.config).prune()
+        
+        self.assertEqual(len(result['deleted']), 2)
+        self.assertEqual(result['bytes_reclaimed'], 1 + 2)
+        listed = self.backup_manager.list_backups()["Test Game"]
+        self.assertEqual([entry['timestamp'] for entry in listed], ["2025-01-03_00-00-00"])
+        self.assertFalse((self.config.backup_dir / "Test Game" / "2025-01-01_00-00-00").exists())
+        self.assertEqual(RestoreManager(self.config).restore("Test Game")['errors'], [])
+    
+    def test_prune_store_snapshots_collects_blobs(self):
+        save_file = self.temp_dir / "slot.sav"
+        manager = BackupManager(self.config, verbose=False, storage='store')
+        for day in range(1, 4):
+            save_file.write_bytes(b"y" * day)
+            manager.write_snapshot("Test Game", [save_file], f"2025-01-0{day}_00-00-00")
+        self.config.retention = {'keep_last': 2}
+        self.config.retention_overrides = {}
+        
+        result = SnapshotPruner(self.config, backup_manager=manager).prune()
+        
+        self.assertEqual((len(result['deleted']), result['objects_removed']), (1, 1))
+        self.assertEqual(result['bytes_reclaimed'], 1)
+        self.assertEqual(len(manager.list_backups()["Test Game"]), 2)
+
+class TestLogStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.store = LogStore(self.temp_dir)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _log(self, timestamp, games, errors=()):
+        backup_dir = str(self.temp_dir / "loaded saves" / "Game" / timestamp)
+        return {
+            'timestamp': timestamp,
+            'games_backed_up': {
+                name: {
+                    'files': [{'original': f"C:/saves/{name}/slot.sav",
+                               'backup': backup_dir + os.sep + "slot.sav",
+                               'size': 10, 'reused': False}],
+                    'count': 1,
+                    'backup_dir': backup_dir,
+                    'storage': 'directory'
+                }
+                for name in games
+            },
+            'total_files': len(games),
+            'files_copied': len(games),
+            'files_reused': 0,
+            'bytes_copied': 10 * len(games),
+            'bytes_reused': 0,
+            'errors': list(errors)
+        }
+    
+    def test_runs_page_and_filter_newest_first(self):
+        for day in range(1, 6):
+            games = ["Skyrim"] if day % 2 else ["Terraria"]
+            self.store.append(self._log(f"2025-01-0{day}_00-00-00", games,
+                                        errors=["boom"] if day == 4 else ()))
+        
+        runs, total = self.store.list_runs(offset=1, limit=2)
+        self.assertEqual(total, 5)
+        self.assertEqual([r['timestamp'][:10] for r in runs], ["2025-01-04", "2025-01-03"])
+        
+        runs, total = self.store.list_runs(game="sky")
+        self.assertEqual(total, 3)
+        runs, total = self.store.list_runs(errors_only=True)
+        self.assertEqual([r['error_count'] for r in runs], [1])
+    
+    def test_read_run_restores_full_log(self):
+        log = self._log("2025-01-01_00-00-00", ["Skyrim", "Terraria"])
+        log['stats'] = {'scan': None, 'copy': {'seconds': 0.5, 'files': 2}}
+        self.store.append(self._log("2024-12-31_00-00-00", ["Other"]))
+        self.store.append(log)
+        
+        self.assertEqual(self.store.read_run("2025-01-01_00-00-00"), log)
+        self.assertIsNone(self.store.read_run("1999-01-01_00-00-00"))
+    
+    def test_legacy_logs_are_migrated_once(self):
+        legacy = self._log("2024-06-01_12-00-00", ["Skyrim"])
+        with open(self.temp_dir / "backup_2024-06-01_12-00-00.json", 'w') as f:
+            json.dump(legacy, f, indent=2)
+        
+        runs, total = self.store.list_runs()
+        self.assertEqual(total, 1)
+        self.assertEqual(runs[0]['games'], {"Skyrim": 1})
+        self.assertEqual(self.store.migrate_legacy(), 0)
+        self.assertEqual(self.store.read_run("2024-06-01_12-00-00"), legacy)
+
+class TestCopyEngine(unittest.TestCase):
+    def test_map_preserves_order_and_captures_errors(self):
+        def job(n):
+            if n == 3:
+                raise ValueError("boom")
+            return n * 2
+        
+        engine = CopyEngine(workers=4)
+        results = list(engine.map(job, range(6)))
+        
+        self.assertEqual([r[1] for r in results], [0, 2, 4, None, 8, 10])
+        self.assertIsInstance(results[3][2], ValueError)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
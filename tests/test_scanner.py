@@ -0,0 +1,442 @@
+"""
+Unit tests for the scanning functionality
+"""
+
+import json
+import os
+import unittest
+import tempfile
+import shutil
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from config import Config
+from backup_manager import BackupManager
+from game_scanner import GameScanner
+from dir_walker import DirectoryWalker
+from scan_planner import ScanPlanner, ScanResults
+from save_classifier import SaveClassifier
+from save_patterns import SavePatterns
+from save_set import BackupRecords, SaveSet
+from profile_batch import ProfileBatch
+
+class TestDirectoryWalker(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_iter_files_visits_each_file_once(self):
+        (self.temp_dir / "a" / "saves").mkdir(parents=True)
+        (self.temp_dir / "a" / "saves" / "slot1.sav").touch()
+        (self.temp_dir / "a" / "top.sav").touch()
+
+        walker = DirectoryWalker()
+        names = sorted(entry.name for entry in walker.iter_files(self.temp_dir))
+
+        self.assertEqual(names, ["slot1.sav", "top.sav"])
+        self.assertEqual(walker.dirs_visited, 3)
+
+    def test_iter_files_prunes_before_descending(self):
+        (self.temp_dir / "skip" / "deep").mkdir(parents=True)
+        (self.temp_dir / "skip" / "deep" / "x.sav").touch()
+        (self.temp_dir / "keep.sav").touch()
+
+        walker = DirectoryWalker()
+        files = list(walker.iter_files(self.temp_dir, prune=lambda d: d.name == "skip"))
+
+        self.assertEqual([entry.name for entry in files], ["keep.sav"])
+        self.assertEqual(walker.dirs_visited, 1)
+
+class TestScanPlanner(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_nested_roots_are_merged(self):
+        docs = self.temp_dir / "Documents"
+        (docs / "My Games" / "Skyrim" / "Saves").mkdir(parents=True)
+
+        planner = ScanPlanner(
+            {"Skyrim": [docs / "My Games" / "Skyrim" / "Saves"]},
+            [docs / "My Games", docs, self.temp_dir / "missing"],
+        )
+
+        self.assertEqual(planner.plan(), [os.path.normcase(str(docs))])
+
+    def test_files_are_routed_to_every_claimant(self):
+        docs = self.temp_dir / "Documents"
+        saves = docs / "My Games" / "Skyrim" / "Saves"
+        saves.mkdir(parents=True)
+        (saves / "quicksave.ess").touch()
+
+        planner = ScanPlanner({"Skyrim": [saves]}, [docs / "My Games", docs])
+        walker = DirectoryWalker()
+        results = ScanResults()
+        for segment in planner.iter_segments(walker, lambda p: True, lambda name: False):
+            results.extend(segment)
+
+        expected = [saves / "quicksave.ess"]
+        self.assertEqual(list(results.known_files[("Skyrim", 0)]), expected)
+        self.assertEqual(list(results.app_files[(0, "Skyrim")]), expected)
+        self.assertEqual(list(results.app_files[(1, "My Games")]), expected)
+        self.assertEqual(walker.dirs_visited, 4)
+
+    def test_parallel_walk_runs_a_bounded_number_of_tasks_ahead(self):
+        location = self.temp_dir / "AppData"
+        for index in range(20):
+            (location / f"App{index:02d}").mkdir(parents=True)
+            (location / f"App{index:02d}" / "slot.sav").touch()
+
+        planner = ScanPlanner({}, [location])
+        started = []
+        walk_task = planner._walk_task
+        with patch.object(planner, '_walk_task',
+                          side_effect=lambda *args: started.append(args[0]) or walk_task(*args)):
+            segments = planner.iter_segments(DirectoryWalker(), lambda p: True, lambda name: False, jobs=2)
+            results = ScanResults()
+            results.extend(next(segments))
+            # Unbounded, the idle threads would walk every app folder meanwhile
+            time.sleep(0.2)
+            self.assertLessEqual(len(started), 2 * 2 + 1)
+            for segment in segments:
+                results.extend(segment)
+
+        self.assertEqual(len(started), 20)
+        self.assertEqual(sorted(results.app_order[0]), [f"App{index:02d}" for index in range(20)])
+        self.assertEqual(sum(len(files) for files in results.app_files.values()), 20)
+
+class TestSaveClassifier(unittest.TestCase):
+    def setUp(self):
+        self.classifier = SaveClassifier(Config())
+
+    def test_save_file_verdicts(self):
+        expected = {
+            "slot1.sav": True,
+            "SAVE.BIN": True,
+            "player_data": True,
+            "options.ini": True,
+            "debug.sav": False,
+            "savegame.txt": False,
+            "config.json": False,
+            "texture.png": False,
+            "random.bin": False,
+            ".sav": False,
+            "..sav": True,
+            "notes.": False,
+        }
+        for name, verdict in expected.items():
+            self.assertEqual(self.classifier.is_likely_save_file(Path("dir") / name), verdict, name)
+            self.assertEqual(self.classifier.is_likely_save_file(f"dir/{name}"), verdict, name)
+
+    def test_excluded_app_verdicts(self):
+        self.assertTrue(self.classifier.is_excluded_app("Google Chrome"))
+        self.assertTrue(self.classifier.is_excluded_app("Thunder"))
+        self.assertTrue(self.classifier.is_excluded_app(""))
+        self.assertFalse(self.classifier.is_excluded_app("HollowKnight"))
+
+    def test_strong_indicators_check_every_parent(self):
+        base = Path("root") / "Saves" / "deep"
+        self.assertTrue(self.classifier.has_strong_save_indicators(base / "a.bin"))
+        self.assertTrue(self.classifier.has_strong_save_indicators(base / "b.bin"))
+        self.assertFalse(self.classifier.has_strong_save_indicators(Path("root") / "other" / "a.bin"))
+        self.assertTrue(self.classifier.has_strong_save_indicators(Path("root") / "other" / "slot.bin"))
+
+
+class TestSavePatterns(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.patterns_file = self.temp_dir / "patterns.json"
+        games = {
+            "Baldur's Gate 3": {"paths": ["{APPDATA}/Larian Studios/Baldur's Gate 3/PlayerProfiles"]},
+            "The Witcher 3": {"paths": ["{DOCUMENTS}/The Witcher 3/gamesaves"]},
+            "Witchery": {"paths": ["{NO_SUCH_VARIABLE}/Witchery"],
+                         "platforms": {"linux": ["{APPDATA}/Witchery"],
+                                       "windows": ["{APPDATA}/Witchery"],
+                                       "darwin": ["{APPDATA}/Witchery"]}},
+            "Fallout 4": {"paths": ["{DOCUMENTS}/My Games/Fallout4/Saves"]},
+        }
+        self.patterns_file.write_text(json.dumps({'version': 1, 'games': games}))
+        self.env = patch.dict(os.environ, {
+            'USERPROFILE': str(self.temp_dir),
+            'APPDATA': str(self.temp_dir / "AppData"),
+        })
+        self.env.start()
+        self.patterns = SavePatterns(self.patterns_file)
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_placeholders_and_platform_variants(self):
+        self.assertIsNone(self.patterns._game_patterns)
+        self.assertEqual(self.patterns.get_patterns_for_game("The Witcher 3"),
+                         [self.temp_dir / "Documents" / "The Witcher 3" / "gamesaves"])
+        self.assertEqual(self.patterns.get_patterns_for_game("Witchery"),
+                         [self.temp_dir / "AppData" / "Witchery"])
+
+    def test_game_filter_lookups(self):
+        self.assertEqual(self.patterns.find_games("baldurs gate 3"), ["Baldur's Gate 3"])
+        self.assertEqual(self.patterns.find_games("witch"), ["The Witcher 3", "Witchery"])
+        self.assertEqual(self.patterns.find_games("llout"), ["Fallout 4"])
+        self.assertEqual(self.patterns.find_games("nothing"), [])
+
+    def test_existing_patterns_skip_missing_folders(self):
+        (self.temp_dir / "Documents" / "The Witcher 3" / "gamesaves").mkdir(parents=True)
+        (self.temp_dir / "AppData" / "Witchery").mkdir(parents=True)
+
+        self.assertEqual(list(self.patterns.existing_patterns()), ["The Witcher 3", "Witchery"])
+        self.assertEqual(list(self.patterns.existing_patterns("witcher 3")), ["The Witcher 3"])
+
+    def test_cached_table_follows_file_and_placeholders(self):
+        cache_file = self.temp_dir / "cache" / "patterns.cache"
+        expected = SavePatterns(self.patterns_file, cache_file=cache_file).get_all_patterns()
+        self.assertTrue(cache_file.exists())
+
+        cached = SavePatterns(self.patterns_file, cache_file=cache_file)
+        self.assertEqual(cached.get_all_patterns(), expected)
+        self.assertEqual(cached._used, {})
+
+        # Another profile's APPDATA is a different table
+        other = SavePatterns(self.patterns_file, cache_file=cache_file,
+                             environ=dict(os.environ, APPDATA=str(self.temp_dir / "Other")))
+        self.assertEqual(other.get_patterns_for_game("Witchery"), [self.temp_dir / "Other" / "Witchery"])
+
+        self.patterns_file.write_text(json.dumps({'version': 1, 'games': {
+            "Hades": {"paths": ["{DOCUMENTS}/Saved Games/Hades"]}}}))
+        self.assertEqual(list(SavePatterns(self.patterns_file, cache_file=cache_file).get_all_patterns()),
+                         ["Hades"])
+
+
+class TestSaveSet(unittest.TestCase):
+    def test_paths_round_trip_and_share_directories(self):
+        saves = [Path("root") / "Game" / "saves" / name for name in ("a.sav", "b.sav")]
+        first = SaveSet(saves)
+        second = SaveSet([Path("root") / "Other" / "c.sav"])
+
+        second.extend(first)
+
+        self.assertEqual(list(first), saves)
+        self.assertEqual(list(second), [Path("root") / "Other" / "c.sav"] + saves)
+        self.assertEqual(len(second.table), 2)
+        self.assertEqual(first, SaveSet(saves))
+        self.assertIn(saves[1], first)
+
+    def test_backup_records_round_trip(self):
+        entries = [
+            {'path': "saves/slot1.sav", 'original': str(Path("root") / "saves" / "slot1.sav"),
+             'size': 10, 'mtime_ns': 123, 'hash': "ab" * 32, 'reused': True},
+            {'path': "player.sav", 'original': None, 'size': 5, 'mtime_ns': None,
+             'hash': "not-a-digest", 'reused': False},
+        ]
+        records = BackupRecords()
+        for entry in entries:
+            records.append(entry)
+
+        self.assertEqual(list(records), entries)
+        self.assertEqual(records[-1], entries[1])
+        self.assertEqual(records.total_bytes(), 15)
+
+class TestGameScanner(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.profile = self.temp_dir / "profile"
+        self.profile.mkdir()
+        self.env = patch.dict(os.environ, {
+            'USERPROFILE': str(self.profile),
+            'APPDATA': str(self.profile / "AppData" / "Roaming"),
+            'LOCALAPPDATA': str(self.profile / "AppData" / "Local"),
+        })
+        self.env.start()
+
+        self.config = Config()
+        self.config.backup_dir = self.temp_dir / "loaded saves"
+        self.config.logs_dir = self.temp_dir / "logs"
+        self.config.cache_dir = self.temp_dir / "cache"
+        self.scanner = GameScanner(self.config, verbose=False)
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def _make_files(self, base, names):
+        for name in names:
+            path = base / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+
+    def test_unknown_game_saves_are_not_duplicated(self):
+        game_dir = self.profile / "AppData" / "Roaming" / "Puzzle Quest"
+        self._make_files(game_dir, [
+            "saves/slot1.sav", "saves/slot2.sav", "data/world.dat", "player.sav",
+        ])
+
+        found = self.scanner.scan_for_saves()
+
+        saves = found["Puzzle Quest"]
+        self.assertEqual(len(saves), len(set(saves)))
+        self.assertEqual(len(saves), 4)
+
+    def test_excluded_apps_are_skipped(self):
+        self._make_files(self.profile / "AppData" / "Local" / "Discord", [
+            "saves/a.sav", "saves/b.sav", "saves/c.sav",
+        ])
+
+        found = self.scanner.scan_for_saves()
+
+        self.assertNotIn("Discord", found)
+
+    def test_known_game_patterns_are_scanned(self):
+        saves_dir = self.profile / "Documents" / "My Games" / "Skyrim" / "Saves"
+        self._make_files(saves_dir, ["quicksave.ess", "notes.txt"])
+
+        found = self.scanner.scan_for_saves(game_filter="skyrim")
+
+        self.assertEqual([p.name for p in found["Skyrim"]], ["quicksave.ess"])
+
+    def test_repeat_scan_uses_index(self):
+        game_dir = self.profile / "AppData" / "Roaming" / "Puzzle Quest"
+        self._make_files(game_dir, ["saves/slot1.sav", "saves/slot2.sav", "player.sav"])
+        first = self.scanner.scan_for_saves()
+
+        scanner = GameScanner(self.config, verbose=False)
+        second = scanner.scan_for_saves()
+
+        self.assertEqual(first, second)
+        self.assertEqual(scanner.walker.dirs_visited, 0)
+        self.assertGreater(scanner.walker.dirs_cached, 0)
+
+    def test_scan_stats_cover_roots_and_app_folders(self):
+        game_dir = self.profile / "AppData" / "Roaming" / "Puzzle Quest"
+        self._make_files(game_dir, ["saves/slot1.sav", "saves/slot2.sav", "player.sav"])
+
+        self.scanner.scan_for_saves()
+        stats = self.scanner.stats.as_dict()
+
+        self.assertEqual(stats['totals']['dirs_visited'], self.scanner.walker.dirs_visited)
+        self.assertEqual(stats['totals']['files_matched'], 3)
+        self.assertIn(str(self.profile / "AppData" / "Roaming"),
+                      [root['path'] for root in stats['roots']])
+        self.assertIn(str(game_dir), [app['path'] for app in stats['slowest_apps']])
+        self.assertEqual(stats['unknown_detection']['games_found'], 1)
+
+    def test_index_picks_up_new_files(self):
+        game_dir = self.profile / "AppData" / "Roaming" / "Puzzle Quest"
+        self._make_files(game_dir, ["saves/slot1.sav", "saves/slot2.sav", "player.sav"])
+        self.scanner.scan_for_saves()
+
+        self._make_files(game_dir, ["saves/slot3.sav"])
+        found = GameScanner(self.config, verbose=False).scan_for_saves()
+
+        self.assertIn(game_dir / "saves" / "slot3.sav", found["Puzzle Quest"])
+
+    def test_parallel_scan_matches_serial_scan(self):
+        for base in ("Documents/My Games", "AppData/Roaming", "AppData/Local"):
+            for app in ("Alpha Quest", "Beta Craft", "Gamma Racing"):
+                self._make_files(self.profile / base / app, [
+                    "saves/a.sav", "saves/b.sav", "profiles/c.dat", "world.sav",
+                ])
+
+        serial = GameScanner(self.config, use_index=False, jobs=1).scan_for_saves()
+        parallel = GameScanner(self.config, use_index=False, jobs=4).scan_for_saves()
+
+        self.assertEqual(list(serial), list(parallel))
+        self.assertEqual(serial, parallel)
+
+    def test_iter_saves_streams_known_games_before_walk_finishes(self):
+        saves_dir = self.profile / "Documents" / "My Games" / "Skyrim" / "Saves"
+        self._make_files(saves_dir, ["quicksave.ess"])
+        self._make_files(self.profile / "AppData" / "Roaming" / "Puzzle Quest", [
+            "saves/a.sav", "saves/b.sav", "saves/c.sav",
+        ])
+
+        events = self.scanner.iter_saves()
+        first = next(events)
+        walked_so_far = self.scanner.walker.dirs_visited
+        rest = list(events)
+
+        self.assertEqual(first, ("Skyrim", saves_dir / "quicksave.ess"))
+        self.assertLess(walked_so_far, self.scanner.walker.dirs_visited)
+        self.assertEqual({game for game, _ in rest}, {"Puzzle Quest"})
+
+    def test_unknown_game_named_after_known_game_is_skipped(self):
+        self._make_files(self.profile / "Documents" / "My Games" / "Terraria" / "Players",
+                         ["hero.plr"])
+        self._make_files(self.profile / "AppData" / "Roaming" / "Terraria", [
+            "saves/a.sav", "saves/b.sav", "saves/c.sav",
+        ])
+
+        found = self.scanner.scan_for_saves()
+
+        self.assertEqual(len(found["Terraria"]), 1)
+
+class TestProfileBatch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        # The current user's profile, which a batch must leave alone
+        current = self.temp_dir / "current"
+        self.env = patch.dict(os.environ, {
+            'USERPROFILE': str(current),
+            'APPDATA': str(current / "AppData" / "Roaming"),
+            'LOCALAPPDATA': str(current / "AppData" / "Local"),
+        })
+        self.env.start()
+        self._make_save(current / "Documents" / "My Games" / "Skyrim" / "Saves" / "mine.ess")
+
+        self.config = Config()
+        self.config.backup_dir = self.temp_dir / "loaded saves"
+        self.config.store_dir = self.config.backup_dir / ".store"
+        self.config.manifests_dir = self.config.backup_dir / ".manifests"
+        self.config.catalog_path = self.config.backup_dir / ".catalog.sqlite3"
+        self.config.logs_dir = self.temp_dir / "logs"
+        self.config.cache_dir = self.temp_dir / "cache"
+
+        self.alice = self.temp_dir / "mnt" / "alice"
+        self.bob = self.temp_dir / "image" / "Users" / "bob"
+        self._make_save(self.alice / "Documents" / "My Games" / "Skyrim" / "Saves" / "alice.ess")
+        self._make_save(self.bob / "Documents" / "My Games" / "Skyrim" / "Saves" / "bob.ess")
+        self._make_save(self.bob / "AppData" / "Roaming" / "StardewValley" / "Saves" / "farm.sav")
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def _make_save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(path.name)
+
+    def test_profiles_are_scanned_in_their_own_namespace(self):
+        batch = ProfileBatch(self.config, [self.alice, self.bob], processes=2)
+
+        found = batch.scan_for_saves()
+
+        self.assertEqual({game_name: list(saves) for game_name, saves in found.items()}, {
+            "[alice] Skyrim": [self.alice / "Documents" / "My Games" / "Skyrim" / "Saves" / "alice.ess"],
+            "[bob] Skyrim": [self.bob / "Documents" / "My Games" / "Skyrim" / "Saves" / "bob.ess"],
+            "[bob] Stardew Valley": [self.bob / "AppData" / "Roaming" / "StardewValley" / "Saves" / "farm.sav"],
+        })
+        self.assertEqual(batch.results["bob"]['games'], 2)
+        self.assertTrue((self.config.cache_dir / "profiles" / "alice" / "scan_index.sqlite3").exists())
+
+    def test_backup_shares_one_run_log_and_catalog(self):
+        missing = self.temp_dir / "missing"
+        batch = ProfileBatch(self.config, [self.alice, self.bob, missing])
+        backup_manager = BackupManager(self.config)
+
+        backup_log = batch.backup(backup_manager)
+
+        self.assertEqual(sorted(backup_log['games_backed_up']),
+                         ["[alice] Skyrim", "[bob] Skyrim", "[bob] Stardew Valley"])
+        self.assertEqual(sorted(backup_log['profiles']), ["alice", "bob"])
+        self.assertEqual(len(backup_log['errors']), 1)
+        self.assertIn("missing", backup_log['errors'][0])
+        self.assertEqual(sorted(backup_manager.list_backups()),
+                         ["[alice] Skyrim", "[bob] Skyrim", "[bob] Stardew Valley"])
+        self.assertTrue((self.config.backup_dir / "[alice] Skyrim").is_dir())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Unit tests for the JSON-RPC backend service and the command line
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from config import Config
+from backend_service import BackendService, METHOD_NOT_FOUND, INVALID_PARAMS
+from backup_cli import parse_args, run_list, run_scan, scan_hint
+from progress_events import EventStream
+
+class TestBackendService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.profile = self.temp_dir / "profile"
+        self.profile.mkdir()
+        self.env = patch.dict(os.environ, {
+            'USERPROFILE': str(self.profile),
+            'APPDATA': str(self.profile / "AppData" / "Roaming"),
+            'LOCALAPPDATA': str(self.profile / "AppData" / "Local"),
+        })
+        self.env.start()
+
+        self.config = Config()
+        self.config.backup_dir = self.temp_dir / "loaded saves"
+        self.config.store_dir = self.config.backup_dir / ".store"
+        self.config.manifests_dir = self.config.backup_dir / ".manifests"
+        self.config.catalog_path = self.config.backup_dir / ".catalog.sqlite3"
+        self.config.logs_dir = self.temp_dir / "logs"
+        self.config.cache_dir = self.temp_dir / "cache"
+        self.service = BackendService(self.config)
+
+        game_dir = self.profile / "AppData" / "Roaming" / "Puzzle Quest"
+        for name in ["saves/slot1.sav", "saves/slot2.sav", "player.sav"]:
+            (game_dir / name).parent.mkdir(parents=True, exist_ok=True)
+            (game_dir / name).write_text("data")
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def _call(self, method, request_id=1, **params):
+        return self.service.handle_line(json.dumps(
+            {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}))
+
+    def test_scan_returns_games_and_output(self):
+        response = self._call('scan')
+
+        self.assertEqual(response['id'], 1)
+        self.assertEqual(response['result']['games'], {"Puzzle Quest": 3})
+        self.assertIn("Puzzle Quest: 3 save files", response['result']['output'])
+
+    def test_repeat_scan_stays_warm(self):
+        self._call('scan')
+        self._call('scan', request_id=2)
+
+        self.assertEqual(self.service.scanner.walker.dirs_visited, 0)
+        self.assertGreater(self.service.scanner.walker.dirs_cached, 0)
+
+    def test_backup_then_list(self):
+        backup = self._call('backup')
+        self.assertEqual(backup['result']['games'], {"Puzzle Quest": 3})
+
+        listing = self._call('list_backups', request_id=2)['result']['backups']
+        self.assertEqual(len(listing["Puzzle Quest"]), 1)
+        self.assertEqual(listing["Puzzle Quest"][0]['fileCount'], 3)
+
+    def test_errors_are_reported(self):
+        self.assertEqual(self._call('nope')['error']['code'], METHOD_NOT_FOUND)
+        self.assertEqual(self._call('scan', bogus=True)['error']['code'], INVALID_PARAMS)
+
+    def test_serve_stops_on_shutdown(self):
+        requests = io.StringIO(
+            '{"jsonrpc": "2.0", "id": 1, "method": "ping"}\n'
+            '{"jsonrpc": "2.0", "id": 2, "method": "shutdown"}\n'
+            '{"jsonrpc": "2.0", "id": 3, "method": "ping"}\n')
+        responses = io.StringIO()
+
+        self.service.serve(requests, responses)
+
+        ids = [json.loads(line)['id'] for line in responses.getvalue().splitlines()]
+        self.assertEqual(ids, [1, 2])
+
+    def test_progress_events_precede_response(self):
+        requests = io.StringIO('{"jsonrpc": "2.0", "id": 1, "method": "backup"}\n')
+        responses = io.StringIO()
+
+        self.service.serve(requests, responses)
+
+        messages = [json.loads(line) for line in responses.getvalue().splitlines()]
+        self.assertEqual(messages[-1]['id'], 1)
+        events = [m['params'] for m in messages[:-1] if m.get('method') == 'event']
+        self.assertEqual(len(events), len(messages) - 1)
+        names = [event['event'] for event in events]
+        self.assertEqual(names[0], 'backup_started')
+        self.assertLess(names.index('scan_finished'), names.index('backup_finished'))
+        self.assertIn("Puzzle Quest",
+                      [event['game'] for event in events if event['event'] == 'game_found'])
+        self.assertEqual(events[-1]['files'], 3)
+
+class TestEventStream(unittest.TestCase):
+    def test_progress_is_rate_limited(self):
+        sent = []
+        events = EventStream(sent.append, interval=60)
+
+        self.assertTrue(events.due('copy_progress'))
+        self.assertFalse(events.due('copy_progress'))
+        self.assertTrue(events.due('scan_progress'))
+        events.emit('phase_finished', files=2)
+
+        self.assertEqual(sent[0]['event'], 'phase_finished')
+        self.assertEqual(sent[0]['files'], 2)
+
+    def test_without_sink_nothing_is_due(self):
+        self.assertFalse(EventStream().due('copy_progress'))
+
+class TestCommandLine(unittest.TestCase):
+    def test_commands_match_the_flag_form(self):
+        pairs = [
+            (['list', '--game', 'Sky'], ['--list', '--game', 'Sky']),
+            (['scan', '--rescan', '-v'], ['--scan-only', '--rescan', '-v']),
+            (['restore', 'Skyrim', '--snapshot', '2025-01-01_00-00-00'],
+             ['--restore', 'Skyrim', '--snapshot', '2025-01-01_00-00-00']),
+            (['backup', '--full'], ['--full']),
+        ]
+        for command, flags in pairs:
+            with self.subTest(command=command[0]):
+                args = vars(parse_args(command))
+                self.assertEqual(args.pop('command'), command[0])
+                self.assertEqual(args, vars(parse_args(flags)))
+
+    def test_user_profiles_are_not_the_profiler_flag(self):
+        args = parse_args(['--user-profiles', 'C:\\Users\\bob', '--scan-only'])
+        self.assertEqual(args.user_profiles, ['C:\\Users\\bob'])
+        self.assertIsNone(args.profile)
+
+        args = parse_args(['backup', '--profile', 'run.prof', '--user-profiles', 'a', 'b'])
+        self.assertEqual(args.profile, 'run.prof')
+        self.assertEqual(args.user_profiles, ['a', 'b'])
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        with patch('sys.stderr', new_callable=io.StringIO) as output, self.assertRaises(SystemExit):
+            parse_args(['--profile', temp_dir, '--scan-only'])
+        self.assertIn("--user-profiles", output.getvalue())
+
+    def test_scan_hint_matches_the_command_form(self):
+        scanner = Mock()
+        scanner.scan_for_saves.return_value = {"Skyrim": ["quicksave.ess"]}
+        for argv, expected, unexpected in ((['scan'], "backup_saves.py backup", "--scan-only"),
+                                           (['--scan-only'], "--scan-only", "backup_saves.py backup")):
+            with self.subTest(argv=argv), patch('sys.stdout', new_callable=io.StringIO) as output:
+                run_scan(scanner, hint=scan_hint(parse_args(argv)))
+                self.assertIn(expected, output.getvalue())
+                self.assertNotIn(unexpected, output.getvalue())
+
+    def test_list_creates_nothing(self):
+        temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, temp_dir)
+        config = Config()
+        config.backup_dir = temp_dir / "loaded saves"
+        config.catalog_path = config.backup_dir / ".catalog.sqlite3"
+
+        with patch('sys.stdout', new_callable=io.StringIO) as output:
+            self.assertEqual(run_list(config), {})
+
+        self.assertIn("No backups found.", output.getvalue())
+        self.assertEqual(list(temp_dir.iterdir()), [])
+
+    def test_entry_point_imports_no_command_modules(self):
+        # A fresh interpreter, since this one has imported everything already
+        code = ("import sys, backup_cli; backup_cli.parse_args(['list']); "
+                "print(' '.join(sorted(sys.modules)))")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        modules = set(result.stdout.split())
+
+        self.assertIn('backup_cli', modules)
+        self.assertFalse(modules & {'game_scanner', 'backup_manager', 'restore_manager',
+                                    'save_patterns', 'snapshot_catalog', 'sqlite3'})
+
+if __name__ == '__main__':
+    unittest.main()
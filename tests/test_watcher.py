@@ -0,0 +1,110 @@
+"""
+Unit tests for watch mode
+"""
+
+import os
+import time
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+from config import Config
+from game_scanner import GameScanner
+from backup_manager import BackupManager
+from save_watcher import SaveWatcher
+
+class TestSaveWatcher(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.profile = self.temp_dir / "profile"
+        self.profile.mkdir()
+        self.env = patch.dict(os.environ, {
+            'USERPROFILE': str(self.profile),
+            'APPDATA': str(self.profile / "AppData" / "Roaming"),
+            'LOCALAPPDATA': str(self.profile / "AppData" / "Local"),
+        })
+        self.env.start()
+
+        self.config = Config()
+        self.config.backup_dir = self.temp_dir / "loaded saves"
+        self.config.store_dir = self.config.backup_dir / ".store"
+        self.config.manifests_dir = self.config.backup_dir / ".manifests"
+        self.config.catalog_path = self.config.backup_dir / ".catalog.sqlite3"
+        self.config.logs_dir = self.temp_dir / "logs"
+        self.config.cache_dir = self.temp_dir / "cache"
+
+        self.game_dir = self.profile / "AppData" / "Roaming" / "Puzzle Quest" / "saves"
+        self.game_dir.mkdir(parents=True)
+        for name in ["slot1.sav", "slot2.sav", "slot3.sav"]:
+            (self.game_dir / name).write_text("data")
+
+        scanner = GameScanner(self.config)
+        self.backup_manager = BackupManager(self.config)
+        self.watcher = SaveWatcher(self.config, scanner, self.backup_manager,
+                                   debounce=3.0, use_notifications=False)
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def _backup_at(self, timestamp, now):
+        with patch('backup_manager.datetime') as mock_datetime:
+            mock_datetime.now.return_value.strftime.return_value = timestamp
+            return self.watcher.step(now)
+
+    def test_first_run_backs_up_everything(self):
+        self.watcher.start()
+
+        backup_log = self._backup_at("2025-01-01_00-00-00", time.monotonic())
+
+        self.assertEqual(backup_log['games_backed_up']["Puzzle Quest"]['count'], 3)
+
+    def test_changed_save_is_backed_up_after_quiet_period(self):
+        self.watcher.start()
+        self._backup_at("2025-01-01_00-00-00", time.monotonic())
+
+        (self.game_dir / "slot2.sav").write_text("newer data")
+        now = time.monotonic()
+        self.assertIsNone(self._backup_at("2025-01-01_00-01-00", now))
+        backup_log = self._backup_at("2025-01-01_00-01-00", now + 3.0)
+
+        self.assertEqual(backup_log['files_copied'], 1)
+        self.assertEqual(backup_log['files_reused'], 2)
+
+    def test_restart_resumes_from_last_snapshot(self):
+        self.backup_manager.backup_saves(self.watcher.refresh())
+
+        self.watcher.start()
+
+        self.assertEqual(self.watcher.pending, {})
+
+    def test_unrelated_change_does_not_create_snapshot(self):
+        self.watcher.start()
+        self._backup_at("2025-01-01_00-00-00", time.monotonic())
+
+        (self.game_dir / "debug.log").write_text("noise")
+        now = time.monotonic()
+        self._backup_at("2025-01-01_00-01-00", now)
+
+        self.assertIsNone(self._backup_at("2025-01-01_00-01-00", now + 3.0))
+        self.assertEqual(len(self.backup_manager.list_backups()["Puzzle Quest"]), 1)
+
+    def test_change_lists_only_the_game_folders(self):
+        self.watcher.start()
+        self._backup_at("2025-01-01_00-00-00", time.monotonic())
+
+        (self.game_dir / "slot2.sav").write_text("newer data")
+        (self.game_dir / "slot4.sav").write_text("new slot")
+        now = time.monotonic()
+        with patch.object(self.watcher.scanner, 'scan_for_saves') as scan_for_saves:
+            self._backup_at("2025-01-01_00-01-00", now)
+            backup_log = self._backup_at("2025-01-01_00-01-00", now + 3.0)
+
+        scan_for_saves.assert_not_called()
+        self.assertEqual(backup_log['games_backed_up']["Puzzle Quest"]['count'], 4)
+        self.assertEqual(backup_log['files_copied'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 const { app, BrowserWindow, ipcMain } = require('electron');
 const path = require('path');
 const { spawn } = require('child_process');
-const fs = require('fs').promises;
+const readline = require('readline');
 
 let mainWindow;
 
@@ -58,190 +58,136 @@ app.on('window-all-closed', () => {
   }
 });
 
-// IPC Handlers
-ipcMain.handle('scan-saves', async (event, options = {}) => {
-  return new Promise((resolve, reject) => {
-    const args = ['backup_saves.py', '--scan-only', '--verbose'];
-    if (options.game) {
-      args.push('--game', options.game);
-    }
-
-    const pythonProcess = spawn('py', args, {
-      cwd: path.join(__dirname, '..'),
-      stdio: ['pipe', 'pipe', 'pipe']
-    });
-
-    let stdout = '';
-    let stderr = '';
+// Persistent Python backend (backup_saves.py --serve) speaking JSON-RPC over
+// stdin/stdout, so scans reuse a warm scanner instead of a fresh interpreter
+let backend = null;
+let nextRequestId = 1;
+const pendingRequests = new Map();
 
-    pythonProcess.stdout.on('data', (data) => {
-      stdout += data.toString();
-    });
+function startBackend() {
+  const backendProcess = spawn('py', ['backup_saves.py', '--serve', '--verbose'], {
+    cwd: path.join(__dirname, '..'),
+    stdio: ['pipe', 'pipe', 'pipe']
+  });
 
-    pythonProcess.stderr.on('data', (data) => {
-      stderr += data.toString();
-    });
+  // Responses arrive one JSON object per line
+  const responses = readline.createInterface({ input: backendProcess.stdout });
+  responses.on('line', (line) => {
+    let response;
+    try {
+      response = JSON.parse(line);
+    } catch {
+      console.warn('Unexpected backend output:', line);
+      return;
+    }
 
-    pythonProcess.on('close', (code) => {
-      if (code === 0) {
-        resolve({
-          success: true,
-          output: stdout,
-          error: null
-        });
-      } else {
-        reject({
-          success: false,
-          output: stdout,
-          error: stderr || 'Process failed'
-        });
+    // Progress events arrive as notifications while a request runs
+    if (response.method === 'event') {
+      if (mainWindow && !mainWindow.isDestroyed()) {
+        mainWindow.webContents.send('backend-event', response.params);
       }
-    });
+      return;
+    }
 
-    pythonProcess.on('error', (error) => {
-      reject({
+    const pending = pendingRequests.get(response.id);
+    if (!pending) {
+      return;
+    }
+    pendingRequests.delete(response.id);
+
+    if (response.error) {
+      pending.reject({
         success: false,
-        output: '',
-        error: error.message
+        output: (response.error.data && response.error.data.output) || '',
+        error: response.error.message
       });
-    });
+    } else {
+      pending.resolve(response.result);
+    }
   });
-});
 
-ipcMain.handle('backup-saves', async (event, options = {}) => {
-  return new Promise((resolve, reject) => {
-    const args = ['backup_saves.py', '--verbose'];
-    if (options.game) {
-      args.push('--game', options.game);
-    }
+  let stderr = '';
+  backendProcess.stderr.on('data', (data) => {
+    stderr += data.toString();
+  });
 
-    const pythonProcess = spawn('py', args, {
-      cwd: path.join(__dirname, '..'),
-      stdio: ['pipe', 'pipe', 'pipe']
-    });
+  const failPending = (message) => {
+    if (backend === backendProcess) {
+      backend = null;
+    }
+    for (const pending of pendingRequests.values()) {
+      pending.reject({ success: false, output: '', error: message });
+    }
+    pendingRequests.clear();
+  };
 
-    let stdout = '';
-    let stderr = '';
+  backendProcess.on('close', (code) => {
+    failPending(stderr || `Backend exited with code ${code}`);
+  });
 
-    pythonProcess.stdout.on('data', (data) => {
-      stdout += data.toString();
-    });
+  backendProcess.on('error', (error) => {
+    failPending(error.message);
+  });
 
-    pythonProcess.stderr.on('data', (data) => {
-      stderr += data.toString();
-    });
+  return backendProcess;
+}
 
-    pythonProcess.on('close', (code) => {
-      if (code === 0) {
-        resolve({
-          success: true,
-          output: stdout,
-          error: null
-        });
-      } else {
-        reject({
-          success: false,
-          output: stdout,
-          error: stderr || 'Process failed'
-        });
-      }
-    });
+function callBackend(method, params = {}) {
+  if (!backend) {
+    backend = startBackend();
+  }
 
-    pythonProcess.on('error', (error) => {
-      reject({
-        success: false,
-        output: '',
-        error: error.message
-      });
-    });
+  const id = nextRequestId++;
+  return new Promise((resolve, reject) => {
+    pendingRequests.set(id, { resolve, reject });
+    backend.stdin.write(JSON.stringify({ jsonrpc: '2.0', id, method, params }) + '\n');
   });
-});
-
-ipcMain.handle('list-backups', async () => {
-  try {
-    const backupDir = path.join(__dirname, '..', 'loaded saves');
-    
-    try {
-      await fs.access(backupDir);
-    } catch {
-      return { backups: {} };
-    }
+}
 
-    const gameDirectories = await fs.readdir(backupDir, { withFileTypes: true });
-    const backups = {};
+app.on('will-quit', () => {
+  if (backend) {
+    backend.stdin.end();
+  }
+});
 
-    for (const gameDir of gameDirectories) {
-      if (gameDir.isDirectory()) {
-        const gamePath = path.join(backupDir, gameDir.name);
-        const backupDirs = await fs.readdir(gamePath, { withFileTypes: true });
-        
-        const gameBackups = [];
-        for (const backupDir of backupDirs) {
-          if (backupDir.isDirectory()) {
-            const backupPath = path.join(gamePath, backupDir.name);
-            const stats = await fs.stat(backupPath);
-            
-            // Count files in backup
-            const fileCount = await countFiles(backupPath);
-            
-            gameBackups.push({
-              timestamp: backupDir.name,
-              path: backupPath,
-              fileCount,
-              created: stats.mtime
-            });
-          }
-        }
+// IPC Handlers
+ipcMain.handle('scan-saves', async (event, options = {}) => {
+  const result = await callBackend('scan', { game: options.game || null });
+  return {
+    success: true,
+    output: result.output,
+    error: null
+  };
+});
 
-        if (gameBackups.length > 0) {
-          backups[gameDir.name] = gameBackups.sort((a, b) => 
-            new Date(b.created) - new Date(a.created)
-          );
-        }
-      }
-    }
+ipcMain.handle('backup-saves', async (event, options = {}) => {
+  const result = await callBackend('backup', { game: options.game || null });
+  return {
+    success: true,
+    output: result.output,
+    error: null
+  };
+});
 
-    return { backups };
+ipcMain.handle('list-backups', async () => {
+  try {
+    const result = await callBackend('list_backups');
+    return { backups: result.backups };
   } catch (error) {
-    throw new Error(`Failed to list backups: ${error.message}`);
+    throw new Error(`Failed to list backups: ${error.error || error.message}`);
   }
 });
 
-ipcMain.handle('get-logs', async () => {
+ipcMain.handle('get-logs', async (event, options = {}) => {
   try {
-    const logsDir = path.join(__dirname, '..', 'logs');
-    
-    try {
-      await fs.access(logsDir);
-    } catch {
-      return { logs: [] };
-    }
-
-    const logFiles = await fs.readdir(logsDir);
-    const logs = [];
-
-    for (const logFile of logFiles) {
-      if (logFile.endsWith('.json')) {
-        try {
-          const logPath = path.join(logsDir, logFile);
-          const logContent = await fs.readFile(logPath, 'utf8');
-          const logData = JSON.parse(logContent);
-          
-          logs.push({
-            filename: logFile,
-            ...logData
-          });
-        } catch (error) {
-          console.warn(`Failed to read log file ${logFile}:`, error.message);
-        }
-      }
-    }
-
-    return { 
-      logs: logs.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp)) 
-    };
+    const result = await callBackend('list_logs', {
+      offset: options.offset || 0,
+      limit: options.limit || 50,
+      game: options.game || null
+    });
+    return { logs: result.runs, total: result.total };
   } catch (error) {
-    throw new Error(`Failed to get logs: ${error.message}`);
+    throw new Error(`Failed to get logs: ${error.error || error.message}`);
   }
 });
 
@@ -271,24 +217,3 @@ ipcMain.handle('window-close', () => {
 ipcMain.handle('window-is-maximized', () => {
   return mainWindow ? mainWindow.isMaximized() : false;
 });
-
-// Helper function to count files in directory recursively
-async function countFiles(dirPath) {
-  let count = 0;
-  
-  try {
-    const items = await fs.readdir(dirPath, { withFileTypes: true });
-    
-    for (const item of items) {
-      if (item.isFile()) {
-        count++;
-      } else if (item.isDirectory()) {
-        count += await countFiles(path.join(dirPath, item.name));
-      }
-    }
-  } catch (error) {
-    // Ignore permission errors
-  }
-  
-  return count;
-}
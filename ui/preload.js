@@ -13,7 +13,10 @@ contextBridge.exposeInMainWorld('electronAPI', {
   listBackups: () => ipcRenderer.invoke('list-backups'),
   
   // Get backup operation logs
-  getLogs: () => ipcRenderer.invoke('get-logs'),
+  getLogs: (options = {}) => ipcRenderer.invoke('get-logs', options),
+  
+  // Live progress events from running scans and backups
+  onProgress: (callback) => ipcRenderer.on('backend-event', (event, progress) => callback(progress)),
   
   // Window controls
   windowMinimize: () => ipcRenderer.invoke('window-minimize'),
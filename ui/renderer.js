@@ -25,6 +25,10 @@ const appStatus = document.getElementById('app-status');
 const lastUpdate = document.getElementById('last-update');
 const electronVersion = document.getElementById('electron-version');
 
+// Operation currently receiving progress events ('scan' or 'backup')
+let activeOperation = null;
+let backupStartedAt = 0;
+
 // Initialize the app
 document.addEventListener('DOMContentLoaded', () => {
     // Small delay to ensure styles are loaded
@@ -83,6 +87,9 @@ function setupEventListeners() {
     refreshBackupsBtn.addEventListener('click', loadBackups);
     refreshLogsBtn.addEventListener('click', loadLogs);
 
+    // Live progress from the backend
+    window.electronAPI.onProgress(handleProgress);
+
     // Window controls
     const minimizeBtn = document.getElementById('minimize-btn');
     const maximizeBtn = document.getElementById('maximize-btn');
@@ -149,6 +156,7 @@ async function handleScan() {
         scanStatus.className = 'status scanning';
         scanOutput.textContent = 'Initializing scan...\n';
         updateStatus('Scanning for game saves...');
+        activeOperation = 'scan';
 
         const options = gameFilter ? { game: gameFilter } : {};
         const result = await window.electronAPI.scanSaves(options);
@@ -166,6 +174,7 @@ async function handleScan() {
         scanStatus.className = 'status error';
         updateStatus('Scan failed');
     } finally {
+        activeOperation = null;
         scanBtn.disabled = false;
     }
 }
@@ -179,6 +188,7 @@ async function handleBackup() {
         backupStatus.className = 'status backing-up';
         backupOutput.textContent = 'Initializing backup...\n';
         updateStatus('Creating backups...');
+        activeOperation = 'backup';
 
         const options = gameFilter ? { game: gameFilter } : {};
         const result = await window.electronAPI.backupSaves(options);
@@ -202,10 +212,62 @@ async function handleBackup() {
         backupStatus.className = 'status error';
         updateStatus('Backup failed');
     } finally {
+        activeOperation = null;
         backupBtn.disabled = false;
     }
 }
 
+function handleProgress(progress) {
+    if (!activeOperation) {
+        return;
+    }
+    const status = activeOperation === 'backup' ? backupStatus : scanStatus;
+    const output = activeOperation === 'backup' ? backupOutput : scanOutput;
+
+    switch (progress.event) {
+        case 'backup_started':
+            backupStartedAt = progress.elapsed;
+            break;
+        case 'root_started':
+            output.textContent += `Scanning ${progress.path}\n`;
+            break;
+        case 'scan_progress':
+            status.textContent = `Scanning... ${progress.dirs} folders, ${progress.saves} saves`;
+            break;
+        case 'game_found':
+            output.textContent += `  Found ${progress.game}\n`;
+            break;
+        case 'scan_finished':
+            output.textContent += `Scan finished: ${progress.games} games, ${progress.saves} saves ` +
+                `in ${progress.seconds.toFixed(1)}s\n`;
+            break;
+        case 'copy_progress':
+            status.textContent = formatCopyProgress(progress);
+            break;
+        case 'game_backed_up':
+            output.textContent += `  Backed up ${progress.game}: ${progress.files} files\n`;
+            break;
+        default:
+            return;
+    }
+    output.scrollTop = output.scrollHeight;
+    updateStatus(status.textContent);
+}
+
+function formatCopyProgress(progress) {
+    const seconds = Math.max(progress.elapsed - backupStartedAt, 0.001);
+    const rate = (progress.bytes_copied + progress.bytes_reused) / seconds;
+    let text = `Backing up... ${progress.files_done}/${progress.files_queued} files, ${formatBytes(rate)}/s`;
+
+    // The total is only known once the scan has queued every file
+    if (progress.queue_complete && progress.files_done > 0) {
+        const remaining = progress.files_queued - progress.files_done;
+        const eta = remaining / (progress.files_done / seconds);
+        text += `, about ${Math.ceil(eta)}s left`;
+    }
+    return text;
+}
+
 async function loadBackups() {
     try {
         backupsContainer.innerHTML = '<div class="loading">Loading backups...</div>';
@@ -242,7 +304,7 @@ async function loadBackups() {
                     <div class="backup-item">
                         <div class="backup-timestamp">${backup.timestamp}</div>
                         <div class="backup-details">
-                            ${backup.fileCount} files • Created: ${formattedDate}
+                            ${backup.fileCount} files • ${formatBytes(backup.totalBytes)} • Created: ${formattedDate}
                         </div>
                     </div>
                 `;
@@ -286,8 +348,8 @@ async function loadLogs() {
         logs.forEach(log => {
             const date = new Date(log.timestamp);
             const formattedDate = date.toLocaleString();
-            const gameNames = Object.keys(log.games_backed_up || {});
-            const hasErrors = log.errors && log.errors.length > 0;
+            const gameNames = Object.keys(log.games || {});
+            const hasErrors = log.error_count > 0;
 
             html += `
                 <div class="log-entry">
@@ -296,7 +358,7 @@ async function loadLogs() {
                         Backup - ${log.timestamp}
                     </div>
                     <div class="log-meta">
-                        ${formattedDate} • ${log.filename}
+                        ${formattedDate} • ${log.files_copied || 0} copied, ${log.files_reused || 0} unchanged
                     </div>
                     <div class="log-stats">
                         <span class="log-stat">
@@ -310,7 +372,7 @@ async function loadLogs() {
                         ${hasErrors ? `
                             <span class="log-stat" style="background: var(--error); color: white;">
                                 <span class="emoji">⚠️</span> 
-                                ${log.errors.length} errors
+                                ${log.error_count} errors
                             </span>
                         ` : ''}
                     </div>
@@ -343,6 +405,17 @@ function updateLastUpdate() {
     lastUpdate.textContent = now.toLocaleTimeString();
 }
 
+function formatBytes(bytes) {
+    const units = ['B', 'KB', 'MB', 'GB', 'TB'];
+    let value = bytes || 0;
+    let unit = 0;
+    while (value >= 1024 && unit < units.length - 1) {
+        value /= 1024;
+        unit++;
+    }
+    return `${value.toFixed(unit === 0 ? 0 : 1)} ${units[unit]}`;
+}
+
 function escapeHtml(text) {
     const div = document.createElement('div');
     div.textContent = text;